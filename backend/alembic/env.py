@@ -11,7 +11,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from app.core.database import Base
 from app.core.config import settings
-from app.models import User, Claim, File, Artifact, ArtifactVersion  # noqa: F401
+from app.models import User, Claim, File, Artifact, ArtifactVersion, Blob  # noqa: F401
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,28 @@
+"""add_extraction_status_to_files
+
+Revision ID: 3f9c1b7e2a45
+Revises: dd4af2cae84a
+Create Date: 2026-10-17 09:12:41.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c1b7e2a45'
+down_revision: Union[str, None] = 'dd4af2cae84a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('files', sa.Column('extraction_status', sa.String(), server_default='pending', nullable=False))
+    # Files that already have text were extracted before this column existed
+    op.execute("UPDATE files SET extraction_status = 'done' WHERE extracted_text IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.drop_column('files', 'extraction_status')
@@ -0,0 +1,42 @@
+"""add_pagination_indexes
+
+Revision ID: 5d3b7f1a9c62
+Revises: e4a1c8b93d57
+Create Date: 2026-10-17 16:45:12.530917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d3b7f1a9c62'
+down_revision: Union[str, None] = 'e4a1c8b93d57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_claims_owner_created_at_id', 'claims', ['owner_user_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_claims_owner_reference_number', 'claims', ['owner_user_id', 'reference_number'], unique=False,
+        postgresql_ops={'reference_number': 'varchar_pattern_ops'}
+    )
+    op.create_index('ix_files_claim_created_at_id', 'files', ['claim_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_files_claim_mime_type_created_at_id', 'files', ['claim_id', 'mime_type', 'created_at', 'id'], unique=False
+    )
+    op.create_index('ix_artifacts_claim_created_at_id', 'artifacts', ['claim_id', 'created_at', 'id'], unique=False)
+    op.create_index(
+        'ix_artifacts_claim_type_created_at_id', 'artifacts', ['claim_id', 'type', 'created_at', 'id'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_artifacts_claim_type_created_at_id', table_name='artifacts')
+    op.drop_index('ix_artifacts_claim_created_at_id', table_name='artifacts')
+    op.drop_index('ix_files_claim_mime_type_created_at_id', table_name='files')
+    op.drop_index('ix_files_claim_created_at_id', table_name='files')
+    op.drop_index('ix_claims_owner_reference_number', table_name='claims')
+    op.drop_index('ix_claims_owner_created_at_id', table_name='claims')
@@ -0,0 +1,130 @@
+"""add_artifact_version_deltas
+
+Revision ID: a9f2c6e1d834
+Revises: 5d3b7f1a9c62
+Create Date: 2026-10-17 18:20:05.771204
+
+"""
+import hashlib
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9f2c6e1d834'
+down_revision: Union[str, None] = '5d3b7f1a9c62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The artifact_versions FTS5 triggers as of this revision (see e4a1c8b93d57)
+SQLITE_FTS_TRIGGERS = [
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ai AFTER INSERT ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ad AFTER DELETE ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_au AFTER UPDATE OF content ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+BACKFILL_BATCH_SIZE = 500
+
+
+def _apply_delta(base: str, delta: bytes) -> str:
+    """Rebuild a version from the next one and its delta (delta_service.apply_delta as of this revision)."""
+    base_lines = base.splitlines(keepends=True)
+    parts = []
+    for delta_op in json.loads(zlib.decompress(delta)):
+        if isinstance(delta_op, str):
+            parts.append(delta_op)
+        else:
+            parts.extend(base_lines[delta_op[0]:delta_op[1]])
+    return "".join(parts)
+
+
+def upgrade() -> None:
+    op.add_column('artifact_versions', sa.Column('version_number', sa.Integer(), nullable=True))
+    op.add_column('artifact_versions', sa.Column('delta', sa.LargeBinary(), nullable=True))
+    op.add_column('artifact_versions', sa.Column('base_version_id', sa.Integer(), nullable=True))
+    op.add_column('artifact_versions', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('artifact_versions', sa.Column('size_bytes', sa.Integer(), nullable=True))
+
+    # Number existing versions in creation order; they all stay stored in full
+    op.execute("""
+        UPDATE artifact_versions SET version_number = (
+            SELECT count(*) FROM artifact_versions v2
+            WHERE v2.artifact_id = artifact_versions.artifact_id AND v2.id <= artifact_versions.id
+        )
+    """)
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text("SELECT id, content FROM artifact_versions WHERE id > :last_id ORDER BY id LIMIT :limit"),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        for version_id, content in rows:
+            encoded = (content or "").encode("utf-8")
+            bind.execute(
+                sa.text("UPDATE artifact_versions SET content_hash = :hash, size_bytes = :size WHERE id = :id"),
+                {"hash": hashlib.sha256(encoded).hexdigest(), "size": len(encoded), "id": version_id}
+            )
+        last_id = rows[-1][0]
+
+    with op.batch_alter_table('artifact_versions') as batch_op:
+        batch_op.alter_column('version_number', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('content', existing_type=sa.Text(), nullable=True)
+        batch_op.create_foreign_key(
+            'fk_artifact_versions_base_version_id', 'artifact_versions', ['base_version_id'], ['id'],
+            ondelete='SET NULL'
+        )
+    op.create_index(
+        'ix_artifact_versions_artifact_version_number', 'artifact_versions',
+        ['artifact_id', 'version_number'], unique=True
+    )
+
+    if bind.dialect.name == 'sqlite':
+        # Rebuilding the table in batch mode drops its triggers; restore the FTS ones
+        for statement in SQLITE_FTS_TRIGGERS:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    # Rebuild every delta-encoded version before dropping the columns
+    bind = op.get_bind()
+    rows = bind.execute(sa.text(
+        "SELECT id, artifact_id, version_number, content, delta FROM artifact_versions "
+        "ORDER BY artifact_id, version_number DESC"
+    )).all()
+    newer_content = {}
+    for version_id, artifact_id, _, content, delta in rows:
+        if content is None:
+            content = _apply_delta(newer_content[artifact_id], delta)
+            bind.execute(
+                sa.text("UPDATE artifact_versions SET content = :content WHERE id = :id"),
+                {"content": content, "id": version_id}
+            )
+        newer_content[artifact_id] = content
+
+    op.drop_index('ix_artifact_versions_artifact_version_number', table_name='artifact_versions')
+    with op.batch_alter_table('artifact_versions') as batch_op:
+        batch_op.drop_constraint('fk_artifact_versions_base_version_id', type_='foreignkey')
+        batch_op.alter_column('content', existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column('size_bytes')
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('base_version_id')
+        batch_op.drop_column('delta')
+        batch_op.drop_column('version_number')
+
+    if bind.dialect.name == 'sqlite':
+        for statement in SQLITE_FTS_TRIGGERS:
+            op.execute(statement)
@@ -0,0 +1,50 @@
+"""add_proposals_table
+
+Revision ID: b3e7d2f9a416
+Revises: a9f2c6e1d834
+Create Date: 2026-10-17 19:42:11.318560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e7d2f9a416'
+down_revision: Union[str, None] = 'a9f2c6e1d834'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'proposals',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('claim_id', sa.Integer(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('target_id', sa.Integer(), nullable=True),
+        sa.Column('target_name', sa.String(), nullable=False),
+        sa.Column('base_hash', sa.String(length=64), nullable=False),
+        sa.Column('delta', sa.LargeBinary(), nullable=False),
+        sa.Column('hunks', sa.JSON(), nullable=False),
+        sa.Column('diff_stats', sa.JSON(), nullable=False),
+        sa.Column('source_files', sa.JSON(), nullable=True),
+        sa.Column('context_report', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(), server_default='pending', nullable=False),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('accepted_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['claim_id'], ['claims.id'], ),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_proposals_id'), 'proposals', ['id'], unique=False)
+    op.create_index(op.f('ix_proposals_claim_id'), 'proposals', ['claim_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_proposals_claim_id'), table_name='proposals')
+    op.drop_index(op.f('ix_proposals_id'), table_name='proposals')
+    op.drop_table('proposals')
@@ -0,0 +1,76 @@
+"""add_summary_jobs
+
+Revision ID: c1f8e4a7b925
+Revises: b3e7d2f9a416
+Create Date: 2026-10-17 21:05:47.260913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1f8e4a7b925'
+down_revision: Union[str, None] = 'b3e7d2f9a416'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'summary_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_by_user_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), server_default='pending', nullable=False),
+        sa.Column('claim_filter', sa.JSON(), nullable=True),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('processed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('proposed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('unchanged', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('failed', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_summary_jobs_id'), 'summary_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_summary_jobs_status'), 'summary_jobs', ['status'], unique=False)
+    op.create_index('ix_summary_jobs_user_created_at_id', 'summary_jobs', ['created_by_user_id', 'created_at', 'id'], unique=False)
+
+    op.create_table(
+        'summary_job_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('claim_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('proposal_id', sa.Integer(), nullable=True),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('sequence', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['summary_jobs.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['claim_id'], ['claims.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['proposal_id'], ['proposals.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_summary_job_items_id'), 'summary_job_items', ['id'], unique=False)
+    op.create_index('ix_summary_job_items_job_status', 'summary_job_items', ['job_id', 'status'], unique=False)
+    op.create_index('ix_summary_job_items_job_created_at_id', 'summary_job_items', ['job_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_summary_job_items_job_sequence', 'summary_job_items', ['job_id', 'sequence'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_summary_job_items_job_sequence', table_name='summary_job_items')
+    op.drop_index('ix_summary_job_items_job_created_at_id', table_name='summary_job_items')
+    op.drop_index('ix_summary_job_items_job_status', table_name='summary_job_items')
+    op.drop_index(op.f('ix_summary_job_items_id'), table_name='summary_job_items')
+    op.drop_table('summary_job_items')
+    op.drop_index('ix_summary_jobs_user_created_at_id', table_name='summary_jobs')
+    op.drop_index(op.f('ix_summary_jobs_status'), table_name='summary_jobs')
+    op.drop_index(op.f('ix_summary_jobs_id'), table_name='summary_jobs')
+    op.drop_table('summary_jobs')
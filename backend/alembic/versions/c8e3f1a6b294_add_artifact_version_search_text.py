@@ -0,0 +1,137 @@
+"""add_artifact_version_search_text
+
+Revision ID: c8e3f1a6b294
+Revises: f2b8c5d3e907
+Create Date: 2026-10-18 11:05:37.204816
+
+"""
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8e3f1a6b294'
+down_revision: Union[str, None] = 'f2b8c5d3e907'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 500
+
+SQLITE_FTS_TRIGGERS = ('artifact_versions_fts_ai', 'artifact_versions_fts_ad', 'artifact_versions_fts_au')
+
+# Delta versions are indexed on their search_text (see search_service.SQLITE_FTS_SCHEMA)
+SQLITE_FTS_SCHEMA = [
+    "CREATE VIEW IF NOT EXISTS artifact_versions_search AS "
+    "SELECT id, coalesce(content, search_text) AS content FROM artifact_versions",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS artifact_versions_fts USING fts5("
+    "content, content='artifact_versions_search', content_rowid='id', tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ai AFTER INSERT ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, coalesce(new.content, new.search_text));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ad AFTER DELETE ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content)
+        VALUES ('delete', old.id, coalesce(old.content, old.search_text));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_au AFTER UPDATE OF content, search_text ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content)
+        VALUES ('delete', old.id, coalesce(old.content, old.search_text));
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, coalesce(new.content, new.search_text));
+    END""",
+]
+
+# The schema this revision replaces (see e4a1c8b93d57)
+SQLITE_FTS_SCHEMA_PREVIOUS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS artifact_versions_fts USING fts5("
+    "content, content='artifact_versions', content_rowid='id', tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ai AFTER INSERT ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ad AFTER DELETE ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_au AFTER UPDATE OF content ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+
+def _delta_text(delta: bytes) -> str:
+    """The literal text a delta inserts (delta_service.delta_text as of this revision)."""
+    return "".join(delta_op for delta_op in json.loads(zlib.decompress(delta)) if isinstance(delta_op, str))
+
+
+def _drop_sqlite_fts() -> None:
+    for trigger in SQLITE_FTS_TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS artifact_versions_fts")
+    op.execute("DROP VIEW IF EXISTS artifact_versions_search")
+
+
+def _create_sqlite_fts(schema) -> None:
+    for statement in schema:
+        op.execute(statement)
+    op.execute("INSERT INTO artifact_versions_fts(artifact_versions_fts) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    op.add_column('artifact_versions', sa.Column('search_text', sa.Text(), nullable=True))
+
+    # Delta versions had their content cleared, which emptied their search index
+    # entry; give them the text their delta holds (what the next version changed)
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, delta FROM artifact_versions WHERE id > :last_id AND delta IS NOT NULL "
+                "ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE}
+        ).all()
+        if not rows:
+            break
+        for version_id, delta in rows:
+            bind.execute(
+                sa.text("UPDATE artifact_versions SET search_text = :search_text WHERE id = :id"),
+                {"search_text": _delta_text(delta), "id": version_id}
+            )
+        last_id = rows[-1][0]
+
+    if bind.dialect.name == 'sqlite':
+        _drop_sqlite_fts()
+        _create_sqlite_fts(SQLITE_FTS_SCHEMA)
+        return
+
+    # A generated column's expression can't be altered; recreate it
+    op.execute("DROP INDEX IF EXISTS ix_artifact_versions_search_vector")
+    op.execute("ALTER TABLE artifact_versions DROP COLUMN search_vector")
+    op.execute("""
+        ALTER TABLE artifact_versions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('english', left(coalesce(content, search_text, ''), 500000))
+        ) STORED
+    """)
+    op.execute("CREATE INDEX ix_artifact_versions_search_vector ON artifact_versions USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        _drop_sqlite_fts()
+        with op.batch_alter_table('artifact_versions') as batch_op:
+            batch_op.drop_column('search_text')
+        _create_sqlite_fts(SQLITE_FTS_SCHEMA_PREVIOUS)
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_artifact_versions_search_vector")
+    op.execute("ALTER TABLE artifact_versions DROP COLUMN search_vector")
+    op.drop_column('artifact_versions', 'search_text')
+    op.execute("""
+        ALTER TABLE artifact_versions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('english', left(coalesce(content, ''), 500000))
+        ) STORED
+    """)
+    op.execute("CREATE INDEX ix_artifact_versions_search_vector ON artifact_versions USING GIN (search_vector)")
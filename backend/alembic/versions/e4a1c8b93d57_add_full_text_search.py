@@ -0,0 +1,88 @@
+"""add_full_text_search
+
+Revision ID: e4a1c8b93d57
+Revises: c7d5a9e3f218
+Create Date: 2026-10-17 14:02:41.118305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1c8b93d57'
+down_revision: Union[str, None] = 'c7d5a9e3f218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The FTS5 schema as of this revision (search_service.SQLITE_FTS_SCHEMA has moved on since)
+SQLITE_FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5("
+    "filename, extracted_text, content='files', content_rowid='id', tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS files_fts_ai AFTER INSERT ON files BEGIN
+        INSERT INTO files_fts(rowid, filename, extracted_text) VALUES (new.id, new.filename, new.extracted_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS files_fts_ad AFTER DELETE ON files BEGIN
+        INSERT INTO files_fts(files_fts, rowid, filename, extracted_text)
+        VALUES ('delete', old.id, old.filename, old.extracted_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS files_fts_au AFTER UPDATE OF filename, extracted_text ON files BEGIN
+        INSERT INTO files_fts(files_fts, rowid, filename, extracted_text)
+        VALUES ('delete', old.id, old.filename, old.extracted_text);
+        INSERT INTO files_fts(rowid, filename, extracted_text) VALUES (new.id, new.filename, new.extracted_text);
+    END""",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS artifact_versions_fts USING fts5("
+    "content, content='artifact_versions', content_rowid='id', tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ai AFTER INSERT ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ad AFTER DELETE ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content) VALUES ('delete', old.id, old.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_au AFTER UPDATE OF content ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content) VALUES ('delete', old.id, old.content);
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, new.content);
+    END""",
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in SQLITE_FTS_SCHEMA:
+            op.execute(statement)
+        op.execute("INSERT INTO files_fts(files_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO artifact_versions_fts(artifact_versions_fts) VALUES ('rebuild')")
+        return
+
+    # Generated columns are maintained by Postgres on every insert/update, so the
+    # index never lags behind uploads and edits. Very long texts are capped
+    # because a tsvector is limited to 1MB.
+    op.execute("""
+        ALTER TABLE files ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(filename, '')), 'A') ||
+            setweight(to_tsvector('english', left(coalesce(extracted_text, ''), 500000)), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX ix_files_search_vector ON files USING GIN (search_vector)")
+    op.execute("""
+        ALTER TABLE artifact_versions ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+            to_tsvector('english', left(coalesce(content, ''), 500000))
+        ) STORED
+    """)
+    op.execute("CREATE INDEX ix_artifact_versions_search_vector ON artifact_versions USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in ('files_fts_ai', 'files_fts_ad', 'files_fts_au',
+                        'artifact_versions_fts_ai', 'artifact_versions_fts_ad', 'artifact_versions_fts_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS files_fts")
+        op.execute("DROP TABLE IF EXISTS artifact_versions_fts")
+        return
+
+    op.execute("DROP INDEX IF EXISTS ix_artifact_versions_search_vector")
+    op.execute("ALTER TABLE artifact_versions DROP COLUMN search_vector")
+    op.execute("DROP INDEX IF EXISTS ix_files_search_vector")
+    op.execute("ALTER TABLE files DROP COLUMN search_vector")
@@ -0,0 +1,29 @@
+"""add_proposal_retention_indexes
+
+Revision ID: e7a2c4f9b318
+Revises: c8e3f1a6b294
+Create Date: 2026-10-18 13:22:48.915062
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a2c4f9b318'
+down_revision: Union[str, None] = 'c8e3f1a6b294'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_proposals_status_created_at', 'proposals', ['status', 'created_at'], unique=False)
+    op.create_index(
+        'ix_proposals_claim_target', 'proposals', ['claim_id', 'type', 'target_id', 'status'], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proposals_claim_target', table_name='proposals')
+    op.drop_index('ix_proposals_status_created_at', table_name='proposals')
@@ -0,0 +1,43 @@
+"""queue_legacy_file_extraction
+
+Revision ID: f2b8c5d3e907
+Revises: d4a9b2e6f173
+Create Date: 2026-10-18 09:41:12.360917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8c5d3e907'
+down_revision: Union[str, None] = 'd4a9b2e6f173'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Files uploaded before text was extracted at upload time are still pending
+    # and have no blob, so no upload ever queued their extraction. Queue one
+    # extract_text task per file (payload file_id), at batch priority so new
+    # uploads still go first, owned by the claim's owner.
+    if op.get_bind().dialect.name == 'sqlite':
+        payload, now = "json_object('file_id', files.id)", "CURRENT_TIMESTAMP"
+    else:
+        payload, now = "json_build_object('file_id', files.id)", "now()"
+    op.execute(sa.text(
+        "INSERT INTO tasks (kind, payload, priority, status, attempts, max_attempts, run_at, created_by_user_id) "
+        f"SELECT 'extract_text', {payload}, 0, 'queued', 0, :max_attempts, {now}, claims.owner_user_id "
+        "FROM files JOIN claims ON claims.id = files.claim_id "
+        "WHERE files.blob_id IS NULL AND files.extraction_status = 'pending' "
+        "ORDER BY files.id"
+    ).bindparams(max_attempts=settings.TASK_MAX_ATTEMPTS))
+
+
+def downgrade() -> None:
+    # Tasks already queued are left to run; they only fill in extracted_text
+    pass
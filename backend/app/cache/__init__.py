@@ -0,0 +1,19 @@
+"""Cache abstraction for expensive, reproducible results (e.g. LLM summaries)."""
+from app.core.config import settings
+from app.cache.base import CacheBackend
+
+
+def create_cache() -> CacheBackend:
+    """Create the cache backend selected by CACHE_BACKEND ("memory" or "redis")."""
+    if settings.CACHE_BACKEND == "redis":
+        from app.cache.redis_cache import RedisCache
+        return RedisCache(settings.REDIS_URL, prefix=settings.CACHE_KEY_PREFIX)
+    if settings.CACHE_BACKEND == "memory":
+        from app.cache.memory_cache import MemoryCache
+        return MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES)
+    raise ValueError(f"Unknown CACHE_BACKEND: {settings.CACHE_BACKEND}")
+
+
+cache = create_cache()
+
+__all__ = ["CacheBackend", "create_cache", "cache"]
@@ -0,0 +1,27 @@
+"""Cache backend interface."""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class CacheBackend(ABC):
+    """
+    Async key/value cache for small string values.
+
+    Entries may be evicted at any time (LRU pressure or TTL expiry), so callers
+    must treat every get() as possibly missing.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+
+    @abstractmethod
+    async def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        """Store a value, expiring after ttl_seconds (never, if None)."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a value if present."""
+
+    async def close(self) -> None:
+        """Release connections held by the backend."""
@@ -0,0 +1,39 @@
+"""In-process LRU cache with per-entry TTL."""
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from app.cache.base import CacheBackend
+
+
+class MemoryCache(CacheBackend):
+    """
+    Keeps up to `max_entries` values in process memory.
+
+    The least recently used entry is evicted when full; expired entries are
+    dropped when they are next read. Not shared between worker processes.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl_seconds if ttl_seconds else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
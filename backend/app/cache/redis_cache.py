@@ -0,0 +1,34 @@
+"""Redis-backed cache (Redis, Valkey, KeyDB, Dragonfly, ...)."""
+from typing import Optional
+from redis.asyncio import Redis
+from app.cache.base import CacheBackend
+
+
+class RedisCache(CacheBackend):
+    """
+    Stores values in a Redis-compatible server, shared by all worker processes.
+
+    TTLs are enforced by the server. LRU eviction relies on the server's
+    maxmemory-policy (e.g. allkeys-lru), so configure that alongside maxmemory.
+    """
+
+    def __init__(self, url: str, prefix: str = ""):
+        self.prefix = prefix
+        self._client = Redis.from_url(url, decode_responses=True)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    async def get(self, key: str) -> Optional[str]:
+        return await self._client.get(self._key(key))
+
+    async def set(self, key: str, value: str, ttl_seconds: Optional[float] = None) -> None:
+        # Redis expiry is whole milliseconds; round up so tiny TTLs still expire
+        px = max(1, int(ttl_seconds * 1000)) if ttl_seconds else None
+        await self._client.set(self._key(key), value, px=px)
+
+    async def delete(self, key: str) -> None:
+        await self._client.delete(self._key(key))
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -1,28 +1,116 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+import uuid
+from typing import Dict
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
+from app.telemetry import instrument_engine, pool_stats
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a plain database URL to its asyncio driver (asyncpg / aiosqlite)."""
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url[len("postgresql+psycopg2://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+def get_engine_options(url: str) -> dict:
+    """
+    Pool and driver options for create_async_engine, from the DB_* settings.
+
+    Connections are recycled before server or load balancer idle timeouts
+    would drop them, so the per-checkout ping (DB_POOL_PRE_PING) is off by
+    default. With DB_PGBOUNCER, each transaction may run on a different
+    server connection, so asyncpg must not cache prepared statements or
+    reuse their names. Set DB_POOL_SIZE=0 to leave pooling to PgBouncer.
+    """
+    options = {"pool_pre_ping": settings.DB_POOL_PRE_PING}
+    if url.startswith("sqlite"):
+        # Local files: SQLAlchemy's default pool, nothing to size or time out
+        return options
+    if settings.DB_POOL_SIZE <= 0:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        )
+    if url.startswith("postgresql+asyncpg"):
+        connect_args = {"timeout": settings.DB_CONNECT_TIMEOUT_SECONDS}
+        if settings.DB_STATEMENT_TIMEOUT_MS and not settings.DB_PGBOUNCER:
+            # PgBouncer refuses unknown startup parameters; set it on the database role there instead
+            connect_args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+        if settings.DB_PGBOUNCER:
+            connect_args.update(
+                statement_cache_size=0,
+                prepared_statement_cache_size=0,
+                prepared_statement_name_func=lambda: f"__asyncpg_{uuid.uuid4()}__",
+            )
+        options["connect_args"] = connect_args
+    return options
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    url = get_async_database_url(url)
+    created = create_async_engine(
+        url,
+        echo=False,  # Set to True for SQL query logging
+        **get_engine_options(url)
+    )
+    # Statement counts and timings for request spans, and pool usage, in /metrics
+    instrument_engine(created, name)
+    return created
+
 
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,
-    echo=False,  # Set to True for SQL query logging
-)
+engine = _create_engine(settings.DATABASE_URL, "primary")
+# Read-only endpoints use the replica when one is configured
+read_engine = _create_engine(settings.DATABASE_REPLICA_URL, "replica") if settings.DATABASE_REPLICA_URL else engine
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factories. Objects stay usable after commit, since lazy
+# reloads aren't possible outside an awaited call.
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(read_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+async def get_db():
     """Dependency for getting database session."""
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
+
+async def get_read_db():
+    """
+    Dependency for a session on the read replica (the primary if none is
+    configured), for endpoints that only read.
+
+    Replicas lag the primary slightly, so a read right after a write may not
+    see it yet; don't use this where that matters.
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+def get_pool_stats() -> Dict[str, dict]:
+    """Connection pool usage of this process, by engine."""
+    stats = {"primary": pool_stats(engine)}
+    if read_engine is not engine:
+        stats["replica"] = pool_stats(read_engine)
+    return stats
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection (called on shutdown)."""
+    await engine.dispose()
+    if read_engine is not engine:
+        await read_engine.dispose()
@@ -1,22 +1,35 @@
 """FastAPI dependencies."""
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+import asyncio
+from typing import Optional
+from sqlalchemy import select
+from app.core.database import AsyncSessionLocal
 from app.models.user import User
 
+_stub_user: Optional[User] = None
+_stub_user_lock = asyncio.Lock()
 
-def get_current_user(db: Session = Depends(get_db)) -> User:
+
+async def get_current_user() -> User:
     """
     Stub for getting current user.
     For MVP, returns a fake user with id=1.
     TODO: Replace with real authentication middleware.
-    """
-    # Try to get or create user with id=1
-    user = db.query(User).filter(User.id == 1).first()
-    if not user:
-        user = User(id=1, email="user@example.com")
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-    return user
 
+    The user is looked up (and created if missing) once per process, on the
+    primary, then served from memory: requests neither query for it nor
+    need a session for it.
+    """
+    global _stub_user
+    if _stub_user is None:
+        async with _stub_user_lock:
+            if _stub_user is None:
+                async with AsyncSessionLocal() as db:
+                    # Try to get or create user with id=1
+                    user = (await db.execute(select(User).where(User.id == 1))).scalar_one_or_none()
+                    if not user:
+                        user = User(id=1, email="user@example.com")
+                        db.add(user)
+                        await db.commit()
+                        await db.refresh(user)
+                _stub_user = user
+    return _stub_user
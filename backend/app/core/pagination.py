@@ -0,0 +1,81 @@
+"""Keyset (cursor) pagination on (created_at, id)."""
+import base64
+import json
+from datetime import datetime
+from typing import List, Literal, Optional, Tuple, TypeVar
+from sqlalchemy import Select, func, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+SortOrder = Literal["desc", "asc"]
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+# Real cursors are under 80 characters; longer ones are rejected before decoding
+MAX_CURSOR_LENGTH = 256
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor can't be decoded."""
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the row with this (created_at, id)."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    if len(cursor) > MAX_CURSOR_LENGTH:
+        # Also keeps deeply nested JSON from hitting the recursion limit
+        raise InvalidCursorError("Invalid cursor")
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    model,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "desc"
+) -> Tuple[List[T], Optional[str]]:
+    """
+    Run `stmt` (a select of `model`, already filtered) one page at a time.
+
+    Rows are ordered by (created_at, id) and each page starts strictly after
+    the cursor row, so a page costs one index range scan however deep it is,
+    and rows inserted meanwhile never shift or repeat results.
+
+    Returns:
+        Tuple of (rows, next_cursor); next_cursor is None on the last page
+    """
+    created_at = model.created_at
+    if db.bind.dialect.name == "sqlite":
+        # SQLite stores server-default timestamps as text without microseconds but
+        # binds datetimes with them, so compare both in one canonical format
+        created_at = func.datetime(created_at)
+    key = tuple_(created_at, model.id)
+    if cursor:
+        after_created_at, after_id = decode_cursor(cursor)
+        if db.bind.dialect.name == "sqlite":
+            after_created_at = func.datetime(after_created_at)
+        after = tuple_(after_created_at, after_id)
+        stmt = stmt.where(key < after if order == "desc" else key > after)
+    if order == "desc":
+        stmt = stmt.order_by(created_at.desc(), model.id.desc())
+    else:
+        stmt = stmt.order_by(created_at.asc(), model.id.asc())
+
+    # One extra row tells us whether there is a next page without a COUNT
+    rows = list((await db.execute(stmt.limit(limit + 1))).scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
@@ -0,0 +1,21 @@
+"""Chunk embeddings and the on-disk vector index used for retrieval."""
+from app.core.config import settings
+from app.embeddings.base import Embedder
+from app.embeddings.index import VectorIndex, top_k
+
+
+def create_embedder() -> Embedder:
+    """Create the embedder selected by EMBEDDING_BACKEND ("hashing" or "openai")."""
+    if settings.EMBEDDING_BACKEND == "openai":
+        from app.embeddings.openai_embedder import OpenAIEmbedder
+        return OpenAIEmbedder(settings.EMBEDDING_MODEL, settings.EMBEDDING_DIMENSIONS)
+    if settings.EMBEDDING_BACKEND == "hashing":
+        from app.embeddings.hashing_embedder import HashingEmbedder
+        return HashingEmbedder(settings.EMBEDDING_DIMENSIONS)
+    raise ValueError(f"Unknown EMBEDDING_BACKEND: {settings.EMBEDDING_BACKEND}")
+
+
+embedder = create_embedder()
+vector_index = VectorIndex(settings.EMBEDDING_INDEX_PATH, embedder, batch_size=settings.EMBEDDING_BATCH_SIZE)
+
+__all__ = ["Embedder", "VectorIndex", "create_embedder", "embedder", "top_k", "vector_index"]
@@ -0,0 +1,32 @@
+"""Embedder interface."""
+from abc import ABC, abstractmethod
+from typing import List
+import numpy as np
+
+
+class Embedder(ABC):
+    """
+    Turns texts into fixed-size vectors for similarity search.
+
+    Implementations must be deterministic for a given `name`: the vector index
+    stores embeddings by chunk content hash under that name and never
+    recomputes them.
+    """
+
+    name: str
+    dimensions: int
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """Embed `texts`, returning a (len(texts), dimensions) float32 array of unit vectors."""
+
+    async def close(self) -> None:
+        """Release resources held by the embedder."""
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (all-zero rows are left as is) so dot product = cosine."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
@@ -0,0 +1,60 @@
+"""Local hashing embedder - deterministic, dependency-free vectors for offline use."""
+import asyncio
+import hashlib
+import re
+from typing import List
+import numpy as np
+from app.embeddings.base import Embedder, normalize_rows
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+_SUFFIX_PATTERN = re.compile(r"(?<=\w{3})(?:ing|ers|er|ed|es|s)$")
+_STOP_WORDS = frozenset("""
+a about above after again all am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his
+how i if in into is it its just me more most my no nor not now of off on once only or other our out over own
+please same she should so some such than that the their them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+
+class HashingEmbedder(Embedder):
+    """
+    Feature-hashing embedder over words and word pairs.
+
+    Words are lowercased, stop words dropped and common suffixes stripped
+    ("damaged" and "damages" both become "damag"). Each unigram and bigram is
+    hashed to a signed bucket; counts are
+    log-scaled so repeated terms don't dominate. Captures lexical overlap
+    only (no synonyms), but needs no model or network and gives identical
+    vectors on every host.
+    """
+
+    def __init__(self, dimensions: int = 384):
+        self.dimensions = dimensions
+        self.name = f"hashing-v2-{dimensions}"
+
+    def _features(self, text: str) -> List[str]:
+        words = [
+            _SUFFIX_PATTERN.sub("", word)
+            for word in _WORD_PATTERN.findall(text.lower()) if word not in _STOP_WORDS
+        ]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def _embed_one(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        counts = {}
+        for feature in self._features(text):
+            counts[feature] = counts.get(feature, 0) + 1
+        for feature, count in counts.items():
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign * (1.0 + np.log(count))
+        return vector
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        # CPU-bound; keep it off the event loop for large batches
+        vectors = await asyncio.to_thread(lambda: np.stack([self._embed_one(text) for text in texts]))
+        return normalize_rows(vectors)
@@ -0,0 +1,171 @@
+"""On-disk vector index of chunk embeddings, keyed by chunk content hash."""
+import asyncio
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+import numpy as np
+from app.embeddings.base import Embedder
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; appends are then only serialized per process
+    fcntl = None
+
+DIGEST_BYTES = 32
+
+
+def top_k(queries: np.ndarray, vectors: np.ndarray, k: int, batch_rows: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Cosine top-k of every query against `vectors` (both unit-normalized rows).
+
+    Scores `batch_rows` vectors at a time with one matrix product per batch, so
+    memory stays bounded for large indexes. Returns (indices, scores), each of
+    shape (len(queries), min(k, len(vectors))), best match first.
+    """
+    queries = np.atleast_2d(queries)
+    k = min(k, len(vectors))
+    best_idx = np.zeros((len(queries), 0), dtype=np.int64)
+    best_scores = np.zeros((len(queries), 0), dtype=np.float32)
+    if k <= 0:
+        return best_idx, best_scores
+
+    for start in range(0, len(vectors), batch_rows):
+        scores = queries @ vectors[start:start + batch_rows].T
+        idx = np.broadcast_to(np.arange(start, start + scores.shape[1]), scores.shape)
+        scores = np.concatenate([best_scores, scores], axis=1)
+        idx = np.concatenate([best_idx, idx], axis=1)
+        if scores.shape[1] > k:
+            keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            idx = np.take_along_axis(idx, keep, axis=1)
+        best_scores, best_idx = scores, idx
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    return np.take_along_axis(best_idx, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+class VectorIndex:
+    """
+    Append-only float32 store of embeddings, one row per distinct chunk text.
+
+    Stored under `<path>/<embedder name>/` as two files: `keys.bin` (32-byte
+    SHA-256 digests of chunk texts) and `vectors.f32` (raw float32 rows in the
+    same order), about 1.5 KB per chunk at 384 dimensions. The index is loaded
+    into memory on first use; new rows are appended under a file lock, so
+    several worker processes can share one directory. Switching embedders
+    starts a separate index.
+    """
+
+    def __init__(self, path: str, embedder: Embedder, batch_size: int = 64):
+        self.embedder = embedder
+        self.batch_size = batch_size
+        self._dir = Path(path) / embedder.name
+        self._keys_path = self._dir / "keys.bin"
+        self._vectors_path = self._dir / "vectors.f32"
+        self._lock_path = self._dir / "index.lock"
+        self._row_bytes = embedder.dimensions * 4
+        self._rows: Dict[bytes, int] = {}
+        self._vectors = np.zeros((0, embedder.dimensions), dtype=np.float32)
+        self._count = 0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _read_new_rows(self) -> None:
+        """Load rows appended since the last read (by this or another process)."""
+        if not self._keys_path.exists():
+            return
+        with open(self._keys_path, "rb") as keys_file, open(self._vectors_path, "rb") as vectors_file:
+            keys_file.seek(self._count * DIGEST_BYTES)
+            keys = keys_file.read()
+            # Vectors are written before keys, so every complete key has its row
+            count = len(keys) // DIGEST_BYTES
+            vectors_file.seek(self._count * self._row_bytes)
+            data = vectors_file.read(count * self._row_bytes)
+        count = min(count, len(data) // self._row_bytes)
+        if count == 0:
+            return
+        new_vectors = np.frombuffer(data[:count * self._row_bytes], dtype=np.float32).reshape(count, -1)
+        self._ensure_capacity(self._count + count)
+        self._vectors[self._count:self._count + count] = new_vectors
+        for i in range(count):
+            self._rows.setdefault(keys[i * DIGEST_BYTES:(i + 1) * DIGEST_BYTES], self._count + i)
+        self._count += count
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if rows > len(self._vectors):
+            # Grow geometrically so appends stay amortized O(1)
+            grown = np.zeros((max(rows, 2 * len(self._vectors), 1024), self.embedder.dimensions), dtype=np.float32)
+            grown[:self._count] = self._vectors[:self._count]
+            self._vectors = grown
+
+    def _append(self, digests: List[bytes], vectors: np.ndarray) -> None:
+        """Persist new rows and add them to memory, skipping any another process already added."""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._read_new_rows()
+                fresh = [i for i, digest in enumerate(digests) if digest not in self._rows]
+                if not fresh:
+                    return
+                with open(self._vectors_path, "ab") as vectors_file:
+                    # Drop rows orphaned by a crash between the two writes
+                    vectors_file.truncate(self._count * self._row_bytes)
+                    vectors_file.write(np.ascontiguousarray(vectors[fresh], dtype=np.float32).tobytes())
+                    vectors_file.flush()
+                    os.fsync(vectors_file.fileno())
+                with open(self._keys_path, "ab") as keys_file:
+                    keys_file.write(b"".join(digests[i] for i in fresh))
+                self._read_new_rows()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Vectors for `texts`, embedding only texts not already in the index.
+
+        Returns a (len(texts), dimensions) float32 array of unit vectors. The
+        embedder runs outside the lock, so callers embedding different texts
+        do not wait on each other; rows another caller added meanwhile are
+        skipped on append.
+        """
+        digests = [hashlib.sha256(text.encode("utf-8")).digest() for text in texts]
+        async with self._lock:
+            if not self._loaded:
+                await asyncio.to_thread(self._read_new_rows)
+                self._loaded = True
+
+            missing = {}
+            for digest, text in zip(digests, texts):
+                if digest not in self._rows:
+                    missing.setdefault(digest, text)
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+            if not missing:
+                return self._vectors[[self._rows[digest] for digest in digests]]
+
+        missing_digests = list(missing)
+        missing_texts = list(missing.values())
+        batches = [
+            await self.embedder.embed(missing_texts[start:start + self.batch_size])
+            for start in range(0, len(missing_texts), self.batch_size)
+        ]
+
+        async with self._lock:
+            await asyncio.to_thread(self._append, missing_digests, np.concatenate(batches))
+            return self._vectors[[self._rows[digest] for digest in digests]]
+
+    def get_stats(self) -> dict:
+        return {
+            "embedder": self.embedder.name,
+            "dimensions": self.embedder.dimensions,
+            "vectors": self._count,
+            "bytes": self._count * (self._row_bytes + DIGEST_BYTES),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,20 @@
+"""OpenAI embeddings API embedder."""
+from typing import List
+import numpy as np
+from app.embeddings.base import Embedder, normalize_rows
+from app.services.llm_service import get_llm_client
+
+
+class OpenAIEmbedder(Embedder):
+    """Embeds through the shared LLM client, so calls share its pool, retries and rate limits."""
+
+    def __init__(self, model: str, dimensions: int):
+        self.model = model
+        self.dimensions = dimensions
+        self.name = f"openai-{model}-{dimensions}"
+
+    async def embed(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dimensions), dtype=np.float32)
+        vectors = await get_llm_client().embed(texts, model=self.model, dimensions=self.dimensions)
+        return normalize_rows(np.array(vectors, dtype=np.float32))
@@ -1,8 +1,22 @@
 """FastAPI application entry point."""
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.core.config import settings
-from app.routers import claims, files, agent, artifacts
+from app.core.database import AsyncSessionLocal, dispose_engines
+from app import worker
+from app.models.task import TASK_STATUSES
+from app.routers import claims, files, agent, artifacts, metrics, search, summary_jobs, tasks
+from app.services import extraction_service, llm_service, task_service
+from app.storage import storage
+from app.cache import cache
+from app.telemetry import TelemetryMiddleware, configure_logging, metrics as telemetry_metrics, record_pool_timeout, registry
+
+configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+
+TASKS_BY_STATUS = telemetry_metrics.gauge("task_queue_tasks", "Tasks in the queue, by kind and status.", ["kind", "status"])
+TASK_QUEUE_OLDEST = telemetry_metrics.gauge("task_queue_oldest_queued_seconds", "Age of the oldest runnable queued task.")
 
 app = FastAPI(
     title="Claim Agent API",
@@ -17,13 +31,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID"],
 )
+# Added last so it runs first and times the whole request, CORS included
+app.add_middleware(TelemetryMiddleware)
 
 # Include routers
 app.include_router(claims.router, prefix=settings.API_V1_PREFIX)
 app.include_router(files.router, prefix=settings.API_V1_PREFIX)
 app.include_router(agent.router, prefix=settings.API_V1_PREFIX)
 app.include_router(artifacts.router, prefix=settings.API_V1_PREFIX)
+app.include_router(metrics.router, prefix=settings.API_V1_PREFIX)
+app.include_router(search.router, prefix=settings.API_V1_PREFIX)
+app.include_router(summary_jobs.router, prefix=settings.API_V1_PREFIX)
+app.include_router(tasks.router, prefix=settings.API_V1_PREFIX)
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """Every pooled connection stayed busy for DB_POOL_TIMEOUT_SECONDS: report overload, not a server error."""
+    record_pool_timeout()
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database busy, try again shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.on_event("startup")
+async def startup():
+    """Start the in-process task worker, unless workers run as separate processes."""
+    if settings.TASK_WORKER_IN_API:
+        worker.start_in_process()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop the task worker and the text extraction worker processes, and close storage, cache, LLM and database connections."""
+    await worker.stop_in_process()
+    extraction_service.shutdown_executor()
+    await llm_service.close_llm_client()
+    await cache.close()
+    await storage.close()
+    await dispose_engines()
 
 
 @app.get("/")
@@ -37,3 +87,23 @@ def health():
     """Health check endpoint."""
     return {"status": "healthy"}
 
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """Process metrics in the Prometheus text format, for scraping."""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("Metrics are disabled\n", status_code=404)
+    try:
+        # Queue depth is shared state in the database, read fresh per scrape
+        async with AsyncSessionLocal() as db:
+            stats = await task_service.get_queue_stats(db)
+        for kind, by_status in stats["by_kind"].items():
+            # Every status, so one that has emptied reads 0 rather than its last count
+            for status in TASK_STATUSES:
+                TASKS_BY_STATUS.set(by_status.get(status, 0), kind=kind, status=status)
+        TASK_QUEUE_OLDEST.set(stats["oldest_queued_seconds"])
+    except Exception:
+        # Still export the process metrics if the database is unavailable
+        pass
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -4,6 +4,11 @@ from app.models.claim import Claim
 from app.models.file import File
 from app.models.artifact import Artifact
 from app.models.artifact_version import ArtifactVersion
+from app.models.blob import Blob
+from app.models.proposal import Proposal
+from app.models.summary_job import SummaryJob
+from app.models.summary_job_item import SummaryJobItem
+from app.models.task import Task
 
-__all__ = ["User", "Claim", "File", "Artifact", "ArtifactVersion"]
+__all__ = ["User", "Claim", "File", "Artifact", "ArtifactVersion", "Blob", "Proposal", "SummaryJob", "SummaryJobItem", "Task"]
 
@@ -1,5 +1,5 @@
 """Artifact model."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -9,6 +9,13 @@ class Artifact(Base):
     """Artifact model - represents generated artifacts (summary, letters, etc.)."""
     
     __tablename__ = "artifacts"
+    __table_args__ = (
+        # Keyset pagination of a claim's artifacts on (created_at, id), optionally by type
+        Index("ix_artifacts_claim_created_at_id", "claim_id", "created_at", "id"),
+        Index("ix_artifacts_claim_type_created_at_id", "claim_id", "type", "created_at", "id"),
+    )
+    # Fetch server defaults (created_at) in the INSERT itself, so new rows need no refresh
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     claim_id = Column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
@@ -1,6 +1,6 @@
 """Artifact version model."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, LargeBinary, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -9,10 +9,27 @@ class ArtifactVersion(Base):
     """Artifact version model - tracks version history of artifacts."""
     
     __tablename__ = "artifact_versions"
+    __table_args__ = (
+        Index("ix_artifact_versions_artifact_version_number", "artifact_id", "version_number", unique=True),
+    )
+    # Fetch server defaults (created_at) in the INSERT itself, so new rows need no refresh
+    __mapper_args__ = {"eager_defaults": True}
     
     id = Column(Integer, primary_key=True, index=True)
     artifact_id = Column(Integer, ForeignKey("artifacts.id"), nullable=False, index=True)
-    content = Column(Text, nullable=False)  # Artifact content (text, markdown, or JSON string)
+    version_number = Column(Integer, nullable=False)  # 1, 2, ... within the artifact
+    # Artifact content (text, markdown, or JSON string). Only loaded on request (undefer).
+    # Stored in full for the current version and periodic snapshots; older versions
+    # hold `delta` instead (see artifact_service.get_version_content)
+    content = deferred(Column(Text, nullable=True), raiseload=True)
+    # Reverse delta: rebuilds this version from the content of base_version (the next version)
+    delta = deferred(Column(LargeBinary, nullable=True), raiseload=True)
+    # Search-only text of a delta version: the lines the next version removed or
+    # changed (delta_service.delta_text), so full-text search still finds them
+    search_text = deferred(Column(Text, nullable=True), raiseload=True)
+    base_version_id = Column(Integer, ForeignKey("artifact_versions.id", ondelete="SET NULL"), nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the full content
+    size_bytes = Column(Integer, nullable=True)  # Size of the full content
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Nullable if created by agent
     version_metadata = Column(JSON, nullable=True)  # JSONB: model info, prompt, etc. (renamed from 'metadata' to avoid SQLAlchemy reserved name)
@@ -21,3 +38,8 @@ class ArtifactVersion(Base):
     artifact = relationship("Artifact", back_populates="versions", foreign_keys=[artifact_id])
     created_by = relationship("User")
 
+    @property
+    def is_snapshot(self) -> bool:
+        """True if the content is stored in full rather than as a delta."""
+        return self.base_version_id is None
+
@@ -0,0 +1,20 @@
+"""Blob model."""
+from sqlalchemy import Column, Integer, String, DateTime, BigInteger, Text
+from sqlalchemy.sql import func
+from app.core.database import Base
+from app.models.file import EXTRACTION_PENDING
+
+
+class Blob(Base):
+    """Blob model - content-addressed file bytes shared by every File with the same content."""
+    
+    __tablename__ = "blobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256 hex digest
+    storage_path = Column(String, nullable=False)  # blobs/ab/cd/<hash>/<generation>; older blobs: blobs/ab/cd/<hash>
+    size_bytes = Column(BigInteger, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # Number of File rows pointing at this blob
+    extracted_text = Column(Text, nullable=True)  # Extracted once, shared with every referencing File
+    extraction_status = Column(String, nullable=False, default=EXTRACTION_PENDING, server_default=EXTRACTION_PENDING)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
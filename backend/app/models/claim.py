@@ -1,5 +1,5 @@
 """Claim model."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -9,6 +9,15 @@ class Claim(Base):
     """Claim model - represents a claim repository."""
     
     __tablename__ = "claims"
+    __table_args__ = (
+        # Keyset pagination of a user's claims on (created_at, id)
+        Index("ix_claims_owner_created_at_id", "owner_user_id", "created_at", "id"),
+        # Reference number prefix search (LIKE 'ABC%') on Postgres
+        Index(
+            "ix_claims_owner_reference_number", "owner_user_id", "reference_number",
+            postgresql_ops={"reference_number": "varchar_pattern_ops"}
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -1,14 +1,24 @@
 """File model."""
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, BigInteger, Text, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
+# Text extraction states for File.extraction_status
+EXTRACTION_PENDING = "pending"
+EXTRACTION_DONE = "done"
+EXTRACTION_FAILED = "failed"
+
 
 class File(Base):
     """File model - represents uploaded files in a claim."""
     
     __tablename__ = "files"
+    __table_args__ = (
+        # Keyset pagination of a claim's files on (created_at, id), optionally by MIME type
+        Index("ix_files_claim_created_at_id", "claim_id", "created_at", "id"),
+        Index("ix_files_claim_mime_type_created_at_id", "claim_id", "mime_type", "created_at", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     claim_id = Column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
@@ -16,7 +26,12 @@ class File(Base):
     storage_path = Column(String, nullable=False)  # Path to file in storage (local or S3 key)
     mime_type = Column(String, nullable=True)
     size_bytes = Column(BigInteger, nullable=True)
-    extracted_text = Column(Text, nullable=True)  # Extracted text content (for PDFs, text files, etc.)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 hex digest of the stored bytes
+    blob_id = Column(Integer, ForeignKey("blobs.id"), nullable=True, index=True)  # Null for files stored before dedup
+    # Extracted text content (for PDFs, text files, etc.). Can be megabytes, so it is
+    # only loaded on request (undefer); touching it unloaded raises instead of lazy-loading
+    extracted_text = deferred(Column(Text, nullable=True), raiseload=True)
+    extraction_status = Column(String, nullable=False, default=EXTRACTION_PENDING, server_default=EXTRACTION_PENDING)  # pending, done, failed
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # Relationships
@@ -0,0 +1,39 @@
+"""Proposal model."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, LargeBinary, JSON, Index
+from sqlalchemy.orm import deferred
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+PROPOSAL_PENDING = "pending"
+PROPOSAL_ACCEPTED = "accepted"
+
+
+class Proposal(Base):
+    """Proposal model - an agent-proposed change to a file or artifact, awaiting acceptance."""
+    
+    __tablename__ = "proposals"
+    __table_args__ = (
+        # Retention (proposal_service.prune_proposals): pending proposals by age,
+        # and accepted proposals for the same target
+        Index("ix_proposals_status_created_at", "status", "created_at"),
+        Index("ix_proposals_claim_target", "claim_id", "type", "target_id", "status"),
+    )
+    # Fetch server defaults (created_at) in the INSERT itself, so new rows need no refresh
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    claim_id = Column(Integer, ForeignKey("claims.id"), nullable=False, index=True)
+    type = Column(String, nullable=False)  # "file" or "artifact"
+    target_id = Column(Integer, nullable=True)  # file_id or artifact_id (None if creating a new artifact)
+    target_name = Column(String, nullable=False)
+    base_hash = Column(String(64), nullable=False)  # SHA-256 of the content the change was made against
+    # The proposed content, as a delta against the base content (see delta_service)
+    delta = deferred(Column(LargeBinary, nullable=False), raiseload=True)
+    hunks = deferred(Column(JSON, nullable=False), raiseload=True)  # Structured diff, for display
+    diff_stats = Column(JSON, nullable=False)
+    source_files = Column(JSON, nullable=True)  # Files a proposed summary was built from
+    context_report = Column(JSON, nullable=True)
+    status = Column(String, nullable=False, default=PROPOSAL_PENDING, server_default=PROPOSAL_PENDING)  # pending, accepted
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    accepted_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,39 @@
+"""Summary job model."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# States for SummaryJob.status
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+
+
+class SummaryJob(Base):
+    """Summary job model - a batch of claims whose summaries are regenerated in the background."""
+    
+    __tablename__ = "summary_jobs"
+    __table_args__ = (
+        # Keyset pagination of a user's jobs on (created_at, id)
+        Index("ix_summary_jobs_user_created_at_id", "created_by_user_id", "created_at", "id"),
+    )
+    # Fetch server defaults (created_at) in the INSERT itself, so new rows need no refresh
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    status = Column(String, nullable=False, default=JOB_PENDING, server_default=JOB_PENDING, index=True)  # pending, running, completed
+    claim_filter = Column(JSON, nullable=True)  # The request's claim ids / filters, for reference
+    total = Column(Integer, nullable=False)  # Claims in the job
+    # Progress counters, updated as each claim finishes. processed = proposed + unchanged + failed
+    processed = Column(Integer, nullable=False, default=0, server_default="0")
+    proposed = Column(Integer, nullable=False, default=0, server_default="0")
+    unchanged = Column(Integer, nullable=False, default=0, server_default="0")
+    failed = Column(Integer, nullable=False, default=0, server_default="0")
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    items = relationship("SummaryJobItem", back_populates="job", cascade="all, delete-orphan")
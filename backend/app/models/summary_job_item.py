@@ -0,0 +1,44 @@
+"""Summary job item model."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# States for SummaryJobItem.status
+ITEM_PENDING = "pending"
+ITEM_RUNNING = "running"
+ITEM_PROPOSED = "proposed"  # A summary proposal was stored
+ITEM_UNCHANGED = "unchanged"  # The current summary is up to date
+ITEM_FAILED = "failed"
+ITEM_FINISHED = (ITEM_PROPOSED, ITEM_UNCHANGED, ITEM_FAILED)
+
+
+class SummaryJobItem(Base):
+    """Summary job item model - one claim of a summary job, with its outcome."""
+    
+    __tablename__ = "summary_job_items"
+    __table_args__ = (
+        # Remaining work of a job, and keyset pagination of its items
+        Index("ix_summary_job_items_job_status", "job_id", "status"),
+        Index("ix_summary_job_items_job_created_at_id", "job_id", "created_at", "id"),
+        # Results in completion order, for streaming
+        Index("ix_summary_job_items_job_sequence", "job_id", "sequence"),
+    )
+    # Fetch server defaults (created_at) in the INSERT itself, so new rows need no refresh
+    __mapper_args__ = {"eager_defaults": True}
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("summary_jobs.id", ondelete="CASCADE"), nullable=False)
+    claim_id = Column(Integer, ForeignKey("claims.id", ondelete="CASCADE"), nullable=False)
+    status = Column(String, nullable=False, default=ITEM_PENDING, server_default=ITEM_PENDING)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # Times processing started
+    proposal_id = Column(Integer, ForeignKey("proposals.id", ondelete="SET NULL"), nullable=True)
+    error = Column(String, nullable=True)
+    # 1, 2, ... in the order items of the job finished
+    sequence = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    
+    # Relationships
+    job = relationship("SummaryJob", back_populates="items")
@@ -0,0 +1,48 @@
+"""Task model."""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Text, Index, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+# States for Task.status
+TASK_QUEUED = "queued"  # Waiting for a worker (possibly until run_at, after a failed attempt)
+TASK_RUNNING = "running"  # Leased by a worker until locked_until
+TASK_DONE = "done"
+TASK_DEAD = "dead"  # Out of attempts; kept for inspection and manual retry
+TASK_STATUSES = (TASK_QUEUED, TASK_RUNNING, TASK_DONE, TASK_DEAD)
+
+
+class Task(Base):
+    """Task model - a unit of background work in the durable task queue, run by a worker process."""
+
+    __tablename__ = "tasks"
+    __table_args__ = (
+        # Claiming: the next queued tasks by priority (highest first), then age, as claim_tasks orders them
+        Index(
+            "ix_tasks_queued_priority_run_at", text("priority DESC"), "run_at", "id",
+            postgresql_where=text("status = 'queued'"),
+            sqlite_where=text("status = 'queued'")
+        ),
+        # Finding running tasks whose lease has expired
+        Index("ix_tasks_status_locked_until", "status", "locked_until"),
+        # Keyset pagination of a user's tasks on (created_at, id)
+        Index("ix_tasks_user_created_at_id", "created_by_user_id", "created_at", "id"),
+    )
+    # Fetch server defaults (created_at) in the INSERT itself, so new rows need no refresh
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String, nullable=False)  # Selects the handler, e.g. "extract_text"
+    payload = Column(JSON, nullable=False)  # Handler arguments (ids, not content)
+    priority = Column(Integer, nullable=False, default=0, server_default="0")  # Higher runs first
+    status = Column(String, nullable=False, default=TASK_QUEUED, server_default=TASK_QUEUED)  # queued, running, done, dead
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")  # Times a worker claimed it
+    max_attempts = Column(Integer, nullable=False)
+    run_at = Column(DateTime(timezone=True), nullable=False)  # Not claimed before this (retry backoff)
+    locked_by = Column(String, nullable=True)  # Worker holding the lease
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Lease expiry; renewed while the handler runs
+    last_error = Column(Text, nullable=True)
+    result = Column(JSON, nullable=True)
+    created_by_user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)  # Latest attempt
+    finished_at = Column(DateTime(timezone=True), nullable=True)
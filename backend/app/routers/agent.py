@@ -1,76 +1,174 @@
 """Agent router."""
+import json
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
+from app.models.proposal import Proposal as ProposalModel
 from app.schemas.agent import AgentChatRequest, AgentChatResponse, AgentAcceptRequest, Proposal
-from app.services import claim_service, agent_service, file_service, artifact_service
+from app.services import claim_service, agent_service, file_service, artifact_service, proposal_service
+from app.services.proposal_service import ProposalConflictError
 
 router = APIRouter(prefix="/claims/{claim_id}/agent", tags=["agent"])
 
 
 @router.post("/generate-summary", response_model=AgentChatResponse)
-def generate_summary(
+async def generate_summary(
     claim_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Generate or update summary from claim files."""
-    # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    # Verify claim exists and user owns it, loading its files (with text) and artifacts
+    claim = await claim_service.get_claim_context(db, claim_id, current_user.id, with_file_text=True)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
+    # End the transaction so the connection goes back to the pool during the
+    # LLM calls; the loaded claim stays usable
+    await db.commit()
     
     try:
-        proposals = agent_service.generate_summary_proposal(db, claim_id)
-        return AgentChatResponse(proposals=proposals)
+        drafts = await agent_service.generate_summary_proposal(claim)
+        proposals = await proposal_service.create_proposals(db, claim_id, drafts, current_user.id)
+        return AgentChatResponse(proposals=[Proposal.model_validate(proposal) for proposal in proposals])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating summary: {str(e)}")
 
 
+def _version_metadata(proposal: ProposalModel) -> dict:
+    """Metadata for an accepted artifact version, including the files it was built from."""
+    metadata = {"source": "agent", "command": "user_request", "proposal_id": proposal.id}
+    if proposal.source_files is not None:
+        metadata["source_files"] = proposal.source_files
+    return metadata
+
+
+def _sse_event(event: str, data: str) -> str:
+    """Format one Server-Sent Event frame."""
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+@router.post("/generate-summary/stream")
+async def generate_summary_stream(
+    claim_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Generate or update summary from claim files, streamed as Server-Sent Events.
+    
+    Emits `token` events ({"text": ...}) as the summary is produced, then one
+    `proposal` event with the stored proposal. Failures after the stream has
+    started are reported as an `error` event ({"detail": ...}).
+    """
+    # Verify claim exists and user owns it, loading its files (with text) and artifacts
+    claim = await claim_service.get_claim_context(db, claim_id, current_user.id, with_file_text=True)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    # End the transaction so the connection goes back to the pool during the
+    # LLM calls; the loaded claim stays usable
+    await db.commit()
+    
+    async def events():
+        try:
+            async for kind, payload in agent_service.stream_summary_proposal(claim):
+                if kind == "token":
+                    yield _sse_event("token", json.dumps({"text": payload}))
+                else:
+                    [proposal] = await proposal_service.create_proposals(db, claim_id, [payload], current_user.id)
+                    yield _sse_event("proposal", Proposal.model_validate(proposal).model_dump_json())
+        except Exception as e:
+            yield _sse_event("error", json.dumps({"detail": f"Error generating summary: {str(e)}"}))
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
 @router.post("/chat", response_model=AgentChatResponse)
-def agent_chat(
+async def agent_chat(
     claim_id: int,
     request: AgentChatRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Process an agent command and return proposals."""
-    # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    """Process an agent command and return proposals, or answer a question about the claim."""
+    # Verify claim exists and user owns it, loading its files (with text) and artifacts
+    claim = await claim_service.get_claim_context(db, claim_id, current_user.id, with_file_text=True)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
+    # End the transaction so the connection goes back to the pool during the
+    # LLM calls; the loaded claim stays usable
+    await db.commit()
     
     try:
-        proposals = agent_service.process_command(db, claim_id, request.message)
-        return AgentChatResponse(proposals=proposals)
+        drafts, reply = await agent_service.process_command(claim, request.message)
+        proposals = await proposal_service.create_proposals(db, claim_id, drafts, current_user.id)
+        return AgentChatResponse(reply=reply, proposals=[Proposal.model_validate(proposal) for proposal in proposals])
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing command: {str(e)}")
 
 
+@router.get("/proposals/{proposal_id}", response_model=Proposal)
+async def get_proposal(
+    claim_id: int,
+    proposal_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a stored proposal with its diff."""
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    
+    proposal = await proposal_service.get_proposal(db, proposal_id, claim_id)
+    if not proposal:
+        raise HTTPException(status_code=404, detail="Proposal not found")
+    return proposal
+
+
 @router.post("/accept")
-def accept_proposal(
+async def accept_proposal(
     claim_id: int,
     request: AgentAcceptRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Accept a proposal (file or artifact change)."""
+    """
+    Accept a stored proposal (file or artifact change) by id.
+    
+    The change is applied only if its target still has the content the
+    proposal was made against; otherwise, or if the proposal was already
+    accepted, responds 409 and nothing is written. The target row (and the
+    claim, which serializes creating its summary) is locked, so the check
+    and the write can't interleave with a concurrent accept.
+    """
     try:
         # Verify claim exists and user owns it
-        claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+        claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id, for_update=True)
         if not claim:
             raise HTTPException(status_code=404, detail="Claim not found")
         
-        proposal = request.proposal
+        proposal = await proposal_service.get_proposal(db, request.proposal_id, claim_id, with_delta=True)
+        if not proposal:
+            raise HTTPException(status_code=404, detail="Proposal not found")
         
         if proposal.type == "file":
             # Update file content
             if not proposal.target_id:
                 raise HTTPException(status_code=400, detail="File ID is required for file proposals")
             
-            file = file_service.get_file_with_claim_check(db, proposal.target_id, claim_id)
+            file = await file_service.get_file_with_claim_check(
+                db, proposal.target_id, claim_id, with_text=True, for_update=True
+            )
             if not file:
                 raise HTTPException(status_code=404, detail="File not found")
             
@@ -82,8 +180,12 @@ def accept_proposal(
                     detail=f"Cannot update '{file.filename}'. Only text files can be updated. PDFs and images can be read but not modified."
                 )
             
+            new_content = proposal_service.apply_proposal(proposal, file.extracted_text or "")
+            await proposal_service.mark_accepted(db, proposal)
             try:
-                file_service.update_file_content(file, proposal.new_content)
+                await file_service.update_file_content(db, file, new_content)
+                # update_file_content doesn't commit when the content is unchanged
+                await db.commit()
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Failed to update file: {str(e)}")
             
@@ -93,37 +195,44 @@ def accept_proposal(
             # Create or update artifact
             if proposal.target_id:
                 # Update existing artifact
-                artifact = artifact_service.get_artifact(db, proposal.target_id)
-                if not artifact or artifact.claim_id != claim_id:
+                artifact = await artifact_service.get_artifact_for_update(db, proposal.target_id, claim_id)
+                if not artifact:
                     raise HTTPException(status_code=404, detail="Artifact not found")
                 
-                artifact_service.create_artifact_version(
+                current_content = artifact.current_version.content if artifact.current_version else ""
+                new_content = proposal_service.apply_proposal(proposal, current_content)
+                await proposal_service.mark_accepted(db, proposal)
+                await artifact_service.create_artifact_version(
                     db,
-                    artifact.id,
-                    proposal.new_content,
+                    artifact,
+                    new_content,
                     created_by_user_id=current_user.id,
-                    version_metadata={"source": "agent", "command": "user_request"}
+                    version_metadata=_version_metadata(proposal)
                 )
                 return {"status": "accepted", "type": "artifact", "artifact_id": artifact.id}
             else:
-                # Create new artifact (e.g., summary)
+                # Create new artifact (e.g., summary), unless one was created since the proposal
+                new_content = proposal_service.apply_proposal(proposal, "")
+                if await artifact_service.get_artifact_by_type(db, claim_id, "summary"):
+                    raise ProposalConflictError("A summary was created since this proposal was made. Generate a new proposal.")
+                await proposal_service.mark_accepted(db, proposal)
                 from app.schemas.artifact import ArtifactCreate
                 artifact_data = ArtifactCreate(type="summary", title="Summary")
-                artifact = artifact_service.create_artifact(db, artifact_data, claim_id)
-                
-                artifact_service.create_artifact_version(
+                artifact = await artifact_service.create_artifact(
                     db,
-                    artifact.id,
-                    proposal.new_content,
+                    artifact_data,
+                    claim_id,
+                    content=new_content,
                     created_by_user_id=current_user.id,
-                    version_metadata={"source": "agent", "command": "user_request"}
+                    version_metadata=_version_metadata(proposal)
                 )
                 return {"status": "accepted", "type": "artifact", "artifact_id": artifact.id}
         
         else:
             raise HTTPException(status_code=400, detail=f"Unknown proposal type: {proposal.type}")
+    except (ProposalConflictError, artifact_service.VersionConflictError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error accepting proposal: {str(e)}")
-
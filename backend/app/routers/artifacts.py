@@ -1,48 +1,162 @@
 """Artifacts router."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_read_db
 from app.core.dependencies import get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError, SortOrder
 from app.models.user import User
-from app.schemas.artifact import Artifact
-from app.services import claim_service, artifact_service
+from app.schemas.artifact import Artifact, ArtifactListItem
+from app.schemas.artifact_version import ArtifactVersion, ArtifactVersionDiff, ArtifactVersionListItem
+from app.schemas.pagination import Page
+from app.services import claim_service, artifact_service, diff_service
 
 router = APIRouter(prefix="/claims/{claim_id}/artifacts", tags=["artifacts"])
 
 
-@router.get("", response_model=List[Artifact])
-def list_artifacts(
+@router.get("", response_model=Page[ArtifactListItem])
+async def list_artifacts(
     claim_id: int,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "desc",
+    type: Optional[str] = Query(None, max_length=50),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all artifacts for a claim."""
+    """List a claim's artifacts, one page at a time. Fetch an artifact by ID for its content."""
     # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    artifacts = artifact_service.get_artifacts_by_claim(db, claim_id)
-    return artifacts
+    try:
+        artifacts, next_cursor = await artifact_service.get_artifacts_by_claim(
+            db,
+            claim_id,
+            cursor=cursor,
+            limit=limit,
+            order=order,
+            artifact_type=type,
+            created_after=created_after,
+            created_before=created_before
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=artifacts, next_cursor=next_cursor)
 
 
 @router.get("/{artifact_id}", response_model=Artifact)
-def get_artifact(
+async def get_artifact(
     claim_id: int,
     artifact_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get an artifact by ID."""
     # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    artifact = artifact_service.get_artifact(db, artifact_id)
+    artifact = await artifact_service.get_artifact(db, artifact_id)
     if not artifact or artifact.claim_id != claim_id:
         raise HTTPException(status_code=404, detail="Artifact not found")
     
     return artifact
 
+
+
+async def _get_owned_artifact(db: AsyncSession, claim_id: int, artifact_id: int, user_id: int):
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, user_id)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    artifact = await artifact_service.get_artifact_with_claim_check(db, artifact_id, claim_id)
+    if not artifact:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return artifact
+
+
+async def _get_version(db: AsyncSession, artifact_id: int, version_id: int):
+    version = await artifact_service.get_version(db, artifact_id, version_id)
+    if not version:
+        raise HTTPException(status_code=404, detail="Artifact version not found")
+    return version
+
+
+@router.get("/{artifact_id}/versions", response_model=Page[ArtifactVersionListItem])
+async def list_artifact_versions(
+    claim_id: int,
+    artifact_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "desc",
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List an artifact's versions, newest first by default, without content."""
+    await _get_owned_artifact(db, claim_id, artifact_id, current_user.id)
+    try:
+        versions, next_cursor = await artifact_service.get_versions(
+            db, artifact_id, cursor=cursor, limit=limit, order=order
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=versions, next_cursor=next_cursor)
+
+
+@router.get("/{artifact_id}/versions/{version_id}", response_model=ArtifactVersion)
+async def get_artifact_version(
+    claim_id: int,
+    artifact_id: int,
+    version_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get one version of an artifact with its full content."""
+    await _get_owned_artifact(db, claim_id, artifact_id, current_user.id)
+    version = await _get_version(db, artifact_id, version_id)
+    content = await artifact_service.get_version_content(db, version)
+    return ArtifactVersion(
+        id=version.id,
+        artifact_id=version.artifact_id,
+        version_number=version.version_number,
+        content=content,
+        version_metadata=version.version_metadata,
+        created_at=version.created_at,
+        created_by_user_id=version.created_by_user_id
+    )
+
+
+@router.get("/{artifact_id}/diff", response_model=ArtifactVersionDiff)
+async def diff_artifact_versions(
+    claim_id: int,
+    artifact_id: int,
+    from_version: int = Query(..., description="Version ID to diff from"),
+    to_version: int = Query(..., description="Version ID to diff to"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Unified diff between any two versions of an artifact."""
+    await _get_owned_artifact(db, claim_id, artifact_id, current_user.id)
+    old = await _get_version(db, artifact_id, from_version)
+    new = await _get_version(db, artifact_id, to_version)
+    diff = await asyncio.to_thread(
+        diff_service.compute_diff,
+        await artifact_service.get_version_content(db, old),
+        await artifact_service.get_version_content(db, new),
+        f"v{old.version_number}",
+        f"v{new.version_number}"
+    )
+    return ArtifactVersionDiff(
+        artifact_id=artifact_id,
+        from_version_id=old.id,
+        to_version_id=new.id,
+        diff=diff["unified"],
+        hunks=diff["hunks"],
+        stats=diff["stats"]
+    )
@@ -1,45 +1,66 @@
 """Claims router."""
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.database import get_db, get_read_db
 from app.core.dependencies import get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError, SortOrder
 from app.models.user import User
 from app.schemas.claim import Claim, ClaimCreate
+from app.schemas.pagination import Page
 from app.services import claim_service
 
 router = APIRouter(prefix="/claims", tags=["claims"])
 
 
 @router.post("", response_model=Claim, status_code=201)
-def create_claim(
+async def create_claim(
     claim_data: ClaimCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Create a new claim."""
-    claim = claim_service.create_claim(db, claim_data, current_user.id)
+    claim = await claim_service.create_claim(db, claim_data, current_user.id)
     return claim
 
 
-@router.get("", response_model=List[Claim])
-def list_claims(
-    db: Session = Depends(get_db),
+@router.get("", response_model=Page[Claim])
+async def list_claims(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "desc",
+    reference_prefix: Optional[str] = Query(None, max_length=100),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all claims for the current user."""
-    claims = claim_service.get_claims_by_owner(db, current_user.id)
-    return claims
+    """List the current user's claims, one page at a time (newest first by default)."""
+    try:
+        claims, next_cursor = await claim_service.get_claims_by_owner(
+            db,
+            current_user.id,
+            cursor=cursor,
+            limit=limit,
+            order=order,
+            reference_prefix=reference_prefix,
+            created_after=created_after,
+            created_before=created_before
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=claims, next_cursor=next_cursor)
 
 
 @router.get("/{claim_id}", response_model=Claim)
-def get_claim(
+async def get_claim(
     claim_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a claim by ID."""
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     return claim
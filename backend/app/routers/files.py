@@ -1,113 +1,201 @@
 """Files router."""
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File as FastAPIFile
-from sqlalchemy.orm import Session
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, UploadFile, File as FastAPIFile
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
 from pathlib import Path
-import uuid
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError, SortOrder
+from app.core.database import get_db, get_read_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
-from app.models.file import File
-from app.schemas.file import File as FileSchema
-from app.services import claim_service, file_service
-from app.storage.local_storage import storage
+from app.schemas.file import File as FileSchema, FileListItem
+from app.schemas.pagination import Page
+from app.services import claim_service, file_service, task_service
+from app.storage import storage
 
 router = APIRouter(prefix="/claims/{claim_id}/files", tags=["files"])
 
 
 @router.post("", response_model=FileSchema, status_code=201)
-def upload_file(
+async def upload_file(
     claim_id: int,
     file: UploadFile = FastAPIFile(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Upload a file to a claim."""
+    """
+    Upload a file to a claim.
+
+    Text extraction is queued as a background task; follow it through
+    extraction_task_id (see /tasks) or the file's extraction_status.
+    """
     # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    # Generate storage path
-    file_id = uuid.uuid4().hex[:8]
-    storage_path = f"claims/{claim_id}/{file_id}_{file.filename}"
-    
-    # Read file content
-    file_content = file.file.read()
+    # Reject early when the client declared a size over the limit
+    if file.size is not None and file.size > settings.MAX_UPLOAD_SIZE_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
     
-    # Save to storage
-    storage.save_file(file_content, storage_path)
+    # Stream into the deduplicated blob store, hashing as we go
+    try:
+        db_file, extraction_task = await file_service.create_file_from_upload(db, claim_id, file, current_user.id)
+    except file_service.UploadTooLargeError:
+        raise HTTPException(status_code=413, detail="File too large")
     
-    # Create file record
-    db_file = File(
-        claim_id=claim_id,
-        filename=file.filename,
-        storage_path=storage_path,
-        mime_type=file.content_type,
-        size_bytes=len(file_content)
-    )
-    db.add(db_file)
-    db.commit()
-    db.refresh(db_file)
+    # Text is extracted on the task queue so agent calls never parse inline.
+    # Re-uploads of already-extracted content skip this entirely.
+    response = FileSchema.model_validate(db_file)
+    if extraction_task:
+        task_service.notify_workers()
+        response.extraction_task_id = extraction_task.id
     
-    return db_file
+    return response
 
 
-@router.get("", response_model=List[FileSchema])
-def list_files(
+@router.get("", response_model=Page[FileListItem])
+async def list_files(
     claim_id: int,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "desc",
+    mime_type: Optional[str] = Query(None, max_length=255),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """List all files for a claim."""
+    """List a claim's files, one page at a time (newest first by default)."""
     # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    files = file_service.get_files_by_claim(db, claim_id)
-    return files
+    try:
+        files, next_cursor = await file_service.get_files_by_claim(
+            db,
+            claim_id,
+            cursor=cursor,
+            limit=limit,
+            order=order,
+            mime_type=mime_type,
+            created_after=created_after,
+            created_before=created_before
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=files, next_cursor=next_cursor)
 
 
 @router.get("/{file_id}", response_model=FileSchema)
-def get_file(
+async def get_file(
     claim_id: int,
     file_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get a file by ID."""
     # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    file = file_service.get_file_with_claim_check(db, file_id, claim_id)
+    file = await file_service.get_file_with_claim_check(db, file_id, claim_id)
     if not file:
         raise HTTPException(status_code=404, detail="File not found")
     
     return file
 
 
+@router.get("/{file_id}/content")
+async def download_file(
+    claim_id: int,
+    file_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream a file's bytes from storage. Supports a single `Range: bytes=start-end` request."""
+    # Verify claim exists and user owns it
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    
+    file = await file_service.get_file_with_claim_check(db, file_id, claim_id)
+    if not file:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    try:
+        size = (await storage.stat(file.storage_path)).size_bytes
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File content not found")
+    
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'inline; filename="{Path(file.filename).name}"',
+    }
+    media_type = file.mime_type or "application/octet-stream"
+    
+    byte_range = _parse_range(range_header, size) if range_header else None
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(storage.read_stream(file.storage_path), media_type=media_type, headers=headers)
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+    headers["Content-Length"] = str(end - start)
+    return StreamingResponse(
+        storage.read_stream(file.storage_path, start=start, end=end),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
+
+
+def _parse_range(range_header: str, size: int) -> Tuple[int, int]:
+    """Parse a single-range `bytes=` header into a half-open (start, end) range."""
+    try:
+        unit, _, spec = range_header.partition("=")
+        if unit.strip() != "bytes" or "," in spec:
+            raise ValueError
+        start_text, _, end_text = spec.strip().partition("-")
+        if start_text:
+            start = int(start_text)
+            end = min(int(end_text) + 1, size) if end_text else size
+        else:
+            # Suffix range: the last N bytes
+            start = max(size - int(end_text), 0)
+            end = size
+    except ValueError:
+        raise HTTPException(status_code=416, detail="Invalid Range header")
+    
+    if start >= end:
+        raise HTTPException(status_code=416, detail="Range not satisfiable")
+    return start, end
+
+
 @router.delete("/{file_id}")
-def delete_file(
+async def delete_file(
     claim_id: int,
     file_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a file from a claim."""
     # Verify claim exists and user owns it
-    claim = claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
     if not claim:
         raise HTTPException(status_code=404, detail="Claim not found")
     
-    file = file_service.get_file_with_claim_check(db, file_id, claim_id)
+    file = await file_service.get_file_with_claim_check(db, file_id, claim_id)
     if not file:
         raise HTTPException(status_code=404, detail="File not found")
     
     try:
-        file_service.delete_file(db, file)
+        await file_service.delete_file(db, file)
         return {"status": "deleted", "file_id": file_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete file: {str(e)}")
@@ -0,0 +1,47 @@
+"""Metrics router."""
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db, get_pool_stats
+from app.embeddings import vector_index
+from app.schemas.metrics import (
+    DatabasePoolMetrics, EmbeddingIndexMetrics, LLMMetrics, StorageMetrics, SummaryCacheMetrics, TaskQueueMetrics
+)
+from app.services import agent_service, blob_service, llm_service, task_service
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/storage", response_model=StorageMetrics)
+async def storage_metrics(db: AsyncSession = Depends(get_db)):
+    """Report deduplication ratio and bytes saved by the blob store."""
+    return await blob_service.get_dedup_stats(db)
+
+
+@router.get("/llm", response_model=LLMMetrics)
+async def llm_metrics():
+    """Report queue wait, call latency and retries for the shared LLM client."""
+    return llm_service.get_llm_metrics()
+
+
+@router.get("/tasks", response_model=TaskQueueMetrics)
+async def task_queue_metrics(db: AsyncSession = Depends(get_db)):
+    """Report task queue depth and dead-lettered tasks, for scaling workers."""
+    return await task_service.get_queue_stats(db)
+
+
+@router.get("/summary-cache", response_model=SummaryCacheMetrics)
+async def summary_cache_metrics():
+    """Report summary cache hits and misses."""
+    return agent_service.get_summary_cache_stats()
+
+
+@router.get("/embeddings", response_model=EmbeddingIndexMetrics)
+async def embedding_index_metrics():
+    """Report the size and hit rate of the chunk embedding index."""
+    return vector_index.get_stats()
+
+
+@router.get("/database", response_model=DatabasePoolMetrics)
+async def database_pool_metrics():
+    """Report connection pool usage, to size DB_POOL_SIZE and DB_MAX_OVERFLOW."""
+    return {"engines": get_pool_stats()}
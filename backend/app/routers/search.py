@@ -0,0 +1,66 @@
+"""Search router."""
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.search import SearchResults
+from app.services import claim_service, search_service
+
+router = APIRouter(tags=["search"])
+
+
+async def _search(
+    db: AsyncSession,
+    user_id: int,
+    q: str,
+    claim_id: Optional[int],
+    types: Optional[List[str]],
+    all_versions: bool,
+    limit: int,
+    offset: int
+) -> SearchResults:
+    hits, has_more = await search_service.search(
+        db,
+        user_id,
+        q,
+        claim_id=claim_id,
+        doc_types=types or (search_service.DOC_TYPE_FILE, search_service.DOC_TYPE_ARTIFACT_VERSION),
+        all_versions=all_versions,
+        limit=limit,
+        offset=offset
+    )
+    return SearchResults(results=hits, limit=limit, offset=offset, has_more=has_more)
+
+
+@router.get("/search", response_model=SearchResults)
+async def search_all_claims(
+    q: str = Query(..., min_length=1, max_length=500),
+    types: Optional[List[Literal["file", "artifact_version"]]] = Query(None),
+    all_versions: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search file text and artifacts across all of the current user's claims."""
+    return await _search(db, current_user.id, q, None, types, all_versions, limit, offset)
+
+
+@router.get("/claims/{claim_id}/search", response_model=SearchResults)
+async def search_claim(
+    claim_id: int,
+    q: str = Query(..., min_length=1, max_length=500),
+    types: Optional[List[Literal["file", "artifact_version"]]] = Query(None),
+    all_versions: bool = False,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search file text and artifacts within one claim."""
+    claim = await claim_service.get_claim_with_owner_check(db, claim_id, current_user.id)
+    if not claim:
+        raise HTTPException(status_code=404, detail="Claim not found")
+    return await _search(db, current_user.id, q, claim_id, types, all_versions, limit, offset)
@@ -0,0 +1,134 @@
+"""Summary jobs router."""
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from app.core.database import get_db
+from app.core.dependencies import get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError, SortOrder
+from app.models.user import User
+from app.schemas.pagination import Page
+from app.schemas.summary_job import SummaryJob, SummaryJobCreate, SummaryJobItem
+from app.services import summary_job_service, task_service
+
+router = APIRouter(prefix="/summary-jobs", tags=["summary-jobs"])
+
+
+@router.post("", response_model=SummaryJob, status_code=202)
+async def create_summary_job(
+    job_data: SummaryJobCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Regenerate the summaries of many claims in the background, one task
+    queue task per claim.
+
+    Each changed summary is stored as a pending proposal (see the job's items
+    for their ids), to be accepted through the agent accept endpoint.
+    """
+    job = await summary_job_service.create_job(db, job_data, current_user.id)
+    if not job:
+        raise HTTPException(status_code=400, detail="No matching claims")
+    task_service.notify_workers()
+    return job
+
+
+@router.get("", response_model=Page[SummaryJob])
+async def list_summary_jobs(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "desc",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List the current user's summary jobs, one page at a time (newest first by default)."""
+    try:
+        jobs, next_cursor = await summary_job_service.get_jobs(db, current_user.id, cursor=cursor, limit=limit, order=order)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=jobs, next_cursor=next_cursor)
+
+
+@router.get("/{job_id}", response_model=SummaryJob)
+async def get_summary_job(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a summary job with its progress."""
+    job = await summary_job_service.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+    return job
+
+
+@router.get("/{job_id}/items", response_model=Page[SummaryJobItem])
+async def list_summary_job_items(
+    job_id: int,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "asc",
+    status: Optional[Literal["pending", "running", "proposed", "unchanged", "failed"]] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List the claims of a summary job with their outcome, one page at a time."""
+    job = await summary_job_service.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+
+    try:
+        items, next_cursor = await summary_job_service.get_job_items(
+            db, job_id, cursor=cursor, limit=limit, order=order, status=status
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=items, next_cursor=next_cursor)
+
+
+def _sse_event(event: str, data: str, event_id: Optional[int] = None) -> str:
+    """Format one Server-Sent Event frame."""
+    frame = f"event: {event}\ndata: {data}\n\n"
+    return f"id: {event_id}\n{frame}" if event_id is not None else frame
+
+
+@router.get("/{job_id}/events")
+async def summary_job_events(
+    job_id: int,
+    after: int = Query(0, ge=0),
+    last_event_id: Optional[int] = Header(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream a summary job's results as Server-Sent Events, as claims finish.
+
+    Emits an `item` event per finished claim, in completion order, with the
+    item's sequence number as the event id, and a `job` event with the
+    progress counters after each batch. The stream ends after the `job`
+    event of the completed job. Pass `after` (or reconnect with
+    Last-Event-ID) to skip items already received.
+    """
+    job = await summary_job_service.get_job(db, job_id, current_user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Summary job not found")
+    # The stream reads with its own short sessions; don't hold this connection for its lifetime
+    await db.close()
+
+    async def events():
+        async for kind, payload in summary_job_service.watch_job(job_id, max(after, last_event_id or 0)):
+            if kind == "item":
+                yield _sse_event("item", SummaryJobItem.model_validate(payload).model_dump_json(), payload.sequence)
+            else:
+                yield _sse_event("job", SummaryJob.model_validate(payload).model_dump_json())
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
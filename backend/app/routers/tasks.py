@@ -0,0 +1,113 @@
+"""Tasks router."""
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Literal, Optional
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, get_db
+from app.core.dependencies import get_current_user
+from app.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, InvalidCursorError, SortOrder
+from app.models.task import TASK_DONE, TASK_DEAD
+from app.models.user import User
+from app.schemas.pagination import Page
+from app.schemas.task import Task
+from app.services import task_service
+
+router = APIRouter(prefix="/tasks", tags=["tasks"])
+
+
+@router.get("", response_model=Page[Task])
+async def list_tasks(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    order: SortOrder = "desc",
+    status: Optional[Literal["queued", "running", "done", "dead"]] = None,
+    kind: Optional[str] = Query(None, max_length=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List the current user's background tasks, one page at a time (status=dead for the dead-letter queue)."""
+    try:
+        tasks, next_cursor = await task_service.get_tasks(
+            db, current_user.id, cursor=cursor, limit=limit, order=order, status=status, kind=kind
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Page(items=tasks, next_cursor=next_cursor)
+
+
+@router.get("/{task_id}", response_model=Task)
+async def get_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a background task's status, attempts and result."""
+    task = await task_service.get_task(db, task_id, current_user.id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
+@router.post("/{task_id}/retry", response_model=Task)
+async def retry_task(
+    task_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Queue a dead-lettered task again with a fresh set of attempts."""
+    task = await task_service.get_task(db, task_id, current_user.id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if not await task_service.retry_task(db, task):
+        raise HTTPException(status_code=409, detail="Only dead-lettered tasks can be retried")
+    task_service.notify_workers()
+    return task
+
+
+@router.get("/{task_id}/events")
+async def task_events(
+    task_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Stream a background task's status as Server-Sent Events.
+
+    Emits a `task` event with the task now and whenever its status or
+    attempt count changes (checked every TASK_POLL_INTERVAL_SECONDS), and
+    ends after the event for a done or dead task.
+    """
+    task = await task_service.get_task(db, task_id, current_user.id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    owner_user_id = current_user.id
+    # The stream reads with its own short sessions; don't hold this connection for its lifetime
+    await db.close()
+
+    async def events():
+        current = task
+        last_seen = None
+        while True:
+            seen = (current.status, current.attempts)
+            if seen != last_seen:
+                last_seen = seen
+                yield f"event: task\ndata: {Task.model_validate(current).model_dump_json()}\n\n"
+            if current.status in (TASK_DONE, TASK_DEAD):
+                return
+            await asyncio.sleep(settings.TASK_POLL_INTERVAL_SECONDS)
+            async with AsyncSessionLocal() as session:
+                current = await task_service.get_task(session, task_id, owner_user_id)
+            if current is None:
+                return
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # Stop reverse proxies (nginx) from buffering the stream
+            "X-Accel-Buffering": "no"
+        }
+    )
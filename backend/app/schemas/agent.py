@@ -1,6 +1,8 @@
 """Agent chat schemas."""
 from pydantic import BaseModel
+from datetime import datetime
 from typing import List, Literal, Optional
+from app.schemas.diff import DiffHunk, DiffStats
 
 
 class AgentChatRequest(BaseModel):
@@ -8,22 +10,70 @@ class AgentChatRequest(BaseModel):
     message: str
 
 
-class Proposal(BaseModel):
-    """A proposal for a file or artifact change."""
+class SourceFile(BaseModel):
+    """A file (at a specific content version) that a summary was built from."""
+    file_id: int
+    filename: str
+    content_hash: str
+
+
+class ContextFile(BaseModel):
+    """How one file was used in a prompt."""
+    file_id: int
+    filename: str
+    tokens: int  # After boilerplate removal
+    included_tokens: int
+    boilerplate_tokens: int  # Repeated headers/footers/paragraphs removed
+    status: Literal["full", "truncated", "dropped", "summarized"]  # summarized = via map-reduce
+    score: float  # Inclusion priority (relevance, recency, substance)
+
+
+class ContextReport(BaseModel):
+    """What went into the prompt for a generated proposal."""
+    strategy: Literal["full", "packed", "map_reduce"]
+    tokenizer: str
+    budget_tokens: int
+    used_tokens: int
+    files: List[ContextFile]
+    removed_files: List[str] = []  # Incremental updates: files dropped since the last summary
+
+
+class ProposalDraft(BaseModel):
+    """A change produced by the agent, before it is stored (see proposal_service)."""
     type: Literal["file", "artifact"]
     target_id: Optional[int] = None  # file_id or artifact_id (None if creating new artifact)
     target_name: str  # filename or artifact title
     old_content: str
     new_content: str
-    diff: str  # Unified diff string
+    source_files: Optional[List[SourceFile]] = None  # Files a proposed summary was built from
+    context_report: Optional[ContextReport] = None  # None if no model call was made
+
+
+class Proposal(BaseModel):
+    """A stored proposal for a file or artifact change. Accept it by id."""
+    id: int
+    type: Literal["file", "artifact"]
+    target_id: Optional[int] = None  # file_id or artifact_id (None if creating new artifact)
+    target_name: str  # filename or artifact title
+    base_hash: str  # SHA-256 of the content the change was made against
+    status: Literal["pending", "accepted"]
+    hunks: List[DiffHunk]  # Structured diff with word-level changes
+    diff_stats: DiffStats
+    source_files: Optional[List[SourceFile]] = None
+    context_report: Optional[ContextReport] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
 
 
 class AgentChatResponse(BaseModel):
     """Response schema for agent chat."""
     proposals: List[Proposal]
+    reply: Optional[str] = None  # Answer to a chat message that isn't a command
 
 
 class AgentAcceptRequest(BaseModel):
     """Request schema for accepting a proposal."""
-    proposal: Proposal
+    proposal_id: int
 
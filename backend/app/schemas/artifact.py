@@ -18,6 +18,18 @@ class ArtifactCreate(ArtifactBase):
     pass
 
 
+class ArtifactListItem(ArtifactBase):
+    """Slim artifact schema for list responses (no version content)."""
+    id: int
+    claim_id: int
+    current_version_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class Artifact(ArtifactBase):
     """Artifact response schema."""
     id: int
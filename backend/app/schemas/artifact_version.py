@@ -1,7 +1,8 @@
 """Artifact version schemas."""
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
+from app.schemas.diff import DiffHunk, DiffStats
 
 
 class ArtifactVersionBase(BaseModel):
@@ -19,9 +20,35 @@ class ArtifactVersion(ArtifactVersionBase):
     """Artifact version response schema."""
     id: int
     artifact_id: int
+    version_number: int
     created_at: datetime
     created_by_user_id: Optional[int] = None
 
     class Config:
         from_attributes = True
 
+
+class ArtifactVersionListItem(BaseModel):
+    """Version history entry (no content)."""
+    id: int
+    artifact_id: int
+    version_number: int
+    created_at: datetime
+    created_by_user_id: Optional[int] = None
+    version_metadata: Optional[dict] = None
+    size_bytes: Optional[int] = None
+    is_snapshot: bool  # Stored in full rather than as a delta
+
+    class Config:
+        from_attributes = True
+
+
+class ArtifactVersionDiff(BaseModel):
+    """Unified diff between two versions of an artifact."""
+    artifact_id: int
+    from_version_id: int
+    to_version_id: int
+    diff: str  # Unified diff string
+    hunks: List[DiffHunk]
+    stats: DiffStats
+
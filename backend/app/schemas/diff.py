@@ -0,0 +1,37 @@
+"""Diff schemas."""
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+
+class DiffSegment(BaseModel):
+    """Part of a changed line, for word-level highlighting."""
+    op: Literal["equal", "delete", "insert"]
+    text: str
+
+
+class DiffLine(BaseModel):
+    """One line of a hunk."""
+    op: Literal["context", "delete", "insert"]
+    old_number: Optional[int] = None
+    new_number: Optional[int] = None
+    text: str  # Without the line terminator
+    segments: Optional[List[DiffSegment]] = None  # Word-level changes, for paired changed lines
+
+
+class DiffHunk(BaseModel):
+    """A run of changes with surrounding context lines."""
+    old_start: int
+    old_lines: int
+    new_start: int
+    new_lines: int
+    lines: List[DiffLine]
+
+
+class DiffStats(BaseModel):
+    """Line counts for a diff."""
+    old_lines: int
+    new_lines: int
+    added: int
+    removed: int
+    hunks: int
+    too_large: bool = False  # Inputs over DIFF_MAX_INPUT_CHARS: counts only, approximate, no hunks
@@ -16,11 +16,28 @@ class FileCreate(FileBase):
     storage_path: str
 
 
+class FileListItem(BaseModel):
+    """Slim file schema for list responses."""
+    id: int
+    claim_id: int
+    filename: str
+    mime_type: Optional[str] = None
+    size_bytes: Optional[int] = None
+    extraction_status: str
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class File(FileBase):
     """File response schema."""
     id: int
     claim_id: int
     storage_path: str
+    content_hash: Optional[str] = None
+    extraction_status: str
+    extraction_task_id: Optional[int] = None  # Set on upload when text extraction was queued
     created_at: datetime
 
     class Config:
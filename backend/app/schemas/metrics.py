@@ -0,0 +1,80 @@
+"""Metrics schemas."""
+from pydantic import BaseModel
+from typing import Dict, Optional
+
+
+class StorageMetrics(BaseModel):
+    """Blob store deduplication metrics."""
+    file_count: int  # Files backed by a blob
+    blob_count: int  # Distinct stored contents
+    logical_bytes: int  # Bytes as uploaded, counting every duplicate
+    physical_bytes: int  # Bytes actually stored
+    bytes_saved: int
+    dedup_ratio: float  # logical_bytes / physical_bytes
+
+
+class TimingMetrics(BaseModel):
+    """Summary of a timing series (recent-window percentiles)."""
+    count: int
+    avg_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    max_seconds: float
+
+
+class LLMMetrics(BaseModel):
+    """Shared LLM client metrics."""
+    requests: int  # Attempts sent, including retries
+    failures: int  # Attempts that raised
+    retries: int
+    in_flight: int
+    waiting: int  # Calls queued for a concurrency slot or rate-limit budget
+    limiter: str  # "memory" (limits per process) or "redis" (shared by all processes)
+    max_concurrency: int  # Per process with the memory limiter, in total with redis
+    queue_wait: TimingMetrics  # Time from call to dispatch
+    latency: TimingMetrics  # Time from dispatch to completed response
+
+
+class TaskQueueMetrics(BaseModel):
+    """Task queue depth, across all worker processes."""
+    queued: int  # Waiting for a worker, including retries not yet due
+    running: int
+    dead: int  # Dead-lettered, awaiting inspection or retry
+    oldest_queued_seconds: float  # How long the oldest runnable task has waited
+    by_kind: Dict[str, Dict[str, int]]  # kind -> status -> count
+
+
+class SummaryCacheMetrics(BaseModel):
+    """Summary cache counters (per API process)."""
+    backend: str
+    hits: int
+    misses: int
+    stores: int
+    errors: int  # Backend failures, treated as misses
+    hit_rate: float
+    chunk_hits: int  # Map-reduce chunk and reduce-step summaries served from cache
+    chunk_misses: int
+
+
+class EmbeddingIndexMetrics(BaseModel):
+    """Chunk embedding index counters (hits/misses are per API process)."""
+    embedder: str
+    dimensions: int
+    vectors: int  # Distinct chunk texts embedded
+    bytes: int  # On-disk size of keys and vectors
+    hits: int  # Chunk lookups served from the index
+    misses: int  # Chunks that had to be embedded
+
+
+class DatabasePoolStats(BaseModel):
+    """One engine's connection pool (per API process)."""
+    pool: str  # Pool class; pools that don't keep connections (NullPool, under PgBouncer) report only this
+    size: Optional[int] = None  # Connections kept open
+    checked_out: Optional[int] = None  # In use by a session
+    idle: Optional[int] = None
+    max_connections: Optional[int] = None  # Size plus overflow; requests wait (up to DB_POOL_TIMEOUT_SECONDS) beyond it
+
+
+class DatabasePoolMetrics(BaseModel):
+    """Database connection pools of this API process."""
+    engines: Dict[str, DatabasePoolStats]  # "primary", and "replica" when DATABASE_REPLICA_URL is set
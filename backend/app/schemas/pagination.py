@@ -0,0 +1,11 @@
+"""Pagination schemas."""
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a keyset-paginated list."""
+    items: List[T]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to get the next page; None on the last page
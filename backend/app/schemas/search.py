@@ -0,0 +1,22 @@
+"""Search schemas."""
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+
+
+class SearchHit(BaseModel):
+    """A ranked full-text match in a file or artifact version."""
+    type: Literal["file", "artifact_version"]
+    id: int  # File id or artifact version id
+    claim_id: int
+    title: str  # Filename or artifact title
+    artifact_id: Optional[int] = None
+    rank: float
+    snippet: str  # Matching excerpt with <mark>...</mark> around matched terms
+
+
+class SearchResults(BaseModel):
+    """One page of search results."""
+    results: List[SearchHit]
+    limit: int
+    offset: int
+    has_more: bool
@@ -0,0 +1,51 @@
+"""Summary job schemas."""
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Literal, Optional
+
+
+class SummaryJobCreate(BaseModel):
+    """
+    Schema for starting a summary job.
+    
+    Selects the current user's claims matching every given filter; with no
+    filters, all of them.
+    """
+    claim_ids: Optional[List[int]] = Field(None, min_length=1)
+    reference_prefix: Optional[str] = Field(None, max_length=100)
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+
+class SummaryJob(BaseModel):
+    """Summary job response schema."""
+    id: int
+    status: Literal["pending", "running", "completed"]
+    claim_filter: Optional[dict] = None
+    total: int
+    processed: int
+    proposed: int
+    unchanged: int
+    failed: int
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+
+class SummaryJobItem(BaseModel):
+    """One claim of a summary job. proposal_id is set when a summary proposal was stored."""
+    id: int
+    claim_id: int
+    status: Literal["pending", "running", "proposed", "unchanged", "failed"]
+    attempts: int
+    proposal_id: Optional[int] = None
+    error: Optional[str] = None
+    sequence: Optional[int] = None  # Completion order within the job
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,24 @@
+"""Task schemas."""
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Literal, Optional
+
+
+class Task(BaseModel):
+    """Background task response schema. result is set once the task is done."""
+    id: int
+    kind: str
+    payload: dict
+    priority: int
+    status: Literal["queued", "running", "done", "dead"]
+    attempts: int
+    max_attempts: int
+    run_at: datetime  # Earliest next attempt, while queued
+    last_error: Optional[str] = None
+    result: Optional[dict] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
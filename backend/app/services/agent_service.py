@@ -1,247 +1,624 @@
 """Agent service - processes natural language commands."""
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from openai import OpenAI
+import hashlib
+import json
+import logging
+from typing import AsyncIterator, List, Optional, Tuple, Union
 from app.models.claim import Claim
-from app.models.file import File
+from app.models.file import File, EXTRACTION_PENDING
 from app.models.artifact import Artifact
-from app.services.file_service import read_file_content, get_files_by_claim
-from app.services.artifact_service import get_artifact_by_type, get_artifact_current_content
-from app.services.diff_service import compute_unified_diff
-from app.schemas.agent import Proposal
+from app.services import context_service, retrieval_service, summary_service, token_service
+from app.services.llm_service import get_llm_client
+from app.cache import cache
+from app.schemas.agent import ContextFile, ContextReport, ProposalDraft, SourceFile
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
 
-def generate_summary_proposal(db: Session, claim_id: int) -> List[Proposal]:
-    """
-    Generate a summary proposal from claim files.
-    This is the dedicated function for the Generate Summary button.
+SUMMARY_SYSTEM_PROMPT = """You are an expert at analyzing claim documents and creating comprehensive summaries.
+Your task is to create a clear, well-structured summary that captures:
+- Key facts and details from the documents
+- Important dates, amounts, parties, and other relevant information
+- The nature and context of the claim
+- Any notable patterns or important points
+
+Format your response as a markdown document with clear sections and headings.
+Be thorough but concise. Focus on actionable information."""
+ANSWER_SYSTEM_PROMPT = """You are an assistant answering questions about an insurance claim.
+Answer only from the document excerpts you are given, and say which documents the answer comes from.
+If the excerpts don't contain the answer, say so rather than guessing. Be concise."""
+# Bump when the user prompt wording in _build_summary_messages changes, so
+# cached summaries produced by the old prompt are not reused
+SUMMARY_PROMPT_VERSION = 3
+
+_summary_cache_stats = {"hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+
+def _load_file_contents(claim: Claim) -> dict:
     """
-    claim = db.query(Claim).filter(Claim.id == claim_id).first()
-    if not claim:
-        raise ValueError(f"Claim {claim_id} not found")
+    Collect extracted text for every file in a claim loaded by get_claim_context
+    with `with_file_text`.
     
-    # Load all claim files and their contents
-    files = get_files_by_claim(db, claim_id)
+    Text is extracted at upload time by extraction_service, so this never
+    parses files inline. Files still pending or that failed extraction are skipped.
+    """
     file_contents = {}
-    for file in files:
-        # Use stored extracted_text if available, otherwise try to read from storage
-        content = None
-        if file.extracted_text:
-            content = file.extracted_text
-        else:
-            try:
-                content = read_file_content(file)
-            except Exception as e:
-                # Skip files that can't be read
-                print(f"Warning: Could not read file {file.id}: {e}")
-                continue
+    for file in sorted(claim.files, key=lambda file: file.id):
+        if not file.extracted_text:
+            if file.extraction_status == EXTRACTION_PENDING:
+                logger.warning("Skipping file %d, text extraction still pending", file.id)
+            else:
+                logger.warning("Skipping file %d, no extracted text (%s)", file.id, file.extraction_status)
+            continue
         
-        if content:
-            file_contents[file.id] = {
-                'file': file,
-                'content': content
-            }
-    
-    # Check if summary already exists
-    existing_summary = get_artifact_by_type(db, claim_id, "summary")
-    old_content = ""
+        file_contents[file.id] = {
+            'file': file,
+            'content': file.extracted_text
+        }
+    return file_contents
+
+
+def _summary_artifact(claim: Claim) -> Optional[Artifact]:
+    """The claim's summary artifact (the oldest, if there are several), or None."""
+    summaries = [artifact for artifact in claim.artifacts if artifact.type == "summary"]
+    return min(summaries, key=lambda artifact: artifact.id) if summaries else None
+
+
+def _load_summary_inputs(claim: Claim) -> Tuple[dict, Optional[Artifact], str, Optional[dict]]:
+    """
+    Collect file contents, the existing summary artifact, its current content and
+    the files that content was built from, from a claim loaded by get_claim_context.
     
-    if existing_summary:
-        old_content = get_artifact_current_content(db, existing_summary.id) or ""
+    The last item maps file id to {"filename", "content_hash"} as recorded in the
+    current version's metadata; it is None when there is no summary or the
+    current version doesn't record its sources (e.g. it predates tracking).
+    """
+    file_contents = _load_file_contents(claim)
+    existing_summary = _summary_artifact(claim)
+    old_content = ""
+    base_files = None
     
-    # Generate summary from file contents
-    new_content = generate_summary_from_files(file_contents, old_content if old_content else None)
+    if existing_summary and existing_summary.current_version:
+        old_content = existing_summary.current_version.content or ""
+        base_files = _base_files_from_metadata(existing_summary.current_version.version_metadata)
     
-    # Compute diff
-    diff = compute_unified_diff(old_content, new_content, "current_summary", "proposed_summary")
+    return file_contents, existing_summary, old_content, base_files
+
+
+def _file_content_hash(file_data: dict) -> str:
+    """Content hash of a loaded file, hashing its text if it predates content hashes."""
+    return file_data['file'].content_hash or hashlib.sha256(file_data['content'].encode('utf-8')).hexdigest()
+
+
+def _source_files(file_contents: dict) -> List[SourceFile]:
+    """The files (and exact contents) a summary is being built from."""
+    return [
+        SourceFile(
+            file_id=file_id,
+            filename=file_contents[file_id]['file'].filename,
+            content_hash=_file_content_hash(file_contents[file_id])
+        )
+        for file_id in sorted(file_contents)
+    ]
+
+
+def _base_files_from_metadata(version_metadata: Optional[dict]) -> Optional[dict]:
+    """Read the source files recorded on a summary version, keyed by file id."""
+    if not version_metadata or "source_files" not in version_metadata:
+        return None
+    return {
+        entry["file_id"]: {"filename": entry["filename"], "content_hash": entry["content_hash"]}
+        for entry in version_metadata["source_files"]
+    }
+
+
+def _summary_delta(file_contents: dict, base_files: dict) -> dict:
+    """
+    Compare current files against the ones a summary was built from.
     
-    return [Proposal(
+    Returns {"added": [file_id], "changed": [file_id], "removed": [filename]}.
+    """
+    added = []
+    changed = []
+    for file_id in sorted(file_contents):
+        base = base_files.get(file_id)
+        if base is None:
+            added.append(file_id)
+        elif base["content_hash"] != _file_content_hash(file_contents[file_id]):
+            changed.append(file_id)
+    removed = [base_files[file_id]["filename"] for file_id in sorted(base_files) if file_id not in file_contents]
+    return {"added": added, "changed": changed, "removed": removed}
+
+
+def _summary_proposal(
+    existing_summary: Optional[Artifact],
+    old_content: str,
+    new_content: str,
+    file_contents: dict,
+    context_report: Optional[ContextReport] = None
+) -> ProposalDraft:
+    """Build the proposal for replacing the current summary."""
+    return ProposalDraft(
         type="artifact",
         target_id=existing_summary.id if existing_summary else None,
         target_name="summary",
         old_content=old_content,
         new_content=new_content,
-        diff=diff
-    )]
+        source_files=_source_files(file_contents),
+        context_report=context_report
+    )
+
 
+async def generate_summary_proposal(claim: Claim) -> List[ProposalDraft]:
+    """
+    Generate a summary proposal from claim files.
+    This is the dedicated function for the Generate Summary button.
+    """
+    file_contents, existing_summary, old_content, base_files = _load_summary_inputs(claim)
+    
+    # Generate summary from file contents (only the changes, if the sources of the old one are known)
+    new_content, context_report = await generate_summary_from_files(
+        file_contents, old_content if old_content else None, base_files
+    )
+    
+    return [_summary_proposal(existing_summary, old_content, new_content, file_contents, context_report)]
+
+
+async def stream_summary_proposal(claim: Claim) -> AsyncIterator[Tuple[str, Union[str, ProposalDraft]]]:
+    """
+    Streaming variant of generate_summary_proposal.
+    
+    Yields ("token", text) events as the summary is generated, then a single
+    ("proposal", ProposalDraft) event carrying the complete content.
+    """
+    file_contents, existing_summary, old_content, base_files = _load_summary_inputs(claim)
+    
+    parts = []
+    context_report = None
+    async for kind, payload in stream_summary_from_files(file_contents, old_content if old_content else None, base_files):
+        if kind == "context":
+            context_report = payload
+            continue
+        parts.append(payload)
+        yield "token", payload
+    
+    new_content = ''.join(parts).strip()
+    yield "proposal", _summary_proposal(existing_summary, old_content, new_content, file_contents, context_report)
 
-def process_command(db: Session, claim_id: int, user_message: str) -> List[Proposal]:
+
+async def process_command(claim: Claim, user_message: str) -> Tuple[List[ProposalDraft], Optional[str]]:
     """
-    Process a natural language command and return proposals.
+    Process a natural language command and return proposals, plus a reply
+    for messages that are questions rather than commands.
     
     This is a mock implementation that uses simple keyword matching.
     TODO: Replace with LLM-based command parsing and execution.
-    """
-    claim = db.query(Claim).filter(Claim.id == claim_id).first()
-    if not claim:
-        raise ValueError(f"Claim {claim_id} not found")
     
+    Returns:
+        Tuple of (proposals, reply or None)
+    """
     message_lower = user_message.lower()
     proposals = []
     
-    # Load all claim files and their contents
-    files = get_files_by_claim(db, claim_id)
-    file_contents = {}
-    for file in files:
-        # Use stored extracted_text if available, otherwise try to read from storage
-        content = None
-        if file.extracted_text:
-            content = file.extracted_text
-        else:
-            try:
-                content = read_file_content(file)
-            except Exception as e:
-                # Skip files that can't be read
-                print(f"Warning: Could not read file {file.id}: {e}")
-                continue
-        
-        if content:
-            file_contents[file.id] = {
-                'file': file,
-                'content': content
-            }
-    
     # Mock command: "create summary" or "create a summary"
     if 'create' in message_lower and 'summary' in message_lower:
-        # Check if summary already exists
-        existing_summary = get_artifact_by_type(db, claim_id, "summary")
-        old_content = ""
-        
-        if existing_summary:
-            old_content = get_artifact_current_content(db, existing_summary.id) or ""
-        
-        # Generate summary from file contents
-        new_content = generate_summary_from_files(file_contents, old_content if old_content else None)
-        
-        # Compute diff
-        diff = compute_unified_diff(old_content, new_content, "current_summary", "proposed_summary")
-        
-        proposals.append(Proposal(
-            type="artifact",
-            target_id=existing_summary.id if existing_summary else None,
-            target_name="summary",
-            old_content=old_content,
-            new_content=new_content,
-            diff=diff
-        ))
+        return await generate_summary_proposal(claim), None
+    
+    # Collect all claim files and their extracted contents
+    file_contents = _load_file_contents(claim)
     
     # Mock command: "update file" or "modify file"
-    elif ('update' in message_lower or 'modify' in message_lower) and 'file' in message_lower:
-        # For MVP, update the first text file found
-        # TODO: Parse which file to update from the message
+    if ('update' in message_lower or 'modify' in message_lower) and 'file' in message_lower:
+        # For MVP, update the text file most relevant to the message
         # Note: PDFs can be read for summaries, but only text files can be updated
         # (we can't write text back to PDFs or other binary files)
-        for file_id, file_data in file_contents.items():
+        text_files = {
+            file_id: file_data for file_id, file_data in file_contents.items()
+            if file_data['file'].mime_type and file_data['file'].mime_type.startswith('text/')
+        }
+        ranked = await retrieval_service.retrieve(text_files, user_message, k=1)
+        if ranked:
+            file_data = text_files[ranked[0]['file_id']]
             file = file_data['file']
-            # Only text files can be updated (PDFs and images are read-only for updates)
-            if file.mime_type and file.mime_type.startswith('text/'):
-                old_content = file_data['content']
-                # Mock: add a note at the end
-                new_content = old_content + "\n\n[Agent Note: File updated based on claim analysis]"
-                
-                diff = compute_unified_diff(old_content, new_content, file.filename, file.filename)
-                
-                proposals.append(Proposal(
-                    type="file",
-                    target_id=file.id,
-                    target_name=file.filename,
-                    old_content=old_content,
-                    new_content=new_content,
-                    diff=diff
-                ))
-                break  # Only update first file for MVP
-    
-    # Default: if no specific command matched, try to create summary
-    elif not proposals:
-        existing_summary = get_artifact_by_type(db, claim_id, "summary")
-        old_content = get_artifact_current_content(db, existing_summary.id) if existing_summary else ""
-        new_content = generate_summary_from_files(file_contents)
-        diff = compute_unified_diff(old_content, new_content, "current_summary", "proposed_summary")
-        
-        proposals.append(Proposal(
-            type="artifact",
-            target_id=existing_summary.id if existing_summary else None,
-            target_name="summary",
-            old_content=old_content,
-            new_content=new_content,
-            diff=diff
-        ))
+            old_content = file_data['content']
+            # Mock: add a note at the end
+            new_content = old_content + "\n\n[Agent Note: File updated based on claim analysis]"
+            
+            proposals.append(ProposalDraft(
+                type="file",
+                target_id=file.id,
+                target_name=file.filename,
+                old_content=old_content,
+                new_content=new_content
+            ))
+        return proposals, None
+    
+    # Default: if no specific command matched, answer the message from the parts
+    # of the documents relevant to it. Excerpts aren't enough to rewrite the
+    # claim summary from, so no summary proposal is made here.
+    return proposals, await answer_question(file_contents, user_message)
+
+
+async def answer_question(file_contents: dict, question: str) -> str:
+    """
+    Answer a question about a claim from its `RETRIEVAL_TOP_K` most relevant chunks.
     
-    return proposals
+    Falls back to listing those excerpts if OpenAI is not available or fails.
+    """
+    chunks = await retrieval_service.retrieve(file_contents, question)
+    excerpts = retrieval_service.excerpt_contents(file_contents, chunks)
+    if not excerpts:
+        return "No files available to answer from."
+    
+    if settings.OPENAI_API_KEY:
+        documents_text = "\n\n".join(
+            context_service.section_header(data['file'].filename) + data['content'] for data in excerpts.values()
+        )
+        messages = [
+            {"role": "system", "content": ANSWER_SYSTEM_PROMPT},
+            {"role": "user", "content": f"Document excerpts:\n{documents_text}\n\nQuestion: {question}"}
+        ]
+        try:
+            return (await get_llm_client().chat(messages, temperature=0.2, max_tokens=800)).strip()
+        except Exception as e:
+            logger.exception("OpenAI API error, falling back to excerpts: %s: %s", type(e).__name__, e)
+    else:
+        logger.info("OpenAI API key not configured, replying with excerpts")
+    
+    parts = ["The most relevant passages in this claim's documents:\n\n"]
+    for data in excerpts.values():
+        parts.append(f"## {data['file'].filename}\n\n{data['content']}\n\n")
+    return ''.join(parts).strip()
 
 
-def generate_summary_from_files(file_contents: dict, existing_summary: Optional[str] = None) -> str:
+async def generate_summary_from_files(
+    file_contents: dict,
+    existing_summary: Optional[str] = None,
+    base_files: Optional[dict] = None
+) -> Tuple[str, Optional[ContextReport]]:
     """
     Generate a summary from file contents using OpenAI.
     Falls back to simple preview if OpenAI is not available or fails.
+    
+    When `base_files` records which files `existing_summary` was built from,
+    only the added, changed and removed files are sent, and an unchanged
+    claim returns `existing_summary` without calling the model.
+    
+    Returns:
+        Tuple of (summary, report of what went into the prompt or None if no model call was made)
     """
     if not file_contents:
-        return "No files available to generate summary from."
+        return "No files available to generate summary from.", None
+    
+    if existing_summary and base_files is not None and not _has_changes(_summary_delta(file_contents, base_files)):
+        logger.info("No file changes since the current summary, keeping it")
+        return existing_summary, None
     
     # Try OpenAI if API key is configured
     if settings.OPENAI_API_KEY:
+        cache_key = _summary_cache_key(file_contents, existing_summary, base_files)
+        cached = await _get_cached_summary(cache_key)
+        if cached is not None:
+            return cached
         try:
-            print(f"Using OpenAI API to generate summary (key present: {bool(settings.OPENAI_API_KEY)})")
-            result = _generate_summary_with_openai(file_contents, existing_summary)
-            print(f"OpenAI summary generated successfully, length: {len(result)}")
-            return result
+            logger.debug("Using OpenAI API to generate summary")
+            messages, context_report = await _prepare_summary_messages(file_contents, existing_summary, base_files)
+            result = await _generate_summary_with_openai(messages)
+            logger.debug("OpenAI summary generated, length: %d", len(result))
+            await _store_cached_summary(cache_key, result, context_report)
+            return result, context_report
         except Exception as e:
-            print(f"OpenAI API error: {type(e).__name__}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("OpenAI API error, falling back to a simple summary: %s: %s", type(e).__name__, e)
             # Fall through to simple summary
     else:
-        print("OpenAI API key not configured, using simple summary")
+        logger.info("OpenAI API key not configured, using simple summary")
     
     # Fallback: simple preview-based summary
-    return _generate_simple_summary(file_contents)
+    return _generate_simple_summary(file_contents), None
 
 
-def _generate_summary_with_openai(file_contents: dict, existing_summary: Optional[str] = None) -> str:
-    """Generate summary using OpenAI API."""
-    print(f"Initializing OpenAI client...")
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+async def stream_summary_from_files(
+    file_contents: dict,
+    existing_summary: Optional[str] = None,
+    base_files: Optional[dict] = None
+) -> AsyncIterator[Tuple[str, Union[str, ContextReport]]]:
+    """
+    Generate a summary like generate_summary_from_files, yielding ("token", text)
+    as it arrives. A ("context", ContextReport) event comes first whenever the
+    model is used.
     
-    # Build context from all files
-    file_sections = []
-    total_chars = 0
-    max_chars = 100000  # Rough limit to stay within token budget
+    Falls back to the simple preview summary (as a single chunk) if OpenAI is not
+    configured or fails before producing any output.
+    """
+    if not file_contents:
+        yield "token", "No files available to generate summary from."
+        return
     
-    print(f"Processing {len(file_contents)} files for summary generation...")
-    for file_id, file_data in file_contents.items():
-        file = file_data['file']
-        content = file_data['content']
-        
-        # Truncate if needed, but try to include full content
-        if total_chars + len(content) > max_chars:
-            remaining = max_chars - total_chars
-            if remaining > 1000:  # Only include if we have meaningful space
-                content = content[:remaining] + "\n\n[Content truncated due to length...]"
-            else:
-                break
-        
-        file_sections.append(f"=== File: {file.filename} ===\n{content}\n")
-        total_chars += len(content)
+    if existing_summary and base_files is not None and not _has_changes(_summary_delta(file_contents, base_files)):
+        logger.info("No file changes since the current summary, keeping it")
+        yield "token", existing_summary
+        return
     
-    files_text = "\n\n".join(file_sections)
-    print(f"Total content length: {len(files_text)} characters")
+    if settings.OPENAI_API_KEY:
+        cache_key = _summary_cache_key(file_contents, existing_summary, base_files)
+        cached = await _get_cached_summary(cache_key)
+        if cached is not None:
+            summary, context_report = cached
+            if context_report is not None:
+                yield "context", context_report
+            yield "token", summary
+            return
+        started = False
+        try:
+            logger.debug("Using OpenAI API to stream summary")
+            messages, context_report = await _prepare_summary_messages(file_contents, existing_summary, base_files)
+            yield "context", context_report
+            parts = []
+            async for token in _stream_summary_with_openai(messages):
+                started = True
+                parts.append(token)
+                yield "token", token
+            await _store_cached_summary(cache_key, ''.join(parts).strip(), context_report)
+            return
+        except Exception as e:
+            logger.warning("OpenAI API error: %s: %s", type(e).__name__, e)
+            if started:
+                # Part of the summary was already sent; a fallback would garble it
+                raise
+    else:
+        logger.info("OpenAI API key not configured, using simple summary")
     
-    # Build prompt
-    system_prompt = """You are an expert at analyzing claim documents and creating comprehensive summaries.
-Your task is to create a clear, well-structured summary that captures:
-- Key facts and details from the documents
-- Important dates, amounts, parties, and other relevant information
-- The nature and context of the claim
-- Any notable patterns or important points
+    yield "token", _generate_simple_summary(file_contents)
 
-Format your response as a markdown document with clear sections and headings.
-Be thorough but concise. Focus on actionable information."""
+
+async def _stream_summary_with_openai(messages: List[dict]) -> AsyncIterator[str]:
+    """Stream summary tokens from the OpenAI API."""
+    stream = get_llm_client().chat_stream(
+        messages,
+        temperature=0.3,
+        max_tokens=2000
+    )
+    
+    leading = True
+    async for token in stream:
+        if leading:
+            # Match the non-streaming output: no leading whitespace, always a heading
+            token = token.lstrip()
+            if not token:
+                continue
+            if not token.startswith("#"):
+                yield "# Claim Summary\n\n"
+            leading = False
+        yield token
+
+
+def _summary_cache_key(file_contents: dict, existing_summary: Optional[str], base_files: Optional[dict] = None) -> str:
+    """
+    Cache key for a summary request.
+    
+    Covers everything that shapes the prompt: model, prompt template, which
+    files are included (by id and content hash, in order), the summary
+    being updated and the files it was built from. Any change to these
+    produces a different key, so cached entries never need explicit invalidation.
+    """
+    files = [[file_id, _file_content_hash(file_contents[file_id])] for file_id in sorted(file_contents)]
+    base = None
+    if existing_summary and base_files is not None:
+        base = [[file_id, base_files[file_id]["content_hash"]] for file_id in sorted(base_files)]
+    
+    fingerprint = json.dumps({
+        "model": settings.OPENAI_MODEL,
+        "prompt": [SUMMARY_PROMPT_VERSION, SUMMARY_SYSTEM_PROMPT],
+        "context": [
+            settings.SUMMARY_MAX_INPUT_TOKENS,
+            settings.SUMMARY_MAP_REDUCE_ENABLED,
+            settings.CONTEXT_BOILERPLATE_MIN_CHARS,
+            settings.CONTEXT_BOILERPLATE_MIN_REPEATS,
+        ],
+        "files": files,
+        "existing_summary": existing_summary or "",
+        "base_files": base,
+    }, separators=(",", ":"))
+    return "summary:" + hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+
+async def _get_cached_summary(cache_key: str) -> Optional[Tuple[str, Optional[ContextReport]]]:
+    """Look up a cached summary and its context report. Cache failures count as a miss."""
+    try:
+        cached = await cache.get(cache_key)
+    except Exception as e:
+        _summary_cache_stats["errors"] += 1
+        logger.warning("Summary cache lookup failed: %s: %s", type(e).__name__, e)
+        cached = None
+    
+    if cached is None:
+        _summary_cache_stats["misses"] += 1
+        return None
+    _summary_cache_stats["hits"] += 1
+    logger.debug("Summary cache hit")
+    entry = json.loads(cached)
+    context_report = entry.get("context_report")
+    return entry["summary"], ContextReport(**context_report) if context_report else None
+
+
+async def _store_cached_summary(cache_key: str, summary: str, context_report: Optional[ContextReport]) -> None:
+    """Store a generated summary; failures are logged, never raised."""
+    entry = json.dumps({
+        "summary": summary,
+        "context_report": context_report.model_dump() if context_report else None,
+    })
+    try:
+        await cache.set(cache_key, entry, ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS or None)
+        _summary_cache_stats["stores"] += 1
+    except Exception as e:
+        _summary_cache_stats["errors"] += 1
+        logger.warning("Summary cache store failed: %s: %s", type(e).__name__, e)
+
+
+def get_summary_cache_stats() -> dict:
+    """Hit/miss counters for the summary cache (this process only)."""
+    lookups = _summary_cache_stats["hits"] + _summary_cache_stats["misses"]
+    chunk_stats = summary_service.get_chunk_cache_stats()
+    return {
+        "backend": settings.CACHE_BACKEND,
+        **_summary_cache_stats,
+        "hit_rate": _summary_cache_stats["hits"] / lookups if lookups else 0.0,
+        "chunk_hits": chunk_stats["hits"],
+        "chunk_misses": chunk_stats["misses"],
+    }
+
+
+def _has_changes(delta: dict) -> bool:
+    return bool(delta["added"] or delta["changed"] or delta["removed"])
+
+
+async def _prepare_summary_messages(
+    file_contents: dict,
+    existing_summary: Optional[str] = None,
+    base_files: Optional[dict] = None
+) -> Tuple[List[dict], ContextReport]:
+    """
+    Build the messages for the final summary call, and report what went in.
+    
+    If the files behind `existing_summary` are known, only the added and
+    changed files are sent (an incremental update). Repeated boilerplate is
+    removed first, then the documents are measured in real tokens against
+    what SUMMARY_MAX_INPUT_TOKENS leaves after the prompt itself. Documents
+    that fit are sent whole; larger inputs are condensed by map-reduce (or,
+    with SUMMARY_MAP_REDUCE_ENABLED off, packed by rank with truncation).
+    """
+    delta = None
+    if existing_summary and base_files is not None:
+        delta = _summary_delta(file_contents, base_files)
+        file_contents = {file_id: file_contents[file_id] for file_id in delta["added"] + delta["changed"]}
+        logger.info(
+            "Incremental summary update: %d added, %d changed, %d removed",
+            len(delta["added"]), len(delta["changed"]), len(delta["removed"])
+        )
+    
+    def build(documents_text: str) -> List[dict]:
+        if delta is not None:
+            return _build_incremental_summary_messages(documents_text, existing_summary, delta, base_files, file_contents)
+        return _build_summary_messages(documents_text, existing_summary, condensed=condensed)
+    
+    condensed = False
+    scaffold_tokens = sum(token_service.count_tokens(message["content"]) for message in build(""))
+    budget = max(settings.SUMMARY_MAX_INPUT_TOKENS - scaffold_tokens, settings.CONTEXT_MIN_SECTION_TOKENS)
+    
+    cleaned, removed_tokens = context_service.remove_boilerplate(file_contents)
+    document_tokens = {
+        file_id: token_service.count_tokens(context_service.section_header(data['file'].filename) + data['content'])
+        for file_id, data in cleaned.items()
+    }
+    
+    if sum(document_tokens.values()) > budget and settings.SUMMARY_MAP_REDUCE_ENABLED:
+        condensed = True
+        partials = await summary_service.summarize_to_budget(cleaned, budget)
+        documents_text = "\n\n".join(partials)
+        context_report = ContextReport(
+            strategy="map_reduce",
+            tokenizer=token_service.tokenizer_name(),
+            budget_tokens=budget,
+            used_tokens=token_service.count_tokens(documents_text),
+            files=[
+                ContextFile(
+                    file_id=file_id,
+                    filename=cleaned[file_id]['file'].filename,
+                    tokens=token_service.count_tokens(cleaned[file_id]['content']),
+                    included_tokens=token_service.count_tokens(cleaned[file_id]['content']),
+                    boilerplate_tokens=removed_tokens[file_id],
+                    status="summarized",
+                    score=0.0
+                )
+                for file_id in sorted(cleaned)
+            ]
+        )
+    else:
+        sections, context_report = context_service.pack_context(cleaned, budget, removed_tokens=removed_tokens)
+        documents_text = "\n\n".join(sections)
+    
+    if delta is not None:
+        context_report.removed_files = delta["removed"]
+    dropped = [f.filename for f in context_report.files if f.status in ("truncated", "dropped")]
+    logger.info(
+        "Summary context: %s, %d/%d tokens, %d files%s",
+        context_report.strategy, context_report.used_tokens, budget, len(context_report.files),
+        f", truncated/dropped: {', '.join(dropped)}" if dropped else "",
+        extra={
+            "context_strategy": context_report.strategy,
+            "context_tokens": context_report.used_tokens,
+            "context_budget": budget,
+            "context_files": len(context_report.files),
+        }
+    )
+    return build(documents_text), context_report
+
+
+def _build_incremental_summary_messages(
+    documents_text: str,
+    existing_summary: str,
+    delta: dict,
+    base_files: dict,
+    changed_contents: dict
+) -> List[dict]:
+    """
+    Build the chat messages for updating a summary with only what changed.
     
-    user_prompt = f"""Please analyze the following claim documents and create a comprehensive summary.
+    `documents_text` holds just the added and changed files (`changed_contents`).
+    """
+    def filenames(file_ids: List[int]) -> str:
+        return ", ".join(changed_contents[file_id]['file'].filename for file_id in file_ids) or "none"
+    
+    base_names = ", ".join(base_files[file_id]["filename"] for file_id in sorted(base_files)) or "none"
+    
+    user_prompt = f"""The current summary of this claim was written from these documents: {base_names}.
+
+Current summary:
+{existing_summary}
+
+Since then the claim's documents changed:
+- Added: {filenames(delta["added"])}
+- Changed (new version below): {filenames(delta["changed"])}
+- Removed: {", ".join(delta["removed"]) or "none"}
+"""
+    if documents_text:
+        user_prompt += f"""
+New and changed documents:
+{documents_text}
+"""
+    user_prompt += """
+Please update the summary: add relevant information from new documents, revise anything that came
+from changed documents, and remove information that only came from removed documents. Keep the rest
+of the summary as it is. Respond with the complete updated summary."""
+    
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _build_summary_messages(
+    documents_text: str,
+    existing_summary: Optional[str] = None,
+    condensed: bool = False
+) -> List[dict]:
+    """
+    Build the chat messages for a summary request.
+    
+    `condensed` means `documents_text` holds map-reduce notes rather than the full file text.
+    """
+    if condensed:
+        intro = (
+            "Please create a comprehensive summary of the following claim documents. "
+            "They were too long to include in full, so notes taken from each part of "
+            "each document are given instead, in document order."
+        )
+    else:
+        intro = "Please analyze the following claim documents and create a comprehensive summary."
+    
+    user_prompt = f"""{intro}
 
 Documents:
-{files_text}
+{documents_text}
 
 """
     
@@ -253,22 +630,25 @@ Please create an updated summary that incorporates any new information from the
     else:
         user_prompt += "Please create a new summary based on the documents above."
     
-    print(f"Calling OpenAI API with model gpt-4o-mini...")
-    # Call OpenAI API
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+async def _generate_summary_with_openai(messages: List[dict]) -> str:
+    """Generate summary using OpenAI API."""
+    logger.debug("Calling OpenAI API with model %s", settings.OPENAI_MODEL)
+    # Call OpenAI API through the shared client (pooled, rate-limited, retried)
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # Using cost-effective model
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
+        summary = await get_llm_client().chat(
+            messages,
             temperature=0.3,  # Lower temperature for more consistent, factual summaries
             max_tokens=2000  # Reasonable limit for summaries
         )
         
-        print(f"OpenAI API response received")
-        summary = response.choices[0].message.content.strip()
-        print(f"Summary length: {len(summary)} characters")
+        summary = summary.strip()
+        logger.debug("OpenAI API response received, summary length: %d characters", len(summary))
         
         # Ensure it starts with a heading
         if not summary.startswith("#"):
@@ -276,7 +656,7 @@ Please create an updated summary that incorporates any new information from the
         
         return summary
     except Exception as e:
-        print(f"Error in OpenAI API call: {type(e).__name__}: {e}")
+        logger.warning("Error in OpenAI API call: %s: %s", type(e).__name__, e)
         raise
 
 
@@ -1,80 +1,266 @@
 """Artifact service."""
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import hashlib
+from sqlalchemy import inspect, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.core.config import settings
+from app.core.pagination import DEFAULT_PAGE_SIZE, SortOrder, paginate
 from app.models.artifact import Artifact
 from app.models.artifact_version import ArtifactVersion
 from app.schemas.artifact import ArtifactCreate
+from app.services import delta_service
 
+# A delta is kept only if it is at most this fraction of the full content
+DELTA_MAX_SIZE_RATIO = 0.5
 
-def create_artifact(db: Session, artifact_data: ArtifactCreate, claim_id: int) -> Artifact:
-    """Create a new artifact."""
+
+class VersionConflictError(Exception):
+    """Another version of the artifact was created concurrently."""
+
+
+def _content_fields(content: str) -> dict:
+    encoded = content.encode("utf-8")
+    return {
+        "content": content,
+        "content_hash": hashlib.sha256(encoded).hexdigest(),
+        "size_bytes": len(encoded),
+    }
+
+
+async def create_artifact(
+    db: AsyncSession,
+    artifact_data: ArtifactCreate,
+    claim_id: int,
+    content: Optional[str] = None,
+    created_by_user_id: Optional[int] = None,
+    version_metadata: Optional[dict] = None
+) -> Artifact:
+    """Create a new artifact, with a first version holding `content` if given, in one transaction."""
     artifact = Artifact(
         claim_id=claim_id,
         type=artifact_data.type,
         title=artifact_data.title
     )
     db.add(artifact)
-    db.commit()
-    db.refresh(artifact)
+    if content is not None:
+        version = ArtifactVersion(
+            artifact=artifact,
+            version_number=1,
+            created_by_user_id=created_by_user_id,
+            version_metadata=version_metadata,
+            **_content_fields(content)
+        )
+        db.add(version)
+        artifact.current_version = version
+    await db.commit()
     return artifact
 
 
-def get_artifact(db: Session, artifact_id: int) -> Optional[Artifact]:
-    """Get an artifact by ID."""
-    from sqlalchemy.orm import joinedload
-    return db.query(Artifact).options(
-        joinedload(Artifact.current_version)
-    ).filter(Artifact.id == artifact_id).first()
+async def get_artifact(db: AsyncSession, artifact_id: int) -> Optional[Artifact]:
+    """Get an artifact by ID, with its current version's content."""
+    result = await db.execute(
+        select(Artifact)
+        .options(selectinload(Artifact.current_version).undefer(ArtifactVersion.content))
+        .where(Artifact.id == artifact_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_artifacts_by_claim(
+    db: AsyncSession,
+    claim_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "desc",
+    artifact_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+) -> Tuple[List[Artifact], Optional[str]]:
+    """
+    Get one page of a claim's artifacts, without their versions (use get_artifact for content).
+    
+    Filters: artifact type, and created_at in [created_after, created_before).
+    
+    Returns:
+        Tuple of (artifacts, next_cursor)
+    """
+    stmt = select(Artifact).where(Artifact.claim_id == claim_id)
+    if artifact_type:
+        stmt = stmt.where(Artifact.type == artifact_type)
+    if created_after:
+        stmt = stmt.where(Artifact.created_at >= created_after)
+    if created_before:
+        stmt = stmt.where(Artifact.created_at < created_before)
+    return await paginate(db, stmt, Artifact, cursor, limit, order)
+
+
+async def get_artifact_with_claim_check(db: AsyncSession, artifact_id: int, claim_id: int) -> Optional[Artifact]:
+    """Get an artifact by ID (without its versions) and verify it belongs to the claim."""
+    result = await db.execute(
+        select(Artifact).where(Artifact.id == artifact_id, Artifact.claim_id == claim_id)
+    )
+    return result.scalar_one_or_none()
 
 
-def get_artifacts_by_claim(db: Session, claim_id: int) -> List[Artifact]:
-    """Get all artifacts for a claim."""
-    from sqlalchemy.orm import joinedload
-    return db.query(Artifact).options(
-        joinedload(Artifact.current_version)
-    ).filter(Artifact.claim_id == claim_id).all()
+async def get_artifact_for_update(db: AsyncSession, artifact_id: int, claim_id: int) -> Optional[Artifact]:
+    """
+    Get an artifact of the claim with its current version's content, in one query.
+    
+    For create_artifact_version, which needs the current content to
+    delta-encode it. The artifact row is locked until the transaction ends, so
+    concurrent new versions of one artifact queue up instead of racing for the
+    next version number.
+    """
+    result = await db.execute(
+        select(Artifact)
+        .options(joinedload(Artifact.current_version).undefer(ArtifactVersion.content))
+        .where(Artifact.id == artifact_id, Artifact.claim_id == claim_id)
+        .with_for_update(of=Artifact)
+    )
+    return result.scalar_one_or_none()
 
 
-def get_artifact_by_type(db: Session, claim_id: int, artifact_type: str) -> Optional[Artifact]:
+async def get_artifact_by_type(db: AsyncSession, claim_id: int, artifact_type: str) -> Optional[Artifact]:
     """Get an artifact by claim ID and type."""
-    return db.query(Artifact).filter(
-        Artifact.claim_id == claim_id,
-        Artifact.type == artifact_type
-    ).first()
+    result = await db.execute(
+        select(Artifact).where(
+            Artifact.claim_id == claim_id,
+            Artifact.type == artifact_type
+        )
+    )
+    return result.scalars().first()
 
 
-def create_artifact_version(
-    db: Session,
-    artifact_id: int,
+async def create_artifact_version(
+    db: AsyncSession,
+    artifact: Artifact,
     content: str,
     created_by_user_id: Optional[int] = None,
     version_metadata: Optional[dict] = None
 ) -> ArtifactVersion:
-    """Create a new artifact version and update artifact's current_version_id."""
+    """
+    Create a new artifact version and make it the artifact's current version.
+    
+    The previous current version is re-encoded as a reverse delta against the
+    new content (unless it is a snapshot, or the delta would barely be smaller),
+    so only the newest version and every ARTIFACT_SNAPSHOT_INTERVAL-th version
+    are stored in full. Load the artifact with get_artifact_for_update to
+    avoid a query for the current content and lock the artifact. A concurrent
+    version that wasn't locked out raises VersionConflictError (the
+    transaction is rolled back).
+    """
+    previous = None
+    if artifact.current_version_id is not None:
+        previous = artifact.current_version if "current_version" not in inspect(artifact).unloaded else None
+        if previous is None or "content" in inspect(previous).unloaded:
+            result = await db.execute(
+                select(ArtifactVersion)
+                .options(undefer(ArtifactVersion.content))
+                .where(ArtifactVersion.id == artifact.current_version_id)
+            )
+            previous = result.scalar_one()
+    
     version = ArtifactVersion(
-        artifact_id=artifact_id,
-        content=content,
+        artifact_id=artifact.id,
+        version_number=previous.version_number + 1 if previous else 1,
         created_by_user_id=created_by_user_id,
-        version_metadata=version_metadata
+        version_metadata=version_metadata,
+        **_content_fields(content)
     )
     db.add(version)
-    db.flush()  # Flush to get version.id
+    try:
+        await db.flush()  # Flush to get version.id
+    except IntegrityError:
+        # The unique (artifact_id, version_number) index: another version got there first
+        await db.rollback()
+        raise VersionConflictError("The artifact was changed concurrently. Try again.")
     
-    # Update artifact's current_version_id
-    artifact = get_artifact(db, artifact_id)
-    if artifact:
-        artifact.current_version_id = version.id
-        db.commit()
-        db.refresh(version)
-        db.refresh(artifact)
+    if previous is not None and previous.content is not None and not _keeps_snapshot(previous.version_number):
+        delta = delta_service.encode_delta(content, previous.content)
+        if len(delta) <= DELTA_MAX_SIZE_RATIO * (previous.size_bytes or len(previous.content)):
+            previous.delta = delta
+            previous.base_version_id = version.id
+            previous.content = None
+            # Keep the text this version loses for search
+            previous.search_text = delta_service.delta_text(delta)
     
+    artifact.current_version = version
+    await db.commit()
     return version
 
 
-def get_artifact_current_content(db: Session, artifact_id: int) -> Optional[str]:
-    """Get the current content of an artifact."""
-    artifact = get_artifact(db, artifact_id)
-    if artifact and artifact.current_version:
-        return artifact.current_version.content
-    return None
+def _keeps_snapshot(version_number: int) -> bool:
+    interval = settings.ARTIFACT_SNAPSHOT_INTERVAL
+    return interval <= 1 or version_number % interval == 0
+
+
+async def get_versions(
+    db: AsyncSession,
+    artifact_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "desc"
+) -> Tuple[List[ArtifactVersion], Optional[str]]:
+    """
+    Get one page of an artifact's version history, without content.
+    
+    Returns:
+        Tuple of (versions, next_cursor)
+    """
+    stmt = select(ArtifactVersion).where(ArtifactVersion.artifact_id == artifact_id)
+    return await paginate(db, stmt, ArtifactVersion, cursor, limit, order)
+
+
+async def get_version(db: AsyncSession, artifact_id: int, version_id: int) -> Optional[ArtifactVersion]:
+    """Get one version of an artifact (without content)."""
+    result = await db.execute(
+        select(ArtifactVersion).where(ArtifactVersion.id == version_id, ArtifactVersion.artifact_id == artifact_id)
+    )
+    return result.scalar_one_or_none()
+
 
+async def get_version_content(db: AsyncSession, version: ArtifactVersion) -> str:
+    """
+    Reconstruct the full content of any version.
+    
+    Walks forward from `version` to the nearest version stored in full (a
+    snapshot or the current version, at most ARTIFACT_SNAPSHOT_INTERVAL
+    versions away), then applies the reverse deltas back down. The chain is
+    read in one query and the result is checked against the stored hash.
+    """
+    chain = []
+    next_number = version.version_number
+    while True:
+        result = await db.execute(
+            select(ArtifactVersion)
+            .options(undefer(ArtifactVersion.content), undefer(ArtifactVersion.delta))
+            .where(
+                ArtifactVersion.artifact_id == version.artifact_id,
+                ArtifactVersion.version_number >= next_number
+            )
+            .order_by(ArtifactVersion.version_number)
+            .limit(max(settings.ARTIFACT_SNAPSHOT_INTERVAL, 1) + 1)
+        )
+        rows = list(result.scalars().all())
+        if not rows:
+            raise RuntimeError(f"Artifact version {version.id} has no stored base version")
+        for row in rows:
+            chain.append(row)
+            if row.content is not None:
+                break
+        if chain[-1].content is not None:
+            break
+        next_number = rows[-1].version_number + 1
+    
+    content = chain[-1].content
+    for row, base in zip(reversed(chain[:-1]), reversed(chain[1:])):
+        if row.base_version_id != base.id:
+            raise RuntimeError(f"Artifact version {row.id} has a broken delta chain")
+        content = delta_service.apply_delta(content, row.delta)
+    
+    if version.content_hash and hashlib.sha256(content.encode("utf-8")).hexdigest() != version.content_hash:
+        raise RuntimeError(f"Artifact version {version.id} failed to reconstruct: content hash mismatch")
+    return content
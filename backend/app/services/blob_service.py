@@ -0,0 +1,129 @@
+"""Blob service - content-addressed, reference-counted storage for file bytes."""
+import uuid
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, Tuple
+from app.models.blob import Blob
+from app.models.file import File
+from app.storage import storage
+
+
+def blob_storage_path(content_hash: str) -> str:
+    """
+    Storage path for a new blob, fanned out by hash prefix to keep directories small.
+
+    Each blob row gets its own path. If the last reference to some content is
+    dropped while it is uploaded again, the new blob's bytes then never share
+    a path with the old blob's, which are deleted after the old row is gone.
+    """
+    return f"blobs/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}/{uuid.uuid4().hex}"
+
+
+async def get_blob_by_hash(db: AsyncSession, content_hash: str, for_update: bool = False) -> Optional[Blob]:
+    """Get a blob by content hash, optionally locking the row."""
+    query = select(Blob).where(Blob.content_hash == content_hash)
+    if for_update:
+        query = query.with_for_update()
+    return (await db.execute(query)).scalar_one_or_none()
+
+
+async def acquire_blob(db: AsyncSession, content_hash: str, size_bytes: int, staged_path: str) -> Tuple[Blob, bool]:
+    """
+    Take a reference on the blob for `content_hash`, creating it if needed.
+
+    `staged_path` holds the freshly uploaded bytes. If a blob with the same
+    hash already exists the staged copy is discarded; otherwise it is moved
+    to the new blob's own path under its hash (see blob_storage_path).
+    Flushes but does not commit, so the caller can add the File row in the
+    same transaction.
+
+    Returns:
+        Tuple of (blob, created)
+    """
+    blob = await get_blob_by_hash(db, content_hash, for_update=True)
+    if blob:
+        blob.ref_count += 1
+        await db.flush()
+        await _discard_staged(staged_path)
+        return blob, False
+
+    path = blob_storage_path(content_hash)
+    await storage.move(staged_path, path)
+    blob = Blob(content_hash=content_hash, storage_path=path, size_bytes=size_bytes, ref_count=1)
+    try:
+        async with db.begin_nested():
+            db.add(blob)
+    except IntegrityError:
+        # A concurrent upload created the same blob first; its bytes are identical
+        await delete_unreferenced(path)
+        blob = await get_blob_by_hash(db, content_hash, for_update=True)
+        blob.ref_count += 1
+        await db.flush()
+        return blob, False
+    return blob, True
+
+
+async def release_blob(db: AsyncSession, blob_id: int) -> Optional[str]:
+    """
+    Drop one reference to a blob, deleting the row when the last reference goes.
+
+    Does not commit. Returns the storage path that is no longer referenced
+    (to be deleted by the caller once the transaction commits), or None.
+    """
+    result = await db.execute(select(Blob).where(Blob.id == blob_id).with_for_update())
+    blob = result.scalar_one_or_none()
+    if not blob:
+        return None
+
+    blob.ref_count -= 1
+    if blob.ref_count > 0:
+        await db.flush()
+        return None
+
+    path = blob.storage_path
+    await db.delete(blob)
+    await db.flush()
+    return path
+
+
+async def delete_unreferenced(storage_path: Optional[str]) -> None:
+    """Remove a blob's bytes from storage after its row has been deleted."""
+    if not storage_path:
+        return
+    try:
+        await storage.delete(storage_path)
+    except FileNotFoundError:
+        pass
+
+
+async def get_dedup_stats(db: AsyncSession) -> dict:
+    """
+    Report how much storage deduplication is saving.
+
+    logical_bytes counts every File as if it were stored separately;
+    physical_bytes counts each blob once.
+    """
+    file_count, logical_bytes = (await db.execute(
+        select(func.count(File.id), func.coalesce(func.sum(File.size_bytes), 0))
+        .where(File.blob_id.isnot(None))
+    )).one()
+    blob_count, physical_bytes = (await db.execute(
+        select(func.count(Blob.id), func.coalesce(func.sum(Blob.size_bytes), 0))
+    )).one()
+
+    return {
+        "file_count": file_count,
+        "blob_count": blob_count,
+        "logical_bytes": int(logical_bytes),
+        "physical_bytes": int(physical_bytes),
+        "bytes_saved": int(logical_bytes) - int(physical_bytes),
+        "dedup_ratio": (int(logical_bytes) / int(physical_bytes)) if physical_bytes else 1.0,
+    }
+
+
+async def _discard_staged(staged_path: str) -> None:
+    try:
+        await storage.delete(staged_path)
+    except FileNotFoundError:
+        pass
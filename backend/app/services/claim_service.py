@@ -1,12 +1,19 @@
 """Claim service."""
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from datetime import datetime
+from typing import List, Optional, Tuple
+from app.core.pagination import DEFAULT_PAGE_SIZE, SortOrder, paginate
+from app.models.artifact import Artifact
+from app.models.artifact_version import ArtifactVersion
 from app.models.claim import Claim
+from app.models.file import File
 from app.models.user import User
 from app.schemas.claim import ClaimCreate
 
 
-def create_claim(db: Session, claim_data: ClaimCreate, owner_user_id: int) -> Claim:
+async def create_claim(db: AsyncSession, claim_data: ClaimCreate, owner_user_id: int) -> Claim:
     """Create a new claim."""
     claim = Claim(
         title=claim_data.title,
@@ -14,25 +21,81 @@ def create_claim(db: Session, claim_data: ClaimCreate, owner_user_id: int) -> Cl
         owner_user_id=owner_user_id
     )
     db.add(claim)
-    db.commit()
-    db.refresh(claim)
+    await db.commit()
+    await db.refresh(claim)
     return claim
 
 
-def get_claim(db: Session, claim_id: int) -> Optional[Claim]:
+async def get_claim(db: AsyncSession, claim_id: int) -> Optional[Claim]:
     """Get a claim by ID."""
-    return db.query(Claim).filter(Claim.id == claim_id).first()
+    return (await db.execute(select(Claim).where(Claim.id == claim_id))).scalar_one_or_none()
 
 
-def get_claims_by_owner(db: Session, owner_user_id: int) -> List[Claim]:
-    """Get all claims for a user."""
-    return db.query(Claim).filter(Claim.owner_user_id == owner_user_id).all()
+async def get_claims_by_owner(
+    db: AsyncSession,
+    owner_user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "desc",
+    reference_prefix: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+) -> Tuple[List[Claim], Optional[str]]:
+    """
+    Get one page of a user's claims, newest first by default.
+    
+    Filters: reference number prefix, and created_at in [created_after, created_before).
+    
+    Returns:
+        Tuple of (claims, next_cursor)
+    """
+    stmt = select(Claim).where(Claim.owner_user_id == owner_user_id)
+    if reference_prefix:
+        stmt = stmt.where(Claim.reference_number.startswith(reference_prefix, autoescape=True))
+    if created_after:
+        stmt = stmt.where(Claim.created_at >= created_after)
+    if created_before:
+        stmt = stmt.where(Claim.created_at < created_before)
+    return await paginate(db, stmt, Claim, cursor, limit, order)
 
 
-def get_claim_with_owner_check(db: Session, claim_id: int, owner_user_id: int) -> Optional[Claim]:
-    """Get a claim by ID and verify ownership."""
-    claim = get_claim(db, claim_id)
-    if claim and claim.owner_user_id == owner_user_id:
-        return claim
-    return None
+async def get_claim_with_owner_check(
+    db: AsyncSession,
+    claim_id: int,
+    owner_user_id: int,
+    for_update: bool = False
+) -> Optional[Claim]:
+    """Get a claim by ID and verify ownership, optionally locking the row."""
+    query = select(Claim).where(Claim.id == claim_id, Claim.owner_user_id == owner_user_id)
+    if for_update:
+        query = query.with_for_update()
+    return (await db.execute(query)).scalar_one_or_none()
 
+
+async def get_claim_context(
+    db: AsyncSession,
+    claim_id: int,
+    owner_user_id: int,
+    with_file_text: bool = False
+) -> Optional[Claim]:
+    """
+    Get a claim with its files, artifacts and their current versions, verifying ownership.
+    
+    Files are metadata only unless `with_file_text`, which also loads their
+    extracted text; current version content is always included. Everything
+    is fetched in three batched queries (claim, files, artifacts joined to
+    their current version), so services can work from the returned claim's
+    relationships instead of querying per lookup.
+    """
+    files = selectinload(Claim.files)
+    if with_file_text:
+        files = files.undefer(File.extracted_text)
+    result = await db.execute(
+        select(Claim)
+        .options(
+            files,
+            selectinload(Claim.artifacts).joinedload(Artifact.current_version).undefer(ArtifactVersion.content)
+        )
+        .where(Claim.id == claim_id, Claim.owner_user_id == owner_user_id)
+    )
+    return result.scalar_one_or_none()
@@ -0,0 +1,235 @@
+"""Context service - token-accurate packing of claim documents into a prompt budget."""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.schemas.agent import ContextFile, ContextReport
+from app.services import token_service
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+TRUNCATION_MARKER = "\n[... truncated to fit the context budget]"
+
+
+def _normalize(text: str) -> str:
+    """Normalize a line or block for boilerplate matching (case, spacing, numbers)."""
+    return re.sub(r"\d+", "#", re.sub(r"\s+", " ", text.strip().lower()))
+
+
+def section_header(filename: str) -> str:
+    return f"=== File: {filename} ===\n"
+
+
+def remove_boilerplate(file_contents: dict) -> Tuple[dict, Dict[int, int]]:
+    """
+    Drop repeated boilerplate across a claim's documents.
+
+    Paragraphs that appear more than once, and lines that repeat at least
+    CONTEXT_BOILERPLATE_MIN_REPEATS times (policy headers, footers, "Page N of M"),
+    are kept at their first occurrence only. Matching ignores case, spacing and
+    numbers. Files are processed in id order so the result is deterministic.
+
+    Returns:
+        Tuple of (file_contents with cleaned 'content', {file_id: boilerplate tokens removed})
+    """
+    min_chars = settings.CONTEXT_BOILERPLATE_MIN_CHARS
+    line_counts = Counter()
+    block_counts = Counter()
+    for file_data in file_contents.values():
+        for block in file_data['content'].split("\n\n"):
+            normalized = _normalize(block)
+            if len(normalized) >= min_chars:
+                block_counts[normalized] += 1
+            for line in block.split("\n"):
+                normalized = _normalize(line)
+                if len(normalized) >= min_chars:
+                    line_counts[normalized] += 1
+
+    repeated_blocks = {block for block, count in block_counts.items() if count > 1}
+    repeated_lines = {
+        line for line, count in line_counts.items()
+        if count >= settings.CONTEXT_BOILERPLATE_MIN_REPEATS
+    }
+
+    seen_blocks = set()
+    seen_lines = set()
+    cleaned = {}
+    removed_tokens = {}
+    for file_id in sorted(file_contents):
+        file_data = file_contents[file_id]
+        kept_blocks = []
+        removed = []
+        for block in file_data['content'].split("\n\n"):
+            normalized = _normalize(block)
+            if normalized in repeated_blocks:
+                if normalized in seen_blocks:
+                    removed.append(block)
+                    continue
+                seen_blocks.add(normalized)
+            kept_lines = []
+            for line in block.split("\n"):
+                normalized = _normalize(line)
+                if normalized in repeated_lines:
+                    if normalized in seen_lines:
+                        removed.append(line)
+                        continue
+                    seen_lines.add(normalized)
+                kept_lines.append(line)
+            if kept_lines:
+                kept_blocks.append("\n".join(kept_lines))
+
+        cleaned[file_id] = {**file_data, 'content': "\n\n".join(kept_blocks)}
+        removed_tokens[file_id] = token_service.count_tokens("\n".join(removed)) if removed else 0
+    return cleaned, removed_tokens
+
+
+def _term_counts(text: str) -> Counter:
+    return Counter(_WORD_PATTERN.findall(text.lower()))
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    dot = sum(count * b[term] for term, count in a.items() if term in b)
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def rank_files(file_contents: dict, removed_tokens: Dict[int, int], query: Optional[str] = None) -> Dict[int, float]:
+    """
+    Score files between 0 and 1 for inclusion priority.
+
+    Combines relevance (similarity to `query` if given, otherwise to the claim's
+    documents as a whole, so off-topic files rank low), recency (newer uploads
+    rank higher) and substance (share of the file that isn't boilerplate).
+    """
+    if not file_contents:
+        return {}
+    term_counts = {file_id: _term_counts(data['content']) for file_id, data in file_contents.items()}
+    if query:
+        target = _term_counts(query)
+    else:
+        target = Counter()
+        for counts in term_counts.values():
+            target.update(counts)
+
+    def upload_time(file_id: int) -> float:
+        created_at = file_contents[file_id]['file'].created_at
+        return created_at.timestamp() if created_at else 0.0
+
+    by_age = sorted(file_contents, key=lambda file_id: (upload_time(file_id), file_id))
+    recency = {file_id: (index + 1) / len(by_age) for index, file_id in enumerate(by_age)}
+
+    scores = {}
+    for file_id, data in file_contents.items():
+        tokens = token_service.count_tokens(data['content'])
+        removed = removed_tokens.get(file_id, 0)
+        substance = tokens / (tokens + removed) if tokens + removed else 0.0
+        scores[file_id] = (
+            settings.CONTEXT_RELEVANCE_WEIGHT * _cosine(term_counts[file_id], target)
+            + settings.CONTEXT_RECENCY_WEIGHT * recency[file_id]
+            + settings.CONTEXT_SUBSTANCE_WEIGHT * substance
+        )
+    return scores
+
+
+def _allocate(sizes: Dict[int, int], scores: Dict[int, float], budget: int) -> Dict[int, int]:
+    """
+    Split `budget` tokens across files in proportion to score (water-filling).
+
+    Files smaller than their share are included whole and the surplus is
+    redistributed. If a file's share falls below CONTEXT_MIN_SECTION_TOKENS the
+    lowest-scoring file is dropped (allocated 0) and the split is redone.
+    """
+    active = sorted(sizes, key=lambda file_id: (-scores[file_id], file_id))
+    while active:
+        allocation = {}
+        remaining = budget
+        pending = list(active)
+        while pending:
+            # Floor weights so zero-score files still get a share
+            weight_total = sum(max(scores[file_id], 0.01) for file_id in pending)
+            fits = [
+                file_id for file_id in pending
+                if sizes[file_id] <= remaining * max(scores[file_id], 0.01) / weight_total
+            ]
+            if not fits:
+                break
+            for file_id in fits:
+                allocation[file_id] = sizes[file_id]
+                remaining -= sizes[file_id]
+                pending.remove(file_id)
+
+        weight_total = sum(max(scores[file_id], 0.01) for file_id in pending)
+        shares = {file_id: int(remaining * max(scores[file_id], 0.01) / weight_total) for file_id in pending}
+        if all(share >= settings.CONTEXT_MIN_SECTION_TOKENS for share in shares.values()):
+            allocation.update(shares)
+            return allocation
+        # Too many files for the budget: drop the lowest-ranked one and re-split
+        active.pop()
+    return {}
+
+
+def pack_context(
+    file_contents: dict,
+    budget_tokens: int,
+    query: Optional[str] = None,
+    removed_tokens: Optional[Dict[int, int]] = None
+) -> Tuple[List[str], ContextReport]:
+    """
+    Fit file sections into `budget_tokens` tokens, measured with the model's tokenizer.
+
+    Expects contents already passed through remove_boilerplate (pass its
+    removed_tokens for reporting). When everything fits, all files are
+    included whole. Otherwise the budget is split by rank_files score:
+    low-ranked files are truncated first and dropped if their share gets too
+    small to be useful. Sections are returned highest-ranked first, together
+    with a report of exactly what was included, truncated or dropped.
+    """
+    removed_tokens = removed_tokens or {}
+    scores = rank_files(file_contents, removed_tokens, query)
+    headers = {file_id: section_header(data['file'].filename) for file_id, data in file_contents.items()}
+    # +1 per section for the blank line that joins sections
+    header_tokens = {file_id: token_service.count_tokens(header) + 1 for file_id, header in headers.items()}
+    content_tokens = {file_id: token_service.count_tokens(data['content']) for file_id, data in file_contents.items()}
+    sizes = {file_id: header_tokens[file_id] + content_tokens[file_id] for file_id in file_contents}
+
+    if sum(sizes.values()) <= budget_tokens:
+        allocation = dict(sizes)
+        strategy = "full"
+    else:
+        allocation = _allocate(sizes, scores, budget_tokens)
+        strategy = "packed"
+
+    marker_tokens = token_service.count_tokens(TRUNCATION_MARKER)
+    sections = []
+    files = []
+    for file_id in sorted(file_contents, key=lambda file_id: (-scores[file_id], file_id)):
+        file_data = file_contents[file_id]
+        allowed = allocation.get(file_id, 0)
+        if allowed <= 0:
+            status, included = "dropped", 0
+        elif allowed >= sizes[file_id]:
+            status, included = "full", content_tokens[file_id]
+            sections.append(headers[file_id] + file_data['content'])
+        else:
+            included = max(0, allowed - header_tokens[file_id] - marker_tokens)
+            status = "truncated"
+            text = token_service.truncate_to_tokens(file_data['content'], included)
+            sections.append(headers[file_id] + text + TRUNCATION_MARKER)
+        files.append(ContextFile(
+            file_id=file_id,
+            filename=file_data['file'].filename,
+            tokens=content_tokens[file_id],
+            included_tokens=included,
+            boilerplate_tokens=removed_tokens.get(file_id, 0),
+            status=status,
+            score=round(scores[file_id], 4)
+        ))
+
+    report = ContextReport(
+        strategy=strategy,
+        tokenizer=token_service.tokenizer_name(),
+        budget_tokens=budget_tokens,
+        used_tokens=token_service.count_tokens("\n\n".join(sections)),
+        files=files
+    )
+    return sections, report
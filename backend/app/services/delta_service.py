@@ -0,0 +1,51 @@
+"""Delta service - compact line deltas between versions of a text."""
+import json
+import zlib
+from typing import List
+from app.services.diff_service import diff_sequences
+
+
+def _lines(text: str) -> List[str]:
+    return text.splitlines(keepends=True)
+
+
+def encode_delta(base: str, target: str) -> bytes:
+    """
+    Encode `target` as a delta against `base`.
+
+    The delta is a list of operations, applied in order: `[start, end]` copies
+    base lines start..end-1 and a string inserts literal text. It is stored as
+    zlib-compressed JSON, so an unchanged line costs a few bytes however long
+    it is, and new text is compressed.
+    """
+    base_lines = _lines(base)
+    target_lines = _lines(target)
+    ops = []
+    for tag, i1, i2, j1, j2 in diff_sequences(base_lines, target_lines):
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif tag in ("replace", "insert"):
+            ops.append("".join(target_lines[j1:j2]))
+    return zlib.compress(json.dumps(ops, separators=(",", ":")).encode("utf-8"))
+
+
+def apply_delta(base: str, delta: bytes) -> str:
+    """Rebuild the target text from `base` and a delta made by encode_delta."""
+    base_lines = _lines(base)
+    parts = []
+    for op in json.loads(zlib.decompress(delta)):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            parts.extend(base_lines[op[0]:op[1]])
+    return "".join(parts)
+
+
+def delta_text(delta: bytes) -> str:
+    """
+    The literal text a delta inserts: the lines of the target that are not in the base.
+
+    For a reverse delta this is the text that was removed or changed in the
+    next version, which is what artifact versions keep for search.
+    """
+    return "".join(op for op in json.loads(zlib.decompress(delta)) if isinstance(op, str))
@@ -1,42 +1,337 @@
 """Diff computation service."""
 import difflib
-from typing import Tuple
+import re
+from collections import Counter
+from typing import Hashable, List, Optional, Sequence, Tuple
+from app.core.config import settings
 
+Opcode = Tuple[str, int, int, int, int]
 
-def compute_unified_diff(old_content: str, new_content: str, old_name: str = "old", new_name: str = "new") -> str:
+# Lines occurring more often than this in a region are never used as anchors
+# (the histogram diff's chain limit); regions without any anchor fall back to
+# difflib if small enough, otherwise they are reported as replaced wholesale
+MAX_ANCHOR_OCCURRENCES = 64
+FALLBACK_MAX_CELLS = 250000
+CONTEXT_LINES = 3
+# Changed line pairs longer than this are not diffed word by word
+WORD_DIFF_MAX_LINE_CHARS = 2000
+
+_WORD_PATTERN = re.compile(r"\w+|\s+|[^\w\s]")
+_LINE_TERMINATORS = "\n\r\x0b\x0c\x1c\x1d\x1e\x85  "
+
+
+def _intern(a: Sequence[Hashable], b: Sequence[Hashable]) -> Tuple[List[int], List[int]]:
+    """Map items to small ints so comparisons are cheap."""
+    ids = {}
+    a_ids = [ids.setdefault(item, len(ids)) for item in a]
+    b_ids = [ids.setdefault(item, len(ids)) for item in b]
+    return a_ids, b_ids
+
+
+def _best_anchor(a: List[int], b: List[int], alo: int, ahi: int, blo: int, bhi: int) -> Optional[Tuple[int, int, int]]:
     """
-    Compute unified diff between old and new content.
-    
+    Find the longest common run around the rarest line shared by both regions.
+
+    Rare lines (unique ones first, as in patience diff) make reliable anchors;
+    lines repeated many times (blank lines, table borders) are skipped.
+    """
+    positions = {}
+    for i in range(alo, ahi):
+        positions.setdefault(a[i], []).append(i)
+
+    best = None
+    best_count = MAX_ANCHOR_OCCURRENCES
+    best_size = 0
+    j = blo
+    while j < bhi:
+        next_j = j + 1
+        candidates = positions.get(b[j])
+        if candidates is not None and len(candidates) <= best_count:
+            for i in candidates:
+                start_i, start_j = i, j
+                while start_i > alo and start_j > blo and a[start_i - 1] == b[start_j - 1]:
+                    start_i -= 1
+                    start_j -= 1
+                end_i, end_j = i + 1, j + 1
+                while end_i < ahi and end_j < bhi and a[end_i] == b[end_j]:
+                    end_i += 1
+                    end_j += 1
+                size = end_i - start_i
+                if len(candidates) < best_count or size > best_size:
+                    best = (start_i, start_j, size)
+                    best_count = len(candidates)
+                    best_size = size
+                # Lines inside this run can't anchor a longer one
+                next_j = max(next_j, end_j)
+        j = next_j
+    return best
+
+
+def _matching_blocks(a: List[int], b: List[int]) -> List[Tuple[int, int, int]]:
+    """Histogram diff: split on the best anchor and recurse (iteratively) on both sides."""
+    blocks = []
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        alo, ahi, blo, bhi = stack.pop()
+        prefix = 0
+        while alo + prefix < ahi and blo + prefix < bhi and a[alo + prefix] == b[blo + prefix]:
+            prefix += 1
+        if prefix:
+            blocks.append((alo, blo, prefix))
+            alo += prefix
+            blo += prefix
+        suffix = 0
+        while ahi - suffix > alo and bhi - suffix > blo and a[ahi - suffix - 1] == b[bhi - suffix - 1]:
+            suffix += 1
+        if suffix:
+            blocks.append((ahi - suffix, bhi - suffix, suffix))
+            ahi -= suffix
+            bhi -= suffix
+        if alo == ahi or blo == bhi:
+            continue
+
+        anchor = _best_anchor(a, b, alo, ahi, blo, bhi)
+        if anchor is None:
+            if (ahi - alo) * (bhi - blo) <= FALLBACK_MAX_CELLS:
+                matcher = difflib.SequenceMatcher(None, a[alo:ahi], b[blo:bhi], autojunk=False)
+                blocks.extend((alo + i, blo + j, size) for i, j, size in matcher.get_matching_blocks() if size)
+            continue
+        i, j, size = anchor
+        blocks.append(anchor)
+        stack.append((alo, i, blo, j))
+        stack.append((i + size, ahi, j + size, bhi))
+
+    blocks.sort()
+    merged = []
+    for i, j, size in blocks:
+        if merged and merged[-1][0] + merged[-1][2] == i and merged[-1][1] + merged[-1][2] == j:
+            merged[-1] = (merged[-1][0], merged[-1][1], merged[-1][2] + size)
+        else:
+            merged.append((i, j, size))
+    return merged
+
+
+def diff_sequences(a: Sequence[Hashable], b: Sequence[Hashable]) -> List[Opcode]:
+    """
+    Diff two sequences (lines, words) into difflib-style opcodes.
+
+    Uses a histogram diff, which is close to linear on typical documents and
+    stays fast on long inputs full of repeated lines, where difflib's
+    SequenceMatcher degrades.
+
+    Returns:
+        List of (tag, i1, i2, j1, j2) with tag "equal", "replace", "delete" or "insert"
+    """
+    a_ids, b_ids = _intern(a, b)
+    opcodes = []
+    i = j = 0
+    for block_i, block_j, size in _matching_blocks(a_ids, b_ids) + [(len(a), len(b), 0)]:
+        if i < block_i and j < block_j:
+            opcodes.append(("replace", i, block_i, j, block_j))
+        elif i < block_i:
+            opcodes.append(("delete", i, block_i, j, j))
+        elif j < block_j:
+            opcodes.append(("insert", i, i, j, block_j))
+        if size:
+            opcodes.append(("equal", block_i, block_i + size, block_j, block_j + size))
+        i, j = block_i + size, block_j + size
+    return opcodes
+
+
+def _group_opcodes(opcodes: List[Opcode], context: int) -> List[List[Opcode]]:
+    """Split opcodes into hunks with `context` unchanged lines around each change."""
+    changes = [code for code in opcodes if code[0] != "equal"]
+    if not changes:
+        return []
+    codes = list(opcodes)
+    if codes[0][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[0]
+        codes[0] = (tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2)
+    if codes[-1][0] == "equal":
+        tag, i1, i2, j1, j2 = codes[-1]
+        codes[-1] = (tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context))
+
+    groups = []
+    group = []
+    for tag, i1, i2, j1, j2 in codes:
+        if tag == "equal" and i2 - i1 > 2 * context:
+            group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+            groups.append(group)
+            group = []
+            i1, j1 = max(i1, i2 - context), max(j1, j2 - context)
+        group.append((tag, i1, i2, j1, j2))
+    if group and not (len(group) == 1 and group[0][0] == "equal"):
+        groups.append(group)
+    return groups
+
+
+def _split_eol(line: str) -> Tuple[str, bool]:
+    """Split a line into its text and whether it had a line terminator."""
+    if line.endswith("\r\n"):
+        return line[:-2], True
+    if line and line[-1] in _LINE_TERMINATORS:
+        return line[:-1], True
+    return line, False
+
+
+def _word_segments(old_text: str, new_text: str) -> Optional[Tuple[List[dict], List[dict]]]:
+    """Word-level segments for a changed line pair, or None if they share no words."""
+    if len(old_text) > WORD_DIFF_MAX_LINE_CHARS or len(new_text) > WORD_DIFF_MAX_LINE_CHARS:
+        return None
+    old_words = _WORD_PATTERN.findall(old_text)
+    new_words = _WORD_PATTERN.findall(new_text)
+    old_segments, new_segments = [], []
+    shared = False
+
+    def add(segments: List[dict], op: str, text: str) -> None:
+        if not text:
+            return
+        if segments and segments[-1]["op"] == op:
+            segments[-1]["text"] += text
+        else:
+            segments.append({"op": op, "text": text})
+
+    for tag, i1, i2, j1, j2 in diff_sequences(old_words, new_words):
+        old_part = "".join(old_words[i1:i2])
+        new_part = "".join(new_words[j1:j2])
+        if tag == "equal":
+            shared = shared or bool(old_part.strip())
+            add(old_segments, "equal", old_part)
+            add(new_segments, "equal", new_part)
+        else:
+            add(old_segments, "delete", old_part)
+            add(new_segments, "insert", new_part)
+    return (old_segments, new_segments) if shared else None
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Unified diff hunk range, as difflib formats it."""
+    beginning = start + 1
+    length = stop - start
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f"{beginning},{length}"
+
+
+def _build_hunk(group: List[Opcode], old_lines: List[str], new_lines: List[str], word_level: bool) -> Tuple[dict, List[str]]:
+    """Build one JSON hunk and its unified diff text lines."""
+    first, last = group[0], group[-1]
+    header = f"@@ -{_format_range(first[1], last[2])} +{_format_range(first[3], last[4])} @@\n"
+    lines = []
+    text_lines = [header]
+
+    def add(op: str, prefix: str, line: str, old_number, new_number, segments=None) -> None:
+        text, has_eol = _split_eol(line)
+        entry = {"op": op, "old_number": old_number, "new_number": new_number, "text": text}
+        if segments is not None:
+            entry["segments"] = segments
+        lines.append(entry)
+        text_lines.append(prefix + line if has_eol else prefix + line + "\n\\ No newline at end of file\n")
+
+    for tag, i1, i2, j1, j2 in group:
+        if tag == "equal":
+            for offset in range(i2 - i1):
+                add("context", " ", old_lines[i1 + offset], i1 + offset + 1, j1 + offset + 1)
+            continue
+        pairs = {}
+        if word_level and tag == "replace":
+            for offset in range(min(i2 - i1, j2 - j1)):
+                segments = _word_segments(_split_eol(old_lines[i1 + offset])[0], _split_eol(new_lines[j1 + offset])[0])
+                if segments:
+                    pairs[offset] = segments
+        for offset in range(i2 - i1):
+            segments = pairs.get(offset)
+            add("delete", "-", old_lines[i1 + offset], i1 + offset + 1, None, segments[0] if segments else None)
+        for offset in range(j2 - j1):
+            segments = pairs.get(offset)
+            add("insert", "+", new_lines[j1 + offset], None, j1 + offset + 1, segments[1] if segments else None)
+
+    hunk = {
+        "old_start": first[1] + 1,
+        "old_lines": last[2] - first[1],
+        "new_start": first[3] + 1,
+        "new_lines": last[4] - first[3],
+        "lines": lines,
+    }
+    return hunk, text_lines
+
+
+def compute_diff(
+    old_content: str,
+    new_content: str,
+    old_name: str = "old",
+    new_name: str = "new",
+    word_level: bool = True,
+    context: int = CONTEXT_LINES
+) -> dict:
+    """
+    Diff two texts line by line.
+
+    Inputs larger than DIFF_MAX_INPUT_CHARS (combined) are not diffed; only
+    approximate added/removed line counts are returned, with `too_large` set.
+
     Args:
         old_content: Old content string
         new_content: New content string
         old_name: Name for old content (for diff header)
         new_name: Name for new content (for diff header)
-    
+        word_level: Attach word-level segments to changed line pairs
+        context: Unchanged lines shown around each change
+
     Returns:
-        Unified diff string
+        Dict with "unified" (unified diff string), "hunks" (structured hunks
+        for display) and "stats" (line counts)
     """
     old_lines = old_content.splitlines(keepends=True)
     new_lines = new_content.splitlines(keepends=True)
-    
-    diff = difflib.unified_diff(
-        old_lines,
-        new_lines,
-        fromfile=old_name,
-        tofile=new_name,
-        lineterm=''
-    )
-    
-    return ''.join(diff)
-
-
-def compute_diff(old_content: str, new_content: str) -> Tuple[str, str, str]:
-    """
-    Compute diff and return old, new, and diff strings.
-    
-    Returns:
-        Tuple of (old_content, new_content, diff_string)
+    stats = {
+        "old_lines": len(old_lines),
+        "new_lines": len(new_lines),
+        "added": 0,
+        "removed": 0,
+        "hunks": 0,
+        "too_large": False,
+    }
+
+    max_chars = settings.DIFF_MAX_INPUT_CHARS
+    if max_chars and len(old_content) + len(new_content) > max_chars:
+        # Multiset difference: exact for edits, counts moved lines as unchanged
+        old_counts, new_counts = Counter(old_lines), Counter(new_lines)
+        stats["added"] = sum((new_counts - old_counts).values())
+        stats["removed"] = sum((old_counts - new_counts).values())
+        stats["too_large"] = True
+        return {"unified": "", "hunks": [], "stats": stats}
+
+    opcodes = diff_sequences(old_lines, new_lines)
+    hunks = []
+    text_lines = []
+    for group in _group_opcodes(opcodes, context):
+        hunk, hunk_text = _build_hunk(group, old_lines, new_lines, word_level)
+        hunks.append(hunk)
+        text_lines.extend(hunk_text)
+    for tag, i1, i2, j1, j2 in opcodes:
+        if tag != "equal":
+            stats["removed"] += i2 - i1
+            stats["added"] += j2 - j1
+    stats["hunks"] = len(hunks)
+
+    unified = f"--- {old_name}\n+++ {new_name}\n" + "".join(text_lines) if hunks else ""
+    return {"unified": unified, "hunks": hunks, "stats": stats}
+
+
+def compute_unified_diff(old_content: str, new_content: str, old_name: str = "old", new_name: str = "new") -> str:
     """
-    diff = compute_unified_diff(old_content, new_content)
-    return old_content, new_content, diff
+    Compute unified diff between old and new content.
+
+    Args:
+        old_content: Old content string
+        new_content: New content string
+        old_name: Name for old content (for diff header)
+        new_name: Name for new content (for diff header)
 
+    Returns:
+        Unified diff string (empty if the contents are equal or too large to diff)
+    """
+    return compute_diff(old_content, new_content, old_name, new_name, word_level=False)["unified"]
@@ -0,0 +1,141 @@
+"""Extraction service - extracts file text after upload, on the task queue."""
+import asyncio
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.blob import Blob
+from app.models.file import File, EXTRACTION_PENDING, EXTRACTION_DONE, EXTRACTION_FAILED
+from app.models.task import Task
+from app.services.file_service import extract_text_from_bytes
+from app.storage import storage
+from app.telemetry import annotate
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get the process pool used for parsing, creating it on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=settings.EXTRACTION_WORKERS)
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Shut down the extraction process pool (called on app shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def _extract(storage_path: str, mime_type: Optional[str], filename: str, label: str, final_attempt: bool) -> Optional[str]:
+    """Read and parse stored bytes; None if they can't be read (on the final attempt) or parsed."""
+    try:
+        file_bytes = await storage.read(storage_path)
+    except Exception as e:
+        if not final_attempt:
+            raise
+        logger.warning("Could not read %s for text extraction: %s: %s", label, type(e).__name__, e)
+        return None
+    try:
+        # PDFs are sharded by page across the pool; other types decode in a
+        # worker thread so the event loop never waits on parsing
+        return await asyncio.to_thread(extract_text_from_bytes, file_bytes, mime_type, filename, get_executor())
+    except Exception as e:
+        logger.warning("Text extraction failed for %s: %s: %s", label, type(e).__name__, e)
+        return None
+
+
+async def run_extraction(blob_id: int, final_attempt: bool = True) -> Optional[str]:
+    """
+    Extract text for a blob and share it with every File that references it.
+
+    Uses its own database session; PDF pages are parsed in the process pool
+    so large PDFs never hold up the event loop. If the blob was already
+    extracted (e.g. by a concurrent upload of the same content) the stored
+    result is reused instead of parsing again. Content that can't be parsed
+    marks the files failed; a storage read error is raised for the task
+    queue to retry, unless this is the final attempt.
+
+    Returns:
+        The blob's extraction status, or None if the blob no longer exists
+    """
+    async with AsyncSessionLocal() as db:
+        blob = (await db.execute(select(Blob).where(Blob.id == blob_id))).scalar_one_or_none()
+        if not blob:
+            return None
+
+        if blob.extraction_status == EXTRACTION_PENDING:
+            # Any referencing file supplies the mime type and name used to pick a parser
+            file = (await db.execute(
+                select(File).where(File.blob_id == blob.id).order_by(File.id).limit(1)
+            )).scalar_one_or_none()
+            extracted = await _extract(
+                blob.storage_path, file.mime_type if file else None, file.filename if file else "",
+                f"blob {blob.id}", final_attempt
+            )
+            if extracted is None:
+                blob.extraction_status = EXTRACTION_FAILED
+            else:
+                blob.extracted_text = extracted
+                blob.extraction_status = EXTRACTION_DONE
+
+        # Share the result with every file still waiting on this blob
+        await db.execute(
+            update(File)
+            .where(File.blob_id == blob.id, File.extraction_status == EXTRACTION_PENDING)
+            .values(extracted_text=blob.extracted_text, extraction_status=blob.extraction_status)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return blob.extraction_status
+
+
+async def run_file_extraction(file_id: int, final_attempt: bool = True) -> Optional[str]:
+    """
+    Extract text for a file stored before the blob store, which has no blob
+    to share it through. Same error handling as run_extraction.
+
+    Returns:
+        The file's extraction status, or None if the file no longer exists
+    """
+    async with AsyncSessionLocal() as db:
+        file = (await db.execute(select(File).where(File.id == file_id))).scalar_one_or_none()
+        if not file or file.extraction_status != EXTRACTION_PENDING:
+            return file.extraction_status if file else None
+
+        extracted = await _extract(file.storage_path, file.mime_type, file.filename, f"file {file.id}", final_attempt)
+        # Only if still pending: an edit may have given the file new text meanwhile
+        await db.execute(
+            update(File)
+            .where(File.id == file.id, File.extraction_status == EXTRACTION_PENDING)
+            .values(
+                extracted_text=extracted,
+                extraction_status=EXTRACTION_FAILED if extracted is None else EXTRACTION_DONE
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return EXTRACTION_FAILED if extracted is None else EXTRACTION_DONE
+
+
+async def run_extraction_task(task: Task) -> dict:
+    """
+    Task queue handler for EXTRACT_TEXT_TASK. Payload: blob_id when queued by
+    file_service on upload, or file_id for files stored before the blob store
+    (queued by migration f2b8c5d3e907).
+    """
+    final_attempt = task.attempts >= task.max_attempts
+    if "file_id" in task.payload:
+        annotate(file_id=task.payload["file_id"])
+        status = await run_file_extraction(task.payload["file_id"], final_attempt=final_attempt)
+    else:
+        annotate(blob_id=task.payload["blob_id"])
+        status = await run_extraction(task.payload["blob_id"], final_attempt=final_attempt)
+    return {"extraction_status": status}
@@ -1,21 +1,196 @@
 """File service."""
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi import UploadFile
 from pathlib import Path
+from concurrent.futures import Executor
+import hashlib
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+import signal
+import threading
 import PyPDF2
 import pdfplumber
 from io import BytesIO
-from app.models.file import File
+from app.core.config import settings
+from app.core.pagination import DEFAULT_PAGE_SIZE, SortOrder, paginate
+from app.models.file import File, EXTRACTION_DONE, EXTRACTION_PENDING
 from app.models.claim import Claim
-from app.storage.local_storage import storage
+from app.models.task import Task
+from app.services import blob_service, task_service
+from app.storage import storage
+from app.telemetry import record_pdf_page
 
+logger = logging.getLogger(__name__)
 
-def extract_text_from_bytes(file_bytes: bytes, mime_type: Optional[str], filename: str) -> Optional[str]:
+# Task queue kind that extracts an uploaded blob's text (handled by extraction_service)
+EXTRACT_TEXT_TASK = "extract_text"
+# Uploads are interactive; their extraction runs ahead of batch work
+EXTRACT_TEXT_PRIORITY = 10
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload stream exceeds MAX_UPLOAD_SIZE_BYTES."""
+
+
+class PageTimeoutError(Exception):
+    """Raised when a single PDF page exceeds its extraction time budget."""
+
+
+@contextmanager
+def _page_time_budget(seconds: float):
+    """
+    Abort the enclosed block with PageTimeoutError after `seconds`.
+    
+    Uses SIGALRM, so the budget is only enforced on a process's main thread
+    (which is where extraction pool workers run). Elsewhere it is a no-op.
+    """
+    enforce = (
+        seconds > 0
+        and hasattr(signal, 'setitimer')
+        and threading.current_thread() is threading.main_thread()
+    )
+    if not enforce:
+        yield
+        return
+    
+    def _on_timeout(signum, frame):
+        raise PageTimeoutError(f"Page extraction exceeded {seconds}s")
+    
+    previous_handler = signal.signal(signal.SIGALRM, _on_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _count_pdf_pages(file_bytes: bytes) -> Optional[int]:
+    """Count pages without parsing page content. Returns None if the PDF can't be read."""
+    try:
+        return len(PyPDF2.PdfReader(BytesIO(file_bytes)).pages)
+    except Exception:
+        return None
+
+
+def _extract_pdf_page_range(
+    file_bytes: bytes,
+    start: int,
+    end: Optional[int],
+    page_timeout: float
+) -> List[Tuple[Optional[str], float]]:
+    """
+    Extract text for pages [start, end) of a PDF, one (text, seconds) entry per page.
+    
+    Each page is tried with pdfplumber first and falls back to PyPDF2 on its own
+    if pdfplumber errors or runs out of time, so one bad page doesn't discard
+    the rest of the document. Pages that fail both extractors yield None.
+    Runs inside extraction pool workers, so it must stay a top-level function;
+    page timings are returned for the caller to record.
+    """
+    plumber_pdf = None
+    fallback_reader = None
+    try:
+        plumber_pdf = pdfplumber.open(BytesIO(file_bytes))
+    except Exception:
+        pass
+    
+    if end is None:
+        if plumber_pdf is not None:
+            end = len(plumber_pdf.pages)
+        else:
+            end = _count_pdf_pages(file_bytes) or 0
+    
+    results = []
+    try:
+        for index in range(start, end):
+            page_started = time.perf_counter()
+            page_text = None
+            needs_fallback = plumber_pdf is None
+            if plumber_pdf is not None:
+                try:
+                    with _page_time_budget(page_timeout):
+                        page_text = plumber_pdf.pages[index].extract_text()
+                except Exception:
+                    needs_fallback = True
+            
+            if needs_fallback:
+                try:
+                    if fallback_reader is None:
+                        fallback_reader = PyPDF2.PdfReader(BytesIO(file_bytes))
+                    with _page_time_budget(page_timeout):
+                        page_text = fallback_reader.pages[index].extract_text()
+                except Exception:
+                    page_text = None
+            
+            results.append((page_text, time.perf_counter() - page_started))
+    finally:
+        if plumber_pdf is not None:
+            plumber_pdf.close()
+    
+    return results
+
+
+def extract_pdf_text(file_bytes: bytes, executor: Optional[Executor] = None) -> Optional[str]:
+    """
+    Extract text from a PDF, page-parallel when an executor is given.
+    
+    The page range is split into shards of PDF_PAGES_PER_SHARD pages, each shard
+    is extracted in a pool worker, and results are merged back in page order.
+    Without an executor all pages are extracted serially in the calling thread.
+    """
+    page_timeout = settings.PDF_PAGE_TIMEOUT_SECONDS
+    page_count = _count_pdf_pages(file_bytes)
+    
+    if executor is None:
+        pages = _extract_pdf_page_range(file_bytes, 0, page_count, page_timeout)
+    else:
+        if page_count is None:
+            # Can't shard without a page count; let one worker handle the whole file
+            shards = [(0, None)]
+        else:
+            shard_size = max(1, settings.PDF_PAGES_PER_SHARD)
+            shards = [(start, min(start + shard_size, page_count)) for start in range(0, page_count, shard_size)]
+        
+        futures = [
+            executor.submit(_extract_pdf_page_range, file_bytes, start, end, page_timeout)
+            for start, end in shards
+        ]
+        pages = []
+        # Futures are consumed in submission order, which keeps pages in document order
+        for (start, end), future in zip(shards, futures):
+            try:
+                pages.extend(future.result())
+            except Exception as e:
+                logger.warning(
+                    "PDF shard failed: %s: %s", type(e).__name__, e,
+                    extra={"first_page": start, "end_page": end}
+                )
+    
+    for page_text, seconds in pages:
+        record_pdf_page(seconds, ok=page_text is not None)
+    text_parts = [page_text for page_text, _ in pages if page_text]
+    return '\n\n'.join(text_parts) if text_parts else None
+
+
+def extract_text_from_bytes(
+    file_bytes: bytes,
+    mime_type: Optional[str],
+    filename: str,
+    executor: Optional[Executor] = None
+) -> Optional[str]:
     """
     Extract text content from file bytes.
     
     For text files: decodes directly.
-    For PDFs: extracts text using pdfplumber (with fallback to PyPDF2).
+    For PDFs: extracts text page by page using pdfplumber (with per-page fallback
+    to PyPDF2), sharding pages across `executor` when one is given.
     Returns None if extraction fails or file type is not supported.
     """
     # Handle text files
@@ -33,27 +208,7 @@ def extract_text_from_bytes(file_bytes: bytes, mime_type: Optional[str], filenam
     
     # Handle PDF files
     if mime_type == 'application/pdf' or filename.lower().endswith('.pdf'):
-        try:
-            # Try pdfplumber first (better text extraction)
-            with pdfplumber.open(BytesIO(file_bytes)) as pdf:
-                text_parts = []
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-                return '\n\n'.join(text_parts) if text_parts else None
-        except Exception:
-            # Fallback to PyPDF2
-            try:
-                pdf_reader = PyPDF2.PdfReader(BytesIO(file_bytes))
-                text_parts = []
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
-                return '\n\n'.join(text_parts) if text_parts else None
-            except Exception:
-                return None
+        return extract_pdf_text(file_bytes, executor)
     
     # For other file types, try to decode as text
     try:
@@ -62,65 +217,204 @@ def extract_text_from_bytes(file_bytes: bytes, mime_type: Optional[str], filenam
         return None
 
 
-def read_file_content(file: File) -> str:
+async def save_upload_stream(
+    source: UploadFile,
+    storage_path: str,
+    chunk_size: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> Tuple[int, str]:
+    """
+    Stream an upload into storage in fixed-size chunks.
+    
+    The SHA-256 digest and size are computed incrementally as chunks pass
+    through, so memory use is bounded by the chunk size rather than the file size.
+    Raises UploadTooLargeError (and leaves nothing in storage) as soon as the
+    stream exceeds max_bytes.
+    
+    Returns:
+        Tuple of (size_bytes, sha256_hex)
     """
-    Read and extract text content from a file.
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    max_bytes = max_bytes if max_bytes is not None else settings.MAX_UPLOAD_SIZE_BYTES
+    hasher = hashlib.sha256()
+    size = 0
+    
+    async def chunks():
+        nonlocal size
+        while True:
+            chunk = await source.read(chunk_size)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLargeError(f"Upload exceeds maximum size of {max_bytes} bytes")
+            hasher.update(chunk)
+            yield chunk
     
-    First tries to use stored extracted_text if available.
-    Otherwise, reads from storage and extracts text.
+    await storage.write_stream(storage_path, chunks())
+    return size, hasher.hexdigest()
+
+
+async def create_file_from_upload(
+    db: AsyncSession,
+    claim_id: int,
+    upload: UploadFile,
+    owner_user_id: Optional[int] = None
+) -> Tuple[File, Optional[Task]]:
     """
-    # If we have stored extracted text, use it
-    if file.extracted_text:
-        return file.extracted_text
+    Store an upload in the deduplicated blob store and create its File record.
     
-    # Otherwise, extract from storage (for backward compatibility)
-    file_bytes = storage.read_file(file.storage_path)
-    extracted = extract_text_from_bytes(file_bytes, file.mime_type, file.filename)
+    The upload is streamed to a staging path, then either becomes a new blob or
+    is dropped in favour of an existing blob with the same content. Files that
+    share a blob whose text was already extracted get that text immediately;
+    otherwise text extraction is queued in the same transaction, so a stored
+    file always has its extraction task.
     
-    if extracted is None:
-        raise ValueError(f"Could not extract text from file: {file.filename}")
+    Returns:
+        Tuple of (file, extraction task or None)
+    """
+    staged_path = f"uploads/{uuid.uuid4().hex}"
+    size_bytes, content_hash = await save_upload_stream(upload, staged_path)
+    
+    blob, _ = await blob_service.acquire_blob(db, content_hash, size_bytes, staged_path)
+    db_file = File(
+        claim_id=claim_id,
+        filename=upload.filename,
+        storage_path=blob.storage_path,
+        mime_type=upload.content_type,
+        size_bytes=size_bytes,
+        content_hash=content_hash,
+        blob_id=blob.id,
+        extracted_text=blob.extracted_text,
+        extraction_status=blob.extraction_status
+    )
+    db.add(db_file)
+    extraction_task = None
+    if db_file.extraction_status == EXTRACTION_PENDING:
+        extraction_task = await task_service.enqueue(
+            db, EXTRACT_TEXT_TASK, {"blob_id": blob.id}, priority=EXTRACT_TEXT_PRIORITY, created_by_user_id=owner_user_id
+        )
+    await db.commit()
+    await db.refresh(db_file)
     
-    return extracted
+    return db_file, extraction_task
 
 
-def update_file_content(file: File, new_content: str) -> None:
+async def update_file_content(db: AsyncSession, file: File, new_content: str) -> None:
     """
     Update file content in storage.
-    For text files, writes the new content directly.
+    For text files, writes the new content as a new blob (copy-on-write, since
+    the old blob may be shared with other files) and keeps extracted_text in sync.
     TODO: Handle binary files and other formats.
     """
     # For now, assume we're updating text files
-    storage.write_text_file(new_content, file.storage_path)
+    content_bytes = new_content.encode('utf-8')
+    content_hash = hashlib.sha256(content_bytes).hexdigest()
+    if content_hash == file.content_hash:
+        return
+    
+    staged_path = f"uploads/{uuid.uuid4().hex}"
+    await storage.write(staged_path, content_bytes)
+    blob, created = await blob_service.acquire_blob(db, content_hash, len(content_bytes), staged_path)
+    new_blob_path = blob.storage_path if created else None
+    if blob.extraction_status != EXTRACTION_DONE:
+        blob.extracted_text = new_content
+        blob.extraction_status = EXTRACTION_DONE
+    
+    old_blob_id = file.blob_id
+    old_storage_path = file.storage_path
+    file.blob_id = blob.id
+    file.storage_path = blob.storage_path
+    file.extracted_text = new_content
+    file.extraction_status = EXTRACTION_DONE
+    file.size_bytes = len(content_bytes)
+    file.content_hash = content_hash
+    
+    if old_blob_id:
+        unreferenced_path = await blob_service.release_blob(db, old_blob_id)
+    else:
+        unreferenced_path = old_storage_path
+    try:
+        await db.commit()
+    except Exception:
+        # The new blob row was rolled back, so nothing references its bytes
+        await blob_service.delete_unreferenced(new_blob_path)
+        raise
+    await blob_service.delete_unreferenced(unreferenced_path)
 
 
-def get_files_by_claim(db: Session, claim_id: int) -> List[File]:
-    """Get all files for a claim."""
-    return db.query(File).filter(File.claim_id == claim_id).all()
+async def get_files_by_claim(
+    db: AsyncSession,
+    claim_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "desc",
+    mime_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None
+) -> Tuple[List[File], Optional[str]]:
+    """
+    Get one page of a claim's files (metadata only; extracted_text is not loaded).
+    
+    Filters: MIME type (exact, or a "type/" prefix such as "image/"), and
+    created_at in [created_after, created_before).
+    
+    Returns:
+        Tuple of (files, next_cursor)
+    """
+    stmt = select(File).where(File.claim_id == claim_id)
+    if mime_type:
+        if mime_type.endswith("/"):
+            stmt = stmt.where(File.mime_type.startswith(mime_type, autoescape=True))
+        else:
+            stmt = stmt.where(File.mime_type == mime_type)
+    if created_after:
+        stmt = stmt.where(File.created_at >= created_after)
+    if created_before:
+        stmt = stmt.where(File.created_at < created_before)
+    return await paginate(db, stmt, File, cursor, limit, order)
 
 
-def get_file(db: Session, file_id: int) -> Optional[File]:
+async def get_file(db: AsyncSession, file_id: int) -> Optional[File]:
     """Get a file by ID."""
-    return db.query(File).filter(File.id == file_id).first()
+    return (await db.execute(select(File).where(File.id == file_id))).scalar_one_or_none()
 
 
-def get_file_with_claim_check(db: Session, file_id: int, claim_id: int) -> Optional[File]:
-    """Get a file by ID and verify it belongs to the claim."""
-    file = get_file(db, file_id)
-    if file and file.claim_id == claim_id:
-        return file
-    return None
+async def get_file_with_claim_check(
+    db: AsyncSession,
+    file_id: int,
+    claim_id: int,
+    with_text: bool = False,
+    for_update: bool = False
+) -> Optional[File]:
+    """
+    Get a file by ID and verify it belongs to the claim, with its extracted text if `with_text`.
+    
+    `for_update` locks the row until the transaction ends.
+    """
+    stmt = select(File).where(File.id == file_id, File.claim_id == claim_id)
+    if with_text:
+        stmt = stmt.options(undefer(File.extracted_text))
+    if for_update:
+        stmt = stmt.with_for_update()
+    return (await db.execute(stmt)).scalar_one_or_none()
 
 
-def delete_file(db: Session, file: File) -> None:
-    """Delete a file from storage and database."""
-    # Delete from storage
-    try:
-        storage.delete_file(file.storage_path)
-    except FileNotFoundError:
-        # File doesn't exist in storage, continue with DB deletion
-        pass
+async def delete_file(db: AsyncSession, file: File) -> None:
+    """
+    Delete a file from the database, and from storage once nothing references it.
+    
+    Files backed by a shared blob only remove the blob when this was its last reference.
+    """
+    if file.blob_id:
+        unreferenced_path = await blob_service.release_blob(db, file.blob_id)
+    else:
+        # Stored before deduplication, so the bytes belong to this file alone
+        unreferenced_path = file.storage_path
     
     # Delete from database
-    db.delete(file)
-    db.commit()
-
+    await db.delete(file)
+    await db.commit()
+    
+    # Delete from storage only after the database change is committed
+    await blob_service.delete_unreferenced(unreferenced_path)
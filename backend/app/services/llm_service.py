@@ -0,0 +1,499 @@
+"""LLM service - process-wide OpenAI client with pooling, retries and rate limiting."""
+import asyncio
+import logging
+import random
+import time
+import uuid
+from collections import deque
+from typing import AsyncIterator, List, Optional, Tuple
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    RateLimitError,
+)
+from redis.exceptions import RedisError
+from app.core.config import settings
+from app.telemetry import metrics, record_llm_call
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket refilled continuously at `rate` tokens per second.
+
+    acquire() waits until the requested amount is available. Requests larger
+    than the bucket capacity are clamped so they can't wait forever.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        amount = min(amount, self.capacity)
+        # The lock makes waiters queue in order instead of all racing for each refill
+        async with self._lock:
+            self._refill()
+            while self._tokens < amount:
+                await asyncio.sleep((amount - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= amount
+
+
+# Seconds between a waiter's attempts to take a shared concurrency slot (jittered)
+SHARED_SLOT_POLL_SECONDS = 0.05
+
+# The Redis limiter scripts take the time from the server, so processes whose
+# clocks disagree still share one budget.
+
+# Reserves `amount` even when the bucket is short: the balance goes negative
+# and the caller waits out the returned debt (seconds). Callers in every
+# process are served in arrival order, in one round trip each.
+_BUCKET_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local rate, capacity, amount = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate) - amount
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+# Holders are scored by lease expiry; expired ones are dropped before counting
+_SLOT_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[1])
+redis.call('EXPIRE', KEYS[1], math.ceil(tonumber(ARGV[3])) + 60)
+return 1
+"""
+
+
+class RedisTokenBucket:
+    """
+    Token bucket shared by every process through Redis, like TokenBucket.
+
+    If Redis is unreachable, acquire() logs a warning and doesn't wait: the
+    calls are still bounded by the concurrency limit and retried on 429.
+    """
+
+    def __init__(self, client, key: str, rate: float, capacity: float):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+        self._script = client.register_script(_BUCKET_SCRIPT)
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        amount = min(amount, self.capacity)
+        try:
+            wait = float(await self._script(keys=[self.key], args=[self.rate, self.capacity, amount]))
+        except RedisError as e:
+            logger.warning("Shared LLM rate limit unavailable (%s: %s), not waiting", type(e).__name__, e)
+            return
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class RedisSemaphore:
+    """
+    Concurrency limit shared by every process through Redis.
+
+    Each slot is leased for `lease_seconds`, so slots held by a process that
+    died come back. Waiters poll, since Redis can't wake them. If Redis is
+    unreachable, acquire() logs a warning and returns None without a slot.
+    """
+
+    def __init__(self, client, key: str, limit: int, lease_seconds: float):
+        self.key = key
+        self.limit = limit
+        self.lease_seconds = lease_seconds
+        self._client = client
+        self._script = client.register_script(_SLOT_SCRIPT)
+
+    async def acquire(self) -> Optional[str]:
+        """Wait for a slot and return its holder id, to pass to release()."""
+        holder = uuid.uuid4().hex
+        try:
+            while not int(await self._script(keys=[self.key], args=[holder, self.limit, self.lease_seconds])):
+                await asyncio.sleep(random.uniform(0.5, 1.5) * SHARED_SLOT_POLL_SECONDS)
+        except RedisError as e:
+            logger.warning("Shared LLM concurrency limit unavailable (%s: %s), not waiting", type(e).__name__, e)
+            return None
+        return holder
+
+    async def release(self, holder: str) -> None:
+        try:
+            await self._client.zrem(self.key, holder)
+        except RedisError as e:
+            # The lease expires on its own
+            logger.warning("Could not release shared LLM slot (%s: %s)", type(e).__name__, e)
+
+
+class _Timings:
+    """Running count/total/max plus a window of recent samples for percentiles."""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent = deque(maxlen=window)
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def percentile(self, pct: float) -> float:
+        if not self._recent:
+            return 0.0
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_seconds": self.total / self.count if self.count else 0.0,
+            "p50_seconds": self.percentile(50),
+            "p95_seconds": self.percentile(95),
+            "max_seconds": self.max,
+        }
+
+
+def _usage_tokens(usage) -> Tuple[int, int]:
+    """(prompt, completion) tokens from a response's usage, or zeros if the server sent none."""
+    if usage is None:
+        return 0, 0
+    return getattr(usage, "prompt_tokens", 0) or 0, getattr(usage, "completion_tokens", 0) or 0
+
+
+class LLMClient:
+    """
+    Shared chat-completions and embeddings client.
+
+    Holds one AsyncOpenAI client on a keep-alive httpx connection pool, with
+    per-request timeouts. Calls are limited by a concurrency semaphore and
+    optional requests/tokens-per-minute buckets matching the provider's rate
+    limits, and are retried with jittered exponential backoff on 429, 5xx,
+    connection errors and timeouts.
+    
+    The limits are the account's. With LLM_LIMITER_BACKEND=redis every
+    process draws on them together; with the memory limiter each process
+    enforces 1/LLM_LIMITER_PROCESSES of them.
+    """
+
+    def __init__(self):
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=httpx.Timeout(
+                settings.LLM_TIMEOUT_SECONDS,
+                connect=settings.LLM_CONNECT_TIMEOUT_SECONDS,
+            ),
+        )
+        self._client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            http_client=self._http_client,
+            max_retries=0,  # Retries are handled here so they respect the limiter
+        )
+        self.limiter = settings.LLM_LIMITER_BACKEND
+        self.max_concurrency = settings.LLM_MAX_CONCURRENCY
+        requests_per_minute = settings.LLM_REQUESTS_PER_MINUTE
+        tokens_per_minute = settings.LLM_TOKENS_PER_MINUTE
+        self._redis = None
+        self._shared_slots = None
+        if self.limiter == "redis":
+            from redis.asyncio import Redis
+            self._redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            self._shared_slots = RedisSemaphore(
+                self._redis, f"{settings.CACHE_KEY_PREFIX}llm:slots",
+                self.max_concurrency, settings.LLM_SLOT_LEASE_SECONDS
+            )
+        elif self.limiter == "memory":
+            processes = max(1, settings.LLM_LIMITER_PROCESSES)
+            self.max_concurrency = max(1, self.max_concurrency // processes)
+            requests_per_minute /= processes
+            tokens_per_minute /= processes
+        else:
+            raise ValueError(f"Unknown LLM_LIMITER_BACKEND: {self.limiter}")
+        # Also bounds a process's own callers with the redis limiter, so they
+        # don't all poll for shared slots
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._request_bucket = self._bucket("requests", requests_per_minute)
+        self._token_bucket = self._bucket("tokens", tokens_per_minute)
+
+        self.in_flight = 0
+        self.waiting = 0
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.queue_wait = _Timings()
+        self.latency = _Timings()
+
+    def _bucket(self, name: str, per_minute: float):
+        """A rate limit of `per_minute` (None if 0), shared through Redis with the redis limiter."""
+        if per_minute <= 0:
+            return None
+        rate = per_minute / 60
+        capacity = max(1.0, rate * settings.LLM_BURST_SECONDS)
+        if self._redis is not None:
+            return RedisTokenBucket(self._redis, f"{settings.CACHE_KEY_PREFIX}llm:{name}", rate, capacity)
+        return TokenBucket(rate, capacity)
+
+    async def close(self) -> None:
+        await self._http_client.aclose()
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    def _estimate_tokens(self, texts: List[str], max_tokens: int = 0) -> int:
+        # Rough count (4 chars per token) is enough for pacing against TPM limits
+        return sum(len(text or "") for text in texts) // 4 + max_tokens
+
+    async def _acquire(self, estimated_tokens: int) -> Optional[str]:
+        """
+        Wait for a concurrency slot and rate-limit budget, recording the wait.
+        
+        Returns the shared slot (redis limiter) to pass to _release().
+        """
+        started = time.monotonic()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+            slot = None
+            try:
+                if self._shared_slots is not None:
+                    slot = await self._shared_slots.acquire()
+                if self._request_bucket is not None:
+                    await self._request_bucket.acquire(1)
+                if self._token_bucket is not None:
+                    await self._token_bucket.acquire(estimated_tokens)
+            except BaseException:
+                self._semaphore.release()
+                if slot is not None:
+                    await self._shared_slots.release(slot)
+                raise
+        finally:
+            self.waiting -= 1
+        self.queue_wait.add(time.monotonic() - started)
+        self.in_flight += 1
+        return slot
+
+    async def _release(self, slot: Optional[str]) -> None:
+        self.in_flight -= 1
+        self._semaphore.release()
+        if slot is not None:
+            await self._shared_slots.release(slot)
+
+    def _retry_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """Seconds to wait before retrying `error`, or None if it shouldn't be retried."""
+        if attempt >= settings.LLM_MAX_RETRIES:
+            return None
+        if isinstance(error, APIStatusError):
+            if not (isinstance(error, RateLimitError) or error.status_code >= 500):
+                return None
+            retry_after = error.response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), settings.LLM_RETRY_MAX_DELAY_SECONDS)
+                except ValueError:
+                    pass
+        elif not isinstance(error, (APIConnectionError, APITimeoutError)):
+            return None
+        # Full jitter keeps a burst of failed callers from retrying in lockstep
+        ceiling = min(settings.LLM_RETRY_MAX_DELAY_SECONDS, settings.LLM_RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+        return random.uniform(0, ceiling)
+
+    async def chat(
+        self,
+        messages: List[dict],
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> str:
+        """Run a chat completion and return the message content."""
+        attempt = 0
+        while True:
+            slot = await self._acquire(self._estimate_tokens([m.get("content") for m in messages], max_tokens))
+            started = time.monotonic()
+            self.requests += 1
+            try:
+                response = await self._client.chat.completions.create(
+                    model=model or settings.OPENAI_MODEL,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+                elapsed = time.monotonic() - started
+                self.latency.add(elapsed)
+                record_llm_call("chat", elapsed, *_usage_tokens(response.usage))
+                return response.choices[0].message.content or ""
+            except Exception as e:
+                self.failures += 1
+                record_llm_call("chat", time.monotonic() - started, ok=False)
+                error = e
+                delay = self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+            finally:
+                await self._release(slot)
+            logger.warning("LLM call failed (%s), retrying in %.2fs", type(error).__name__, delay)
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def chat_stream(
+        self,
+        messages: List[dict],
+        model: Optional[str] = None,
+        temperature: float = 0.3,
+        max_tokens: int = 2000
+    ) -> AsyncIterator[str]:
+        """
+        Run a streaming chat completion, yielding content deltas.
+
+        The concurrency slot is held until the stream ends. Failures are only
+        retried before the first delta has been yielded.
+        """
+        attempt = 0
+        while True:
+            slot = await self._acquire(self._estimate_tokens([m.get("content") for m in messages], max_tokens))
+            started = time.monotonic()
+            self.requests += 1
+            yielded = False
+            usage = None
+            try:
+                stream = await self._client.chat.completions.create(
+                    model=model or settings.OPENAI_MODEL,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    stream=True,
+                    # Token counts arrive in a final chunk without choices
+                    stream_options={"include_usage": True}
+                )
+                async for chunk in stream:
+                    if chunk.usage is not None:
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    token = chunk.choices[0].delta.content
+                    if token:
+                        yielded = True
+                        yield token
+                elapsed = time.monotonic() - started
+                self.latency.add(elapsed)
+                record_llm_call("chat_stream", elapsed, *_usage_tokens(usage))
+                return
+            except Exception as e:
+                self.failures += 1
+                record_llm_call("chat_stream", time.monotonic() - started, ok=False)
+                error = e
+                delay = None if yielded else self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+            finally:
+                await self._release(slot)
+            logger.warning("LLM stream failed (%s), retrying in %.2fs", type(error).__name__, delay)
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def embed(self, texts: List[str], model: str, dimensions: Optional[int] = None) -> List[List[float]]:
+        """Embed a batch of texts, returning one vector per text in order."""
+        attempt = 0
+        while True:
+            slot = await self._acquire(self._estimate_tokens(texts))
+            started = time.monotonic()
+            self.requests += 1
+            try:
+                kwargs = {"dimensions": dimensions} if dimensions else {}
+                response = await self._client.embeddings.create(model=model, input=texts, **kwargs)
+                elapsed = time.monotonic() - started
+                self.latency.add(elapsed)
+                record_llm_call("embedding", elapsed, *_usage_tokens(response.usage))
+                return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+            except Exception as e:
+                self.failures += 1
+                record_llm_call("embedding", time.monotonic() - started, ok=False)
+                error = e
+                delay = self._retry_delay(attempt, e)
+                if delay is None:
+                    raise
+            finally:
+                await self._release(slot)
+            logger.warning("Embedding call failed (%s), retrying in %.2fs", type(error).__name__, delay)
+            self.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def get_metrics(self) -> dict:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "limiter": self.limiter,
+            "max_concurrency": self.max_concurrency,
+            "queue_wait": self.queue_wait.snapshot(),
+            "latency": self.latency.snapshot(),
+        }
+
+
+_client: Optional[LLMClient] = None
+
+
+def get_llm_client() -> LLMClient:
+    """Get the process-wide LLM client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = LLMClient()
+    return _client
+
+
+async def close_llm_client() -> None:
+    """Close the LLM client's connection pool (called on app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+
+
+def get_llm_metrics() -> dict:
+    """Queue wait, latency and retry metrics for the shared LLM client."""
+    return get_llm_client().get_metrics()
+
+
+metrics.gauge(
+    "llm_requests_in_flight", "LLM API calls holding a concurrency slot.",
+    collect=lambda: _client.in_flight if _client is not None else 0
+)
+metrics.gauge(
+    "llm_requests_waiting", "LLM API calls waiting for a concurrency slot or rate limit budget.",
+    collect=lambda: _client.waiting if _client is not None else 0
+)
@@ -0,0 +1,166 @@
+"""Proposal service - server-side storage and acceptance of agent proposals."""
+import asyncio
+import hashlib
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, exists, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, undefer
+from sqlalchemy.sql import func
+from typing import List, Optional
+from app.core.config import settings
+from app.models.proposal import Proposal, PROPOSAL_ACCEPTED, PROPOSAL_PENDING
+from app.schemas.agent import ProposalDraft
+from app.services import delta_service, diff_service
+
+# Proposals deleted per statement (and transaction) when pruning
+PRUNE_BATCH_SIZE = 500
+
+
+class ProposalConflictError(Exception):
+    """The proposal can't be applied: its target changed since it was made, or it was already accepted."""
+
+
+def content_hash(content: str) -> str:
+    """SHA-256 of a text, as stored in Proposal.base_hash."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _encode(draft: ProposalDraft) -> tuple:
+    """Diff and delta for a draft; CPU-bound on large documents."""
+    if draft.type == "artifact":
+        old_name, new_name = "current_summary", "proposed_summary"
+    else:
+        old_name = new_name = draft.target_name
+    diff = diff_service.compute_diff(draft.old_content, draft.new_content, old_name, new_name)
+    return diff, delta_service.encode_delta(draft.old_content, draft.new_content)
+
+
+async def create_proposals(
+    db: AsyncSession,
+    claim_id: int,
+    drafts: List[ProposalDraft],
+    created_by_user_id: Optional[int] = None
+) -> List[Proposal]:
+    """
+    Store the agent's drafts as proposals, in one transaction.
+
+    Only the diff (for display) and a delta against the old content are kept.
+    base_hash records the content the change was made against, so accepting
+    can refuse to overwrite anything changed in the meantime.
+    """
+    proposals = []
+    for draft in drafts:
+        diff, delta = await asyncio.to_thread(_encode, draft)
+        proposal = Proposal(
+            claim_id=claim_id,
+            type=draft.type,
+            target_id=draft.target_id,
+            target_name=draft.target_name,
+            base_hash=content_hash(draft.old_content),
+            delta=delta,
+            hunks=diff["hunks"],
+            diff_stats=diff["stats"],
+            source_files=[source_file.model_dump() for source_file in draft.source_files] if draft.source_files is not None else None,
+            context_report=draft.context_report.model_dump() if draft.context_report else None,
+            created_by_user_id=created_by_user_id
+        )
+        db.add(proposal)
+        proposals.append(proposal)
+    await db.commit()
+    return proposals
+
+
+async def get_proposal(db: AsyncSession, proposal_id: int, claim_id: int, with_delta: bool = False) -> Optional[Proposal]:
+    """Get a proposal of the claim, with its hunks (and its delta, for accepting)."""
+    options = [undefer(Proposal.hunks)]
+    if with_delta:
+        options.append(undefer(Proposal.delta))
+    result = await db.execute(
+        select(Proposal).options(*options).where(Proposal.id == proposal_id, Proposal.claim_id == claim_id)
+    )
+    return result.scalar_one_or_none()
+
+
+def apply_proposal(proposal: Proposal, current_content: str) -> str:
+    """
+    Return the proposed content, applied to the target's current content.
+
+    Raises:
+        ProposalConflictError: If the proposal was accepted already, or the
+            target no longer has the content the proposal was made against
+    """
+    if proposal.status != PROPOSAL_PENDING:
+        raise ProposalConflictError(f"Proposal {proposal.id} was already {proposal.status}")
+    if content_hash(current_content) != proposal.base_hash:
+        raise ProposalConflictError(
+            f"'{proposal.target_name}' has changed since this proposal was made. Generate a new proposal."
+        )
+    return delta_service.apply_delta(current_content, proposal.delta)
+
+
+async def mark_accepted(db: AsyncSession, proposal: Proposal) -> None:
+    """
+    Mark a proposal accepted; committed together with the change it made.
+
+    The status only moves from pending, so when one proposal is accepted twice
+    concurrently the second UPDATE waits for the first and then matches no row.
+    Call it before writing the change, so the loser writes nothing.
+
+    Raises:
+        ProposalConflictError: If the proposal is no longer pending
+    """
+    result = await db.execute(
+        update(Proposal)
+        .where(Proposal.id == proposal.id, Proposal.status == PROPOSAL_PENDING)
+        .values(status=PROPOSAL_ACCEPTED, accepted_at=func.now())
+    )
+    if result.rowcount == 0:
+        raise ProposalConflictError(f"Proposal {proposal.id} was already accepted or has expired")
+
+
+async def prune_proposals(db: AsyncSession, batch_size: int = PRUNE_BATCH_SIZE) -> int:
+    """
+    Delete pending proposals that will never be accepted, in batches. Commits.
+
+    A pending proposal goes once it is PROPOSAL_RETENTION_DAYS old, or as soon
+    as a newer proposal for the same file or artifact has been accepted: its
+    target changed, so accepting it would be refused as stale anyway.
+    Accepted proposals are kept, since artifact versions refer to them.
+    Idempotent, so any number of workers may run it.
+
+    Returns:
+        Number of proposals deleted
+    """
+    newer = aliased(Proposal)
+    expired = [exists().where(
+        newer.claim_id == Proposal.claim_id,
+        newer.type == Proposal.type,
+        newer.target_id == Proposal.target_id,
+        newer.status == PROPOSAL_ACCEPTED,
+        newer.id > Proposal.id
+    )]
+    if settings.PROPOSAL_RETENTION_DAYS > 0:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.PROPOSAL_RETENTION_DAYS)
+        expired.append(Proposal.created_at < cutoff)
+
+    deleted = 0
+    while True:
+        ids = list((await db.execute(
+            select(Proposal.id)
+            .where(Proposal.status == PROPOSAL_PENDING, or_(*expired))
+            .order_by(Proposal.id)
+            .limit(batch_size)
+        )).scalars().all())
+        if not ids:
+            break
+        # Re-checked in the DELETE: one may have been accepted since
+        result = await db.execute(
+            delete(Proposal)
+            .where(Proposal.id.in_(ids), Proposal.status == PROPOSAL_PENDING)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        deleted += result.rowcount
+        if len(ids) < batch_size:
+            break
+    return deleted
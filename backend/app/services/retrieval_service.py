@@ -0,0 +1,73 @@
+"""Retrieval service - picks the chunks of a claim's documents relevant to a request."""
+import logging
+from typing import List, Optional
+from app.core.config import settings
+from app.embeddings import top_k, vector_index
+from app.services import token_service
+
+logger = logging.getLogger(__name__)
+
+EXCERPT_SEPARATOR = "\n\n[...]\n\n"
+
+
+def chunk_files(file_contents: dict) -> List[dict]:
+    """Split every file into retrieval-sized chunks, in file id then document order."""
+    chunks = []
+    for file_id in sorted(file_contents):
+        file_data = file_contents[file_id]
+        parts = token_service.chunk_text(
+            file_data['content'],
+            settings.RETRIEVAL_CHUNK_TOKENS,
+            settings.RETRIEVAL_CHUNK_OVERLAP_TOKENS
+        )
+        for index, text in enumerate(parts):
+            chunks.append({
+                'file_id': file_id,
+                'filename': file_data['file'].filename,
+                'index': index,
+                'text': text
+            })
+    return chunks
+
+
+async def retrieve(file_contents: dict, query: str, k: Optional[int] = None) -> List[dict]:
+    """
+    Return the `k` chunks most similar to `query`, best first, each with a 'score'.
+
+    Chunk embeddings come from the vector index, so each distinct chunk text is
+    embedded only once, ever; a request costs one query embedding plus a
+    matrix product over the claim's chunks.
+    """
+    chunks = chunk_files(file_contents)
+    if not chunks:
+        return []
+    k = k or settings.RETRIEVAL_TOP_K
+    vectors = await vector_index.embed([chunk['text'] for chunk in chunks])
+    query_vector = await vector_index.embedder.embed([query])
+    indices, scores = top_k(query_vector, vectors, k)
+    logger.debug(
+        "Retrieval: %d of %d chunks from %d files", len(indices[0]), len(chunks), len(file_contents),
+        extra={"retrieved_chunks": len(indices[0]), "chunks": len(chunks), "files": len(file_contents)}
+    )
+    return [{**chunks[i], 'score': float(score)} for i, score in zip(indices[0], scores[0])]
+
+
+def excerpt_contents(file_contents: dict, chunks: List[dict]) -> dict:
+    """
+    Rebuild file_contents from retrieved chunks only.
+
+    Each file that had a chunk retrieved keeps just those chunks, in document
+    order, joined by an elision marker; other files are left out.
+    """
+    by_file = {}
+    for chunk in chunks:
+        by_file.setdefault(chunk['file_id'], []).append(chunk)
+    return {
+        file_id: {
+            **file_contents[file_id],
+            'content': EXCERPT_SEPARATOR.join(
+                chunk['text'].strip() for chunk in sorted(by_file[file_id], key=lambda chunk: chunk['index'])
+            )
+        }
+        for file_id in sorted(by_file)
+    }
@@ -0,0 +1,188 @@
+"""Search service - full-text search over file text and artifact versions."""
+import re
+from typing import List, Optional, Sequence, Tuple
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Postgres keeps a generated tsvector column (with a GIN index) on files and
+# artifact_versions, so the index follows every insert, update and delete with
+# no application code. SQLite (tests, local runs) uses FTS5 external-content
+# tables kept in sync by triggers; the same DDL is applied by the migration.
+SQLITE_FTS_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5("
+    "filename, extracted_text, content='files', content_rowid='id', tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS files_fts_ai AFTER INSERT ON files BEGIN
+        INSERT INTO files_fts(rowid, filename, extracted_text) VALUES (new.id, new.filename, new.extracted_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS files_fts_ad AFTER DELETE ON files BEGIN
+        INSERT INTO files_fts(files_fts, rowid, filename, extracted_text)
+        VALUES ('delete', old.id, old.filename, old.extracted_text);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS files_fts_au AFTER UPDATE OF filename, extracted_text ON files BEGIN
+        INSERT INTO files_fts(files_fts, rowid, filename, extracted_text)
+        VALUES ('delete', old.id, old.filename, old.extracted_text);
+        INSERT INTO files_fts(rowid, filename, extracted_text) VALUES (new.id, new.filename, new.extracted_text);
+    END""",
+    # Delta versions have no content; they are indexed on their search_text
+    "CREATE VIEW IF NOT EXISTS artifact_versions_search AS "
+    "SELECT id, coalesce(content, search_text) AS content FROM artifact_versions",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS artifact_versions_fts USING fts5("
+    "content, content='artifact_versions_search', content_rowid='id', tokenize='porter unicode61')",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ai AFTER INSERT ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, coalesce(new.content, new.search_text));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_ad AFTER DELETE ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content)
+        VALUES ('delete', old.id, coalesce(old.content, old.search_text));
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS artifact_versions_fts_au AFTER UPDATE OF content, search_text ON artifact_versions BEGIN
+        INSERT INTO artifact_versions_fts(artifact_versions_fts, rowid, content)
+        VALUES ('delete', old.id, coalesce(old.content, old.search_text));
+        INSERT INTO artifact_versions_fts(rowid, content) VALUES (new.id, coalesce(new.content, new.search_text));
+    END""",
+]
+
+DOC_TYPE_FILE = "file"
+DOC_TYPE_ARTIFACT_VERSION = "artifact_version"
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# ts_headline re-parses the whole document, so snippets only look at the start of very long texts
+SNIPPET_SOURCE_MAX_CHARS = 100000
+
+_FTS_TERM_PATTERN = re.compile(r'"([^"]+)"|(\w+)')
+
+
+def create_sqlite_index(connection) -> None:
+    """
+    Create the SQLite FTS5 index and its triggers on a sync connection.
+
+    For databases built with metadata.create_all() (tests, benchmarks) rather
+    than migrations, e.g. `await conn.run_sync(search_service.create_sqlite_index)`.
+    Rebuilds the index from existing rows.
+    """
+    for statement in SQLITE_FTS_SCHEMA:
+        connection.exec_driver_sql(statement)
+    connection.exec_driver_sql("INSERT INTO files_fts(files_fts) VALUES ('rebuild')")
+    connection.exec_driver_sql("INSERT INTO artifact_versions_fts(artifact_versions_fts) VALUES ('rebuild')")
+
+
+def _fts5_query(query: str) -> str:
+    """
+    Translate a search string into an FTS5 MATCH expression.
+
+    Words and "quoted phrases" are all required, matching how websearch_to_tsquery
+    treats plain input on Postgres. Everything is quoted so user input can't
+    inject FTS5 syntax.
+    """
+    terms = []
+    for phrase, word in _FTS_TERM_PATTERN.findall(query):
+        term = phrase or word
+        terms.append('"' + term.replace('"', '""') + '"')
+    return " ".join(terms)
+
+
+def _postgres_search_sql(claim_filter: bool, doc_types: Sequence[str], all_versions: bool) -> str:
+    selects = []
+    if DOC_TYPE_FILE in doc_types:
+        selects.append(f"""
+            SELECT 'file' AS type, f.id AS id, f.claim_id AS claim_id, f.filename AS title,
+                   NULL::integer AS artifact_id, ts_rank_cd(f.search_vector, q.query, 33) AS rank
+            FROM files f JOIN claims c ON c.id = f.claim_id, q
+            WHERE f.search_vector @@ q.query AND c.owner_user_id = :user_id
+            {"AND f.claim_id = :claim_id" if claim_filter else ""}""")
+    if DOC_TYPE_ARTIFACT_VERSION in doc_types:
+        selects.append(f"""
+            SELECT 'artifact_version' AS type, v.id AS id, a.claim_id AS claim_id, a.title AS title,
+                   a.id AS artifact_id, ts_rank_cd(v.search_vector, q.query, 33) AS rank
+            FROM artifact_versions v JOIN artifacts a ON a.id = v.artifact_id
+                 JOIN claims c ON c.id = a.claim_id, q
+            WHERE v.search_vector @@ q.query AND c.owner_user_id = :user_id
+            {"" if all_versions else "AND a.current_version_id = v.id"}
+            {"AND a.claim_id = :claim_id" if claim_filter else ""}""")
+
+    # Rank every match via the GIN index, but build highlighted snippets
+    # (the expensive part) only for the requested page
+    return f"""
+        WITH q AS (SELECT websearch_to_tsquery('english', :query) AS query),
+        hits AS ({" UNION ALL ".join(selects)}),
+        page AS (SELECT * FROM hits ORDER BY rank DESC, type, id DESC LIMIT :limit OFFSET :offset)
+        SELECT page.type, page.id, page.claim_id, page.title, page.artifact_id, page.rank,
+               ts_headline('english', left(coalesce(f.extracted_text, v.content, v.search_text, ''), {SNIPPET_SOURCE_MAX_CHARS}),
+                           q.query, :headline_options) AS snippet
+        FROM page CROSS JOIN q
+        LEFT JOIN files f ON page.type = 'file' AND f.id = page.id
+        LEFT JOIN artifact_versions v ON page.type = 'artifact_version' AND v.id = page.id
+        ORDER BY page.rank DESC, page.type, page.id DESC
+    """
+
+
+def _sqlite_search_sql(claim_filter: bool, doc_types: Sequence[str], all_versions: bool) -> str:
+    selects = []
+    if DOC_TYPE_FILE in doc_types:
+        selects.append(f"""
+            SELECT 'file' AS type, f.id AS id, f.claim_id AS claim_id, f.filename AS title,
+                   NULL AS artifact_id, -bm25(files_fts, 10.0, 1.0) AS rank,
+                   coalesce(snippet(files_fts, 1, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 24), '') AS snippet
+            FROM files_fts JOIN files f ON f.id = files_fts.rowid JOIN claims c ON c.id = f.claim_id
+            WHERE files_fts MATCH :query AND c.owner_user_id = :user_id
+            {"AND f.claim_id = :claim_id" if claim_filter else ""}""")
+    if DOC_TYPE_ARTIFACT_VERSION in doc_types:
+        selects.append(f"""
+            SELECT 'artifact_version' AS type, v.id AS id, a.claim_id AS claim_id, a.title AS title,
+                   a.id AS artifact_id, -bm25(artifact_versions_fts) AS rank,
+                   coalesce(snippet(artifact_versions_fts, 0, '{HIGHLIGHT_START}', '{HIGHLIGHT_END}', '…', 24), '') AS snippet
+            FROM artifact_versions_fts JOIN artifact_versions v ON v.id = artifact_versions_fts.rowid
+                 JOIN artifacts a ON a.id = v.artifact_id JOIN claims c ON c.id = a.claim_id
+            WHERE artifact_versions_fts MATCH :query AND c.owner_user_id = :user_id
+            {"" if all_versions else "AND a.current_version_id = v.id"}
+            {"AND a.claim_id = :claim_id" if claim_filter else ""}""")
+    return f"""
+        SELECT * FROM ({" UNION ALL ".join(selects)})
+        ORDER BY rank DESC, type, id DESC LIMIT :limit OFFSET :offset
+    """
+
+
+async def search(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    claim_id: Optional[int] = None,
+    doc_types: Sequence[str] = (DOC_TYPE_FILE, DOC_TYPE_ARTIFACT_VERSION),
+    all_versions: bool = False,
+    limit: int = 20,
+    offset: int = 0
+) -> Tuple[List[dict], bool]:
+    """
+    Ranked full-text search over a user's file text and artifact versions.
+
+    Searches one claim when `claim_id` is given, otherwise all of the user's
+    claims. Artifact matches are limited to current versions unless
+    `all_versions` is set. Snippets mark matches with <mark>...</mark>.
+
+    Returns:
+        Tuple of (hits, has_more)
+    """
+    dialect = db.bind.dialect.name
+    params = {"user_id": user_id, "limit": limit + 1, "offset": offset}
+    if claim_id is not None:
+        params["claim_id"] = claim_id
+
+    if dialect == "postgresql":
+        sql = _postgres_search_sql(claim_id is not None, doc_types, all_versions)
+        params["query"] = query
+        params["headline_options"] = (
+            f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, "
+            "MaxFragments=2, MaxWords=30, MinWords=10, FragmentDelimiter=\" … \""
+        )
+    elif dialect == "sqlite":
+        sql = _sqlite_search_sql(claim_id is not None, doc_types, all_versions)
+        params["query"] = _fts5_query(query)
+    else:
+        raise ValueError(f"Full-text search is not supported on {dialect}")
+
+    if not doc_types or not params["query"]:
+        return [], False
+
+    rows = (await db.execute(text(sql), params)).mappings().all()
+    hits = [dict(row) for row in rows[:limit]]
+    return hits, len(rows) > limit
@@ -0,0 +1,258 @@
+"""Summary job service - regenerates the summaries of many claims on the task queue."""
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Union
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.pagination import DEFAULT_PAGE_SIZE, SortOrder, paginate
+from app.models.claim import Claim
+from app.models.summary_job import SummaryJob, JOB_PENDING, JOB_RUNNING, JOB_COMPLETED
+from app.models.summary_job_item import (
+    SummaryJobItem, ITEM_PENDING, ITEM_RUNNING, ITEM_PROPOSED, ITEM_UNCHANGED, ITEM_FAILED
+)
+from app.models.task import Task
+from app.schemas.summary_job import SummaryJobCreate
+from app.services import agent_service, claim_service, proposal_service, task_service
+from app.telemetry import annotate
+
+# Task queue kind for run_item_task; one task per job item
+SUMMARIZE_CLAIM_TASK = "summarize_claim"
+
+# Items read per query when streaming a job's results
+WATCH_BATCH_SIZE = 200
+
+# SummaryJob counter incremented for each item outcome
+_OUTCOME_COUNTERS = {ITEM_PROPOSED: "proposed", ITEM_UNCHANGED: "unchanged", ITEM_FAILED: "failed"}
+
+_listeners: Dict[int, Set[asyncio.Event]] = {}  # Event streams following each job
+
+
+def _notify(job_id: int) -> None:
+    for wakeup in _listeners.get(job_id, ()):
+        wakeup.set()
+
+
+async def create_job(db: AsyncSession, job_data: SummaryJobCreate, owner_user_id: int) -> Optional[SummaryJob]:
+    """
+    Create a summary job over the user's claims matching the request.
+
+    Requested claim ids that don't exist or belong to someone else are
+    skipped. Each claim is queued as a task in the same transaction; call
+    task_service.notify_workers after this returns to start them right away.
+
+    Returns:
+        The job, or None if no claim matched
+    """
+    stmt = select(Claim.id).where(Claim.owner_user_id == owner_user_id)
+    if job_data.reference_prefix:
+        stmt = stmt.where(Claim.reference_number.startswith(job_data.reference_prefix, autoescape=True))
+    if job_data.created_after:
+        stmt = stmt.where(Claim.created_at >= job_data.created_after)
+    if job_data.created_before:
+        stmt = stmt.where(Claim.created_at < job_data.created_before)
+    claim_ids = list((await db.execute(stmt.order_by(Claim.id))).scalars().all())
+    if job_data.claim_ids is not None:
+        # Intersect here rather than in SQL, so huge id lists don't hit bind parameter limits
+        requested = set(job_data.claim_ids)
+        claim_ids = [claim_id for claim_id in claim_ids if claim_id in requested]
+    if not claim_ids:
+        return None
+
+    job = SummaryJob(
+        created_by_user_id=owner_user_id,
+        claim_filter=job_data.model_dump(mode="json", exclude_none=True),
+        total=len(claim_ids)
+    )
+    db.add(job)
+    await db.flush()
+    item_ids = (await db.execute(
+        insert(SummaryJobItem).returning(SummaryJobItem.id, sort_by_parameter_order=True),
+        [{"job_id": job.id, "claim_id": claim_id} for claim_id in claim_ids]
+    )).scalars().all()
+    await task_service.enqueue_many(
+        db, SUMMARIZE_CLAIM_TASK, ({"item_id": item_id} for item_id in item_ids), created_by_user_id=owner_user_id
+    )
+    await db.commit()
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: int, owner_user_id: int) -> Optional[SummaryJob]:
+    """Get a summary job, verifying ownership."""
+    result = await db.execute(
+        select(SummaryJob).where(SummaryJob.id == job_id, SummaryJob.created_by_user_id == owner_user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_jobs(
+    db: AsyncSession,
+    owner_user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "desc"
+) -> Tuple[List[SummaryJob], Optional[str]]:
+    """
+    Get one page of a user's summary jobs, newest first by default.
+
+    Returns:
+        Tuple of (jobs, next_cursor)
+    """
+    stmt = select(SummaryJob).where(SummaryJob.created_by_user_id == owner_user_id)
+    return await paginate(db, stmt, SummaryJob, cursor, limit, order)
+
+
+async def get_job_items(
+    db: AsyncSession,
+    job_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "asc",
+    status: Optional[str] = None
+) -> Tuple[List[SummaryJobItem], Optional[str]]:
+    """
+    Get one page of a job's items, in claim order by default, optionally by status.
+
+    Returns:
+        Tuple of (items, next_cursor)
+    """
+    stmt = select(SummaryJobItem).where(SummaryJobItem.job_id == job_id)
+    if status:
+        stmt = stmt.where(SummaryJobItem.status == status)
+    return await paginate(db, stmt, SummaryJobItem, cursor, limit, order)
+
+
+async def run_item_task(task: Task) -> Optional[dict]:
+    """
+    Task queue handler for SUMMARIZE_CLAIM_TASK (payload: item_id): summarize
+    one claim of a job and record the outcome.
+
+    A changed summary is stored as a pending proposal, to be reviewed and
+    accepted like any other. If the claim's files haven't changed since its
+    current summary, nothing is stored. Generation errors are raised for the
+    queue to retry with backoff; on the task's final attempt they are
+    recorded as the item's failure instead. The job completes with the
+    outcome of its last item.
+    """
+    final_attempt = task.attempts >= task.max_attempts
+    async with AsyncSessionLocal() as db:
+        # Take the item; running means an earlier attempt broke off before recording it
+        row = (await db.execute(
+            update(SummaryJobItem)
+            .where(SummaryJobItem.id == task.payload["item_id"], SummaryJobItem.status.in_([ITEM_PENDING, ITEM_RUNNING]))
+            .values(status=ITEM_RUNNING, attempts=SummaryJobItem.attempts + 1, started_at=func.now())
+            .returning(SummaryJobItem.job_id, SummaryJobItem.claim_id)
+            .execution_options(synchronize_session=False)
+        )).first()
+        if row is None:
+            # Already recorded by an earlier attempt
+            await db.commit()
+            return None
+        job_id, claim_id = row
+        # Tags the task's log line, so slow claims can be found
+        annotate(job_id=job_id, claim_id=claim_id)
+        await db.execute(
+            update(SummaryJob)
+            .where(SummaryJob.id == job_id, SummaryJob.status == JOB_PENDING)
+            .values(status=JOB_RUNNING, started_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        claim = await claim_service.get_claim_context(db, claim_id, task.created_by_user_id, with_file_text=True)
+        # End the transaction so the connection goes back to the pool during
+        # the LLM calls; the loaded claim stays usable
+        await db.commit()
+
+        proposal_id = None
+        error = None
+        if not claim:
+            status, error = ITEM_FAILED, "Claim not found"
+        else:
+            try:
+                [draft] = await agent_service.generate_summary_proposal(claim)
+                if draft.new_content == draft.old_content:
+                    status = ITEM_UNCHANGED
+                else:
+                    [proposal] = await proposal_service.create_proposals(db, claim_id, [draft], task.created_by_user_id)
+                    status, proposal_id = ITEM_PROPOSED, proposal.id
+            except Exception as e:
+                await db.rollback()
+                if not final_attempt:
+                    raise
+                status, error = ITEM_FAILED, f"{type(e).__name__}: {e}"[:500]
+
+        # The job row lock orders concurrent finishes, so sequence numbers follow commit order
+        counter = _OUTCOME_COUNTERS[status]
+        sequence, total = (await db.execute(
+            update(SummaryJob)
+            .where(SummaryJob.id == job_id)
+            .values({"processed": SummaryJob.processed + 1, counter: getattr(SummaryJob, counter) + 1})
+            .returning(SummaryJob.processed, SummaryJob.total)
+            .execution_options(synchronize_session=False)
+        )).one()
+        await db.execute(
+            update(SummaryJobItem)
+            .where(SummaryJobItem.id == task.payload["item_id"])
+            .values(status=status, proposal_id=proposal_id, error=error, sequence=sequence, finished_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        if sequence >= total:
+            await db.execute(
+                update(SummaryJob)
+                .where(SummaryJob.id == job_id)
+                .values(status=JOB_COMPLETED, finished_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+    _notify(job_id)
+    return {"status": status, "proposal_id": proposal_id}
+
+
+async def watch_job(job_id: int, after: int = 0) -> AsyncIterator[Tuple[str, Union[SummaryJob, SummaryJobItem]]]:
+    """
+    Follow a job's results as they complete.
+
+    Yields ("item", SummaryJobItem) for each finished item with a sequence
+    number above `after`, in completion order, and ("job", SummaryJob) with
+    the progress counters after each batch of items. Ends once the job has
+    completed. Wakes up when a worker in this process finishes an item, and
+    polls every SUMMARY_JOB_POLL_SECONDS for workers in other processes. No
+    database connection is held between batches.
+    """
+    wakeup = asyncio.Event()
+    _listeners.setdefault(job_id, set()).add(wakeup)
+    try:
+        first = True
+        while True:
+            wakeup.clear()
+            async with AsyncSessionLocal() as db:
+                # Read the job first: if it is completed, every item already has its sequence
+                job = (await db.execute(select(SummaryJob).where(SummaryJob.id == job_id))).scalar_one_or_none()
+                if not job:
+                    return
+                items = list((await db.execute(
+                    select(SummaryJobItem)
+                    .where(SummaryJobItem.job_id == job_id, SummaryJobItem.sequence > after)
+                    .order_by(SummaryJobItem.sequence)
+                    .limit(WATCH_BATCH_SIZE)
+                )).scalars().all())
+            for item in items:
+                yield "item", item
+                after = item.sequence
+            if items or first or job.status == JOB_COMPLETED:
+                yield "job", job
+            first = False
+            if len(items) == WATCH_BATCH_SIZE:
+                continue
+            if job.status == JOB_COMPLETED:
+                return
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=settings.SUMMARY_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        listeners = _listeners.get(job_id)
+        if listeners is not None:
+            listeners.discard(wakeup)
+            if not listeners:
+                del _listeners[job_id]
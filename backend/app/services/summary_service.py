@@ -0,0 +1,173 @@
+"""Summary service - hierarchical (map-reduce) summarization for large claims."""
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, List
+from app.cache import cache
+from app.core.config import settings
+from app.services import token_service
+from app.services.llm_service import get_llm_client
+
+logger = logging.getLogger(__name__)
+
+MAP_SYSTEM_PROMPT = """You are an expert at analyzing claim documents.
+You will be given one section of a document from an insurance claim.
+Extract every fact that could matter for the claim: dates, amounts, parties,
+policy and reference numbers, events, damages, and any inconsistencies.
+Respond with concise markdown bullet points. Do not add information that is not in the text."""
+
+REDUCE_SYSTEM_PROMPT = """You are an expert at analyzing claim documents.
+You will be given notes taken from several sections of an insurance claim's documents.
+Merge them into one set of concise markdown bullet points. Keep every distinct fact,
+date, amount and party, note which file each came from, and remove duplicates."""
+
+# Bump when the map/reduce prompt wording changes so cached partial summaries are not reused
+MAP_REDUCE_PROMPT_VERSION = 1
+
+_chunk_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _hash(*parts) -> str:
+    return hashlib.sha256(json.dumps(parts, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+async def _cached(cache_key: str, compute: Callable[[], Awaitable[str]]) -> str:
+    """Return the cached value for `cache_key`, computing and storing it on a miss."""
+    try:
+        cached = await cache.get(cache_key)
+    except Exception as e:
+        logger.warning("Summary cache lookup failed: %s: %s", type(e).__name__, e)
+        cached = None
+    if cached is not None:
+        _chunk_cache_stats["hits"] += 1
+        return cached
+
+    _chunk_cache_stats["misses"] += 1
+    value = await compute()
+    try:
+        await cache.set(cache_key, value, ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS or None)
+    except Exception as e:
+        logger.warning("Summary cache store failed: %s: %s", type(e).__name__, e)
+    return value
+
+
+def get_chunk_cache_stats() -> dict:
+    """Hit/miss counters for cached chunk and reduce-step summaries."""
+    return dict(_chunk_cache_stats)
+
+
+def chunk_files(file_contents: dict) -> List[dict]:
+    """
+    Split every file into token-bounded chunks, in file id order.
+
+    Files are chunked independently, so adding or changing one file leaves
+    the chunks (and cached chunk summaries) of every other file untouched.
+    """
+    chunks = []
+    for file_id in sorted(file_contents):
+        file_data = file_contents[file_id]
+        parts = token_service.chunk_text(
+            file_data['content'],
+            settings.SUMMARY_CHUNK_TOKENS,
+            settings.SUMMARY_CHUNK_OVERLAP_TOKENS
+        )
+        for index, text in enumerate(parts):
+            chunks.append({
+                'file_id': file_id,
+                'filename': file_data['file'].filename,
+                'index': index,
+                'count': len(parts),
+                'text': text
+            })
+    return chunks
+
+
+async def summarize_chunk(chunk: dict) -> str:
+    """Summarize one chunk (the map step). Results are cached by chunk content."""
+    label = f"{chunk['filename']} (part {chunk['index'] + 1} of {chunk['count']})"
+    cache_key = "summary-chunk:" + _hash(
+        settings.OPENAI_MODEL, MAP_REDUCE_PROMPT_VERSION, MAP_SYSTEM_PROMPT,
+        label, hashlib.sha256(chunk['text'].encode("utf-8")).hexdigest()
+    )
+
+    async def compute() -> str:
+        notes = await get_llm_client().chat(
+            [
+                {"role": "system", "content": MAP_SYSTEM_PROMPT},
+                {"role": "user", "content": f"=== File: {label} ===\n{chunk['text']}"}
+            ],
+            temperature=0.2,
+            max_tokens=settings.SUMMARY_MAP_OUTPUT_TOKENS
+        )
+        return f"=== Notes from {label} ===\n{notes.strip()}"
+
+    return await _cached(cache_key, compute)
+
+
+async def _reduce_group(partials: List[str]) -> str:
+    """Merge a group of partial summaries into one (a reduce step). Cached by input."""
+    cache_key = "summary-reduce:" + _hash(
+        settings.OPENAI_MODEL, MAP_REDUCE_PROMPT_VERSION, REDUCE_SYSTEM_PROMPT, partials
+    )
+
+    async def compute() -> str:
+        notes = await get_llm_client().chat(
+            [
+                {"role": "system", "content": REDUCE_SYSTEM_PROMPT},
+                {"role": "user", "content": "\n\n".join(partials)}
+            ],
+            temperature=0.2,
+            max_tokens=settings.SUMMARY_REDUCE_OUTPUT_TOKENS
+        )
+        return f"=== Combined notes ===\n{notes.strip()}"
+
+    return await _cached(cache_key, compute)
+
+
+def _group_by_tokens(texts: List[str], budget: int) -> List[List[str]]:
+    """Pack consecutive texts into groups of at most `budget` tokens (order preserved)."""
+    groups = []
+    current = []
+    current_tokens = 0
+    for text in texts:
+        tokens = token_service.count_tokens(text)
+        if current and current_tokens + tokens > budget:
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+
+async def summarize_to_budget(file_contents: dict, budget: int) -> List[str]:
+    """
+    Reduce the files to partial summaries totalling at most `budget` tokens.
+
+    Map: every chunk is summarized concurrently (the shared LLM client enforces
+    concurrency and rate limits). Reduce: consecutive partial summaries are
+    merged in groups, level by level, until the remainder fits the budget.
+    The caller makes the final call over what is returned.
+    """
+    chunks = chunk_files(file_contents)
+    logger.info(
+        "Map-reduce summary: %d chunks from %d files", len(chunks), len(file_contents),
+        extra={"chunks": len(chunks), "files": len(file_contents)}
+    )
+    partials = list(await asyncio.gather(*(summarize_chunk(chunk) for chunk in chunks)))
+
+    level = 0
+    while sum(token_service.count_tokens(p) for p in partials) > budget:
+        groups = _group_by_tokens(partials, settings.SUMMARY_MAX_INPUT_TOKENS)
+        if len(groups) >= len(partials):
+            # Every partial is too large to pair with another; reducing can't make progress
+            break
+        level += 1
+        logger.info("Map-reduce summary: reduce level %d, %d -> %d", level, len(partials), len(groups))
+        partials = list(await asyncio.gather(
+            *(_reduce_group(group) if len(group) > 1 else asyncio.sleep(0, group[0]) for group in groups)
+        ))
+    return partials
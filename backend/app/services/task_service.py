@@ -0,0 +1,328 @@
+"""Task service - the durable task queue shared by the API and worker processes."""
+import asyncio
+import random
+import weakref
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+from app.core.config import settings
+from app.core.pagination import DEFAULT_PAGE_SIZE, SortOrder, paginate
+from app.models.task import Task, TASK_QUEUED, TASK_RUNNING, TASK_DONE, TASK_DEAD
+
+# Longest error text kept on a task
+MAX_ERROR_LENGTH = 2000
+
+# One per event loop: an Event is bound to the loop it is first waited on
+_wakeups: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Event]" = weakref.WeakKeyDictionary()
+
+
+def _utcnow() -> datetime:
+    # Queue times are compared across processes, so always use UTC
+    return datetime.now(timezone.utc)
+
+
+def _get_wakeup() -> asyncio.Event:
+    loop = asyncio.get_running_loop()
+    wakeup = _wakeups.get(loop)
+    if wakeup is None:
+        wakeup = _wakeups[loop] = asyncio.Event()
+    return wakeup
+
+
+def notify_workers() -> None:
+    """
+    Wake the worker running in this process, if any, to claim new tasks now.
+
+    Call after committing enqueued tasks; workers in other processes find
+    them on their next poll.
+    """
+    _get_wakeup().set()
+
+
+async def wait_for_work(timeout: float) -> None:
+    """Wait until notify_workers is called in this process, or `timeout` seconds pass."""
+    wakeup = _get_wakeup()
+    try:
+        await asyncio.wait_for(wakeup.wait(), timeout=timeout)
+    except asyncio.TimeoutError:
+        pass
+    wakeup.clear()
+
+
+def _task_values(
+    kind: str,
+    payload: dict,
+    priority: int,
+    created_by_user_id: Optional[int],
+    max_attempts: Optional[int]
+) -> dict:
+    return {
+        "kind": kind,
+        "payload": payload,
+        "priority": priority,
+        "max_attempts": max_attempts or settings.TASK_MAX_ATTEMPTS,
+        "run_at": _utcnow(),
+        "created_by_user_id": created_by_user_id,
+    }
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: dict,
+    priority: int = 0,
+    created_by_user_id: Optional[int] = None,
+    max_attempts: Optional[int] = None
+) -> Task:
+    """
+    Add a task to the queue in the caller's transaction.
+
+    The task becomes visible to workers when the caller commits, so work is
+    never started for changes that were rolled back. Call notify_workers
+    after the commit to start it without waiting for a poll.
+    """
+    task = Task(**_task_values(kind, payload, priority, created_by_user_id, max_attempts))
+    db.add(task)
+    await db.flush()
+    return task
+
+
+async def enqueue_many(
+    db: AsyncSession,
+    kind: str,
+    payloads: Iterable[dict],
+    priority: int = 0,
+    created_by_user_id: Optional[int] = None,
+    max_attempts: Optional[int] = None
+) -> None:
+    """Add many tasks of one kind in a single bulk INSERT, in the caller's transaction."""
+    rows = [_task_values(kind, payload, priority, created_by_user_id, max_attempts) for payload in payloads]
+    if rows:
+        await db.execute(insert(Task), rows)
+
+
+async def claim_tasks(db: AsyncSession, worker_id: str, limit: int, kinds: Optional[List[str]] = None) -> List[Task]:
+    """
+    Lease up to `limit` runnable tasks to a worker, highest priority first.
+
+    On PostgreSQL the candidates are selected with FOR UPDATE SKIP LOCKED,
+    so concurrent workers never wait on or double-claim each other's rows.
+    SQLite ignores the locking clause; its single writer makes the UPDATE
+    atomic instead. Each claim counts as an attempt and holds the task for
+    TASK_VISIBILITY_TIMEOUT_SECONDS unless the worker renews the lease.
+    Commits.
+    """
+    now = _utcnow()
+    candidates = (
+        select(Task.id)
+        .where(Task.status == TASK_QUEUED, Task.run_at <= now)
+        .order_by(Task.priority.desc(), Task.run_at, Task.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    if kinds is not None:
+        candidates = candidates.where(Task.kind.in_(kinds))
+    claim = (
+        update(Task)
+        .where(Task.id.in_(candidates.scalar_subquery()), Task.status == TASK_QUEUED)
+        .values(
+            status=TASK_RUNNING,
+            attempts=Task.attempts + 1,
+            locked_by=worker_id,
+            locked_until=now + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT_SECONDS),
+            started_at=now
+        )
+        .returning(Task)
+    )
+    # Loaded as an ORM select so tasks this session already holds (e.g. just
+    # enqueued) are refreshed with the claimed values rather than left stale
+    tasks = list((await db.execute(
+        select(Task).from_statement(claim).execution_options(populate_existing=True)
+    )).scalars().all())
+    await db.commit()
+    # RETURNING order is unspecified
+    tasks.sort(key=lambda task: (-task.priority, task.run_at, task.id))
+    return tasks
+
+
+async def has_queued(db: AsyncSession, kinds: Optional[List[str]] = None) -> bool:
+    """Whether any task is queued, including retries not yet due."""
+    stmt = select(Task.id).where(Task.status == TASK_QUEUED)
+    if kinds is not None:
+        stmt = stmt.where(Task.kind.in_(kinds))
+    return (await db.execute(stmt.limit(1))).first() is not None
+
+
+async def renew_lease(db: AsyncSession, task_id: int, worker_id: str) -> bool:
+    """
+    Extend a running task's lease. Commits.
+
+    Returns:
+        False if the worker no longer holds the task (its lease expired and
+        it was handed to another worker or dead-lettered)
+    """
+    result = await db.execute(
+        update(Task)
+        .where(Task.id == task_id, Task.status == TASK_RUNNING, Task.locked_by == worker_id)
+        .values(locked_until=_utcnow() + timedelta(seconds=settings.TASK_VISIBILITY_TIMEOUT_SECONDS))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount > 0
+
+
+async def complete_task(db: AsyncSession, task: Task, worker_id: str, result: Optional[dict] = None) -> bool:
+    """
+    Mark a task done with its handler's result. Commits.
+
+    Returns:
+        False if the worker had lost the lease; the result is then discarded
+    """
+    updated = await db.execute(
+        update(Task)
+        .where(Task.id == task.id, Task.status == TASK_RUNNING, Task.locked_by == worker_id)
+        .values(status=TASK_DONE, result=result, locked_by=None, locked_until=None, finished_at=func.now())
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return updated.rowcount > 0
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait before the next attempt of a task that failed `attempts` times."""
+    # Full jitter keeps a burst of failed tasks from retrying in lockstep
+    ceiling = min(settings.TASK_RETRY_MAX_DELAY_SECONDS, settings.TASK_RETRY_BASE_DELAY_SECONDS * 2 ** (attempts - 1))
+    return random.uniform(0, ceiling)
+
+
+async def fail_task(db: AsyncSession, task: Task, worker_id: str, error: str) -> Optional[str]:
+    """
+    Record a failed attempt: requeue the task after a backoff delay, or
+    dead-letter it once it has used max_attempts. Commits.
+
+    Returns:
+        The task's new status, or None if the worker had lost the lease
+    """
+    if task.attempts >= task.max_attempts:
+        values = {"status": TASK_DEAD, "finished_at": func.now()}
+    else:
+        values = {"status": TASK_QUEUED, "run_at": _utcnow() + timedelta(seconds=retry_delay(task.attempts))}
+    updated = await db.execute(
+        update(Task)
+        .where(Task.id == task.id, Task.status == TASK_RUNNING, Task.locked_by == worker_id)
+        .values(last_error=error[:MAX_ERROR_LENGTH], locked_by=None, locked_until=None, **values)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return values["status"] if updated.rowcount else None
+
+
+async def requeue_expired(db: AsyncSession) -> int:
+    """
+    Take back running tasks whose lease expired (their worker died or hung).
+
+    They are queued again, or dead-lettered if that was their last attempt.
+    Idempotent, so any number of workers may run it. Commits.
+
+    Returns:
+        Number of tasks taken back
+    """
+    now = _utcnow()
+    expired = (Task.status == TASK_RUNNING, Task.locked_until < now)
+    dead = await db.execute(
+        update(Task)
+        .where(*expired, Task.attempts >= Task.max_attempts)
+        .values(
+            status=TASK_DEAD,
+            last_error="Lease expired: the worker stopped renewing it",
+            locked_by=None,
+            locked_until=None,
+            finished_at=func.now()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    requeued = await db.execute(
+        update(Task)
+        .where(*expired)
+        .values(status=TASK_QUEUED, run_at=now, locked_by=None, locked_until=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return dead.rowcount + requeued.rowcount
+
+
+async def get_task(db: AsyncSession, task_id: int, owner_user_id: int) -> Optional[Task]:
+    """Get a task, verifying ownership."""
+    result = await db.execute(
+        select(Task).where(Task.id == task_id, Task.created_by_user_id == owner_user_id)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_tasks(
+    db: AsyncSession,
+    owner_user_id: int,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    order: SortOrder = "desc",
+    status: Optional[str] = None,
+    kind: Optional[str] = None
+) -> Tuple[List[Task], Optional[str]]:
+    """
+    Get one page of a user's tasks, newest first by default, optionally by status and kind.
+
+    Returns:
+        Tuple of (tasks, next_cursor)
+    """
+    stmt = select(Task).where(Task.created_by_user_id == owner_user_id)
+    if status:
+        stmt = stmt.where(Task.status == status)
+    if kind:
+        stmt = stmt.where(Task.kind == kind)
+    return await paginate(db, stmt, Task, cursor, limit, order)
+
+
+async def retry_task(db: AsyncSession, task: Task) -> bool:
+    """
+    Put a dead-lettered task back on the queue with a fresh set of attempts. Commits.
+
+    Returns:
+        False if the task isn't dead
+    """
+    updated = await db.execute(
+        update(Task)
+        .where(Task.id == task.id, Task.status == TASK_DEAD)
+        .values(status=TASK_QUEUED, attempts=0, run_at=_utcnow(), finished_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    if not updated.rowcount:
+        return False
+    await db.refresh(task)
+    return True
+
+
+async def get_queue_stats(db: AsyncSession) -> dict:
+    """Count tasks by kind and status, with the age of the oldest runnable queued task."""
+    rows = (await db.execute(
+        select(Task.kind, Task.status, func.count(Task.id)).group_by(Task.kind, Task.status)
+    )).all()
+    counts = {}
+    for kind, status, count in rows:
+        counts.setdefault(kind, {})[status] = count
+    now = _utcnow()
+    oldest = (await db.execute(
+        select(func.min(Task.run_at)).where(Task.status == TASK_QUEUED, Task.run_at <= now)
+    )).scalar_one_or_none()
+    if oldest is not None and oldest.tzinfo is None:
+        # SQLite returns naive datetimes; queue times are stored in UTC
+        oldest = oldest.replace(tzinfo=timezone.utc)
+    return {
+        "queued": sum(by_status.get(TASK_QUEUED, 0) for by_status in counts.values()),
+        "running": sum(by_status.get(TASK_RUNNING, 0) for by_status in counts.values()),
+        "dead": sum(by_status.get(TASK_DEAD, 0) for by_status in counts.values()),
+        "oldest_queued_seconds": (now - oldest).total_seconds() if oldest else 0.0,
+        "by_kind": counts,
+    }
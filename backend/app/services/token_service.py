@@ -0,0 +1,105 @@
+"""Token service - counts and splits text in model tokens."""
+import bisect
+import logging
+import re
+from functools import lru_cache
+from typing import List, Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Used when tiktoken or its encoding files are unavailable (e.g. offline hosts
+# without TIKTOKEN_CACHE_DIR): words in pieces of up to 4 characters plus
+# single punctuation marks, which tracks BPE token counts for English prose
+_APPROX_TOKEN_PATTERN = re.compile(r"(?:\w{1,4}|[^\w\s])\s*|\s+")
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Load the tiktoken encoding for `model`, or None to use the approximation."""
+    try:
+        import tiktoken
+    except ImportError:
+        logger.warning("tiktoken not installed, using approximate token counts")
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning("Could not load tiktoken encoding (%s), using approximate token counts", type(e).__name__)
+        return None
+
+
+def tokenizer_name(model: Optional[str] = None) -> str:
+    """Name of the tokenizer in use, for reporting."""
+    encoding = _get_encoding(model or settings.OPENAI_MODEL)
+    return encoding.name if encoding is not None else "approximate"
+
+
+def _token_offsets(text: str, model: Optional[str] = None) -> List[int]:
+    """Start offset in `text` of every token."""
+    encoding = _get_encoding(model or settings.OPENAI_MODEL)
+    if encoding is None:
+        return [match.start() for match in _APPROX_TOKEN_PATTERN.finditer(text)]
+    _, offsets = encoding.decode_with_offsets(encoding.encode(text, disallowed_special=()))
+    return offsets
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Count the tokens `text` encodes to."""
+    if not text:
+        return 0
+    encoding = _get_encoding(model or settings.OPENAI_MODEL)
+    if encoding is None:
+        return sum(1 for _ in _APPROX_TOKEN_PATTERN.finditer(text))
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Cut `text` to at most `max_tokens` tokens, on a token boundary."""
+    if max_tokens <= 0:
+        return ""
+    offsets = _token_offsets(text, model)
+    if len(offsets) <= max_tokens:
+        return text
+    return text[:offsets[max_tokens]]
+
+
+def chunk_text(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    model: Optional[str] = None
+) -> List[str]:
+    """
+    Split `text` into chunks of at most `max_tokens` tokens.
+
+    Chunks end on token boundaries, preferring a line break in the last fifth
+    of the window so paragraphs are kept together. Consecutive chunks share
+    `overlap_tokens` tokens of context. Splitting depends only on the text, so
+    the same text always yields the same chunks.
+    """
+    offsets = _token_offsets(text, model)
+    if len(offsets) <= max_tokens:
+        return [text] if text else []
+
+    overlap_tokens = min(overlap_tokens, max_tokens // 2)
+    chunks = []
+    start = 0
+    while start < len(offsets):
+        end = start + max_tokens
+        if end >= len(offsets):
+            chunks.append(text[offsets[start]:])
+            break
+
+        # Back off to the last newline in the tail of the window, if any
+        cut = offsets[end]
+        newline = text.rfind("\n", offsets[start + (max_tokens * 4) // 5], cut)
+        if newline != -1:
+            end = bisect.bisect_left(offsets, newline + 1)
+            cut = offsets[end] if end < len(offsets) else len(text)
+        chunks.append(text[offsets[start]:cut])
+        start = max(end - overlap_tokens, start + 1)
+    return chunks
@@ -0,0 +1,31 @@
+"""Storage abstraction for uploaded files."""
+from app.core.config import settings
+from app.storage.base import StorageBackend, StorageStat
+from app.storage.instrumented import InstrumentedStorage
+
+
+def create_storage() -> StorageBackend:
+    """Create the storage backend selected by STORAGE_BACKEND ("local" or "s3"), with call timing."""
+    return InstrumentedStorage(_create_backend())
+
+
+def _create_backend() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "s3":
+        from app.storage.s3_storage import S3Storage
+        return S3Storage(
+            bucket=settings.S3_BUCKET,
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region=settings.S3_REGION,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            prefix=settings.S3_PREFIX
+        )
+    if settings.STORAGE_BACKEND == "local":
+        from app.storage.local_storage import LocalStorage
+        return LocalStorage(settings.STORAGE_PATH)
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+
+storage = create_storage()
+
+__all__ = ["InstrumentedStorage", "StorageBackend", "StorageStat", "create_storage", "storage"]
@@ -0,0 +1,73 @@
+"""Storage backend interface."""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Optional
+
+
+@dataclass
+class StorageStat:
+    """Metadata about a stored object."""
+    path: str
+    size_bytes: int
+    modified_at: Optional[datetime] = None
+
+
+class StorageBackend(ABC):
+    """
+    Async interface implemented by every storage backend.
+    
+    Paths are relative keys such as "blobs/ab/cd/<hash>/<generation>". Byte ranges are
+    half-open: `start` is inclusive, `end` is exclusive (None = end of object).
+    Missing objects raise FileNotFoundError.
+    """
+    
+    @abstractmethod
+    async def write(self, path: str, data: bytes) -> int:
+        """Write bytes to `path`, replacing any existing object. Returns bytes written."""
+    
+    @abstractmethod
+    async def write_stream(self, path: str, chunks: AsyncIterable[bytes]) -> int:
+        """
+        Write an async stream of chunks to `path` without buffering the whole object.
+        
+        The object only becomes visible once the stream completes; if the
+        stream raises, nothing is left at `path`. Returns bytes written.
+        """
+    
+    @abstractmethod
+    async def read(self, path: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        """Read an object, or the byte range [start, end) of it."""
+    
+    @abstractmethod
+    def read_stream(
+        self,
+        path: str,
+        chunk_size: int = 1024 * 1024,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream an object, or the byte range [start, end) of it, in chunks."""
+    
+    @abstractmethod
+    async def exists(self, path: str) -> bool:
+        """Check whether an object exists."""
+    
+    @abstractmethod
+    async def stat(self, path: str) -> StorageStat:
+        """Get size and modification time of an object."""
+    
+    @abstractmethod
+    async def delete(self, path: str) -> None:
+        """Delete an object."""
+    
+    @abstractmethod
+    async def move(self, source_path: str, dest_path: str) -> None:
+        """Move an object, replacing any existing object at dest_path."""
+    
+    async def write_text(self, path: str, content: str) -> int:
+        """Write text content (UTF-8)."""
+        return await self.write(path, content.encode("utf-8"))
+    
+    async def close(self) -> None:
+        """Release any connections held by the backend."""
@@ -0,0 +1,96 @@
+"""Storage backend wrapper that records the time and bytes of every call."""
+import time
+from typing import AsyncIterable, AsyncIterator, Optional
+from app.storage.base import StorageBackend, StorageStat
+from app.telemetry import record_storage
+
+
+class InstrumentedStorage(StorageBackend):
+    """Delegates to another backend, recording each call in the current span and the storage metrics."""
+
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+
+    async def write(self, path: str, data: bytes) -> int:
+        started = time.perf_counter()
+        try:
+            written = await self.backend.write(path, data)
+        except Exception:
+            record_storage("write", time.perf_counter() - started, ok=False)
+            raise
+        record_storage("write", time.perf_counter() - started, bytes_written=written)
+        return written
+
+    async def write_stream(self, path: str, chunks: AsyncIterable[bytes]) -> int:
+        started = time.perf_counter()
+        try:
+            written = await self.backend.write_stream(path, chunks)
+        except Exception:
+            record_storage("write_stream", time.perf_counter() - started, ok=False)
+            raise
+        # Includes the time spent waiting on the source (e.g. a client upload)
+        record_storage("write_stream", time.perf_counter() - started, bytes_written=written)
+        return written
+
+    async def read(self, path: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        started = time.perf_counter()
+        try:
+            data = await self.backend.read(path, start, end)
+        except Exception:
+            record_storage("read", time.perf_counter() - started, ok=False)
+            raise
+        record_storage("read", time.perf_counter() - started, bytes_read=len(data))
+        return data
+
+    async def read_stream(
+        self,
+        path: str,
+        chunk_size: int = 1024 * 1024,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        started = time.perf_counter()
+        size = 0
+        ok = False
+        try:
+            async for chunk in self.backend.read_stream(path, chunk_size, start, end):
+                size += len(chunk)
+                yield chunk
+            ok = True
+        finally:
+            # Includes the time the consumer (e.g. a slow download) took per chunk
+            record_storage("read_stream", time.perf_counter() - started, bytes_read=size, ok=ok)
+
+    async def exists(self, path: str) -> bool:
+        started = time.perf_counter()
+        try:
+            return await self.backend.exists(path)
+        finally:
+            record_storage("exists", time.perf_counter() - started)
+
+    async def stat(self, path: str) -> StorageStat:
+        started = time.perf_counter()
+        try:
+            return await self.backend.stat(path)
+        finally:
+            record_storage("stat", time.perf_counter() - started)
+
+    async def delete(self, path: str) -> None:
+        started = time.perf_counter()
+        try:
+            await self.backend.delete(path)
+        finally:
+            record_storage("delete", time.perf_counter() - started)
+
+    async def move(self, source_path: str, dest_path: str) -> None:
+        started = time.perf_counter()
+        try:
+            await self.backend.move(source_path, dest_path)
+        finally:
+            record_storage("move", time.perf_counter() - started)
+
+    async def write_text(self, path: str, content: str) -> int:
+        return await self.write(path, content.encode("utf-8"))
+
+    async def close(self) -> None:
+        await self.backend.close()
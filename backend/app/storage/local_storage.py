@@ -0,0 +1,95 @@
+"""Local filesystem storage."""
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterable, AsyncIterator, Optional
+import aiofiles
+import aiofiles.os
+from app.storage.base import StorageBackend, StorageStat
+
+
+class LocalStorage(StorageBackend):
+    """Stores objects as files under a base directory, using aiofiles for non-blocking I/O."""
+    
+    def __init__(self, base_path: str):
+        self.base_path = Path(base_path).resolve()
+    
+    def _resolve(self, path: str) -> Path:
+        """Resolve a storage path to an absolute path, refusing paths outside the base directory."""
+        full_path = (self.base_path / path).resolve()
+        if full_path != self.base_path and self.base_path not in full_path.parents:
+            raise ValueError(f"Invalid storage path: {path}")
+        return full_path
+    
+    async def write(self, path: str, data: bytes) -> int:
+        async def single_chunk():
+            yield data
+        return await self.write_stream(path, single_chunk())
+    
+    async def write_stream(self, path: str, chunks: AsyncIterable[bytes]) -> int:
+        # Write to a temporary file and rename it into place so readers never see a partial file
+        full_path = self._resolve(path)
+        await aiofiles.os.makedirs(full_path.parent, exist_ok=True)
+        tmp_path = full_path.with_name(f".{full_path.name}.{uuid.uuid4().hex}.tmp")
+        
+        written = 0
+        try:
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    written += len(chunk)
+            await aiofiles.os.replace(tmp_path, full_path)
+        except BaseException:
+            try:
+                await aiofiles.os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+        return written
+    
+    async def read(self, path: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        async with aiofiles.open(self._resolve(path), "rb") as f:
+            if start:
+                await f.seek(start)
+            if end is None:
+                return await f.read()
+            return await f.read(max(0, end - start))
+    
+    async def read_stream(
+        self,
+        path: str,
+        chunk_size: int = 1024 * 1024,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        async with aiofiles.open(self._resolve(path), "rb") as f:
+            if start:
+                await f.seek(start)
+            remaining = None if end is None else max(0, end - start)
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = await f.read(size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+    
+    async def exists(self, path: str) -> bool:
+        return await aiofiles.os.path.isfile(self._resolve(path))
+    
+    async def stat(self, path: str) -> StorageStat:
+        result = await aiofiles.os.stat(self._resolve(path))
+        return StorageStat(
+            path=path,
+            size_bytes=result.st_size,
+            modified_at=datetime.fromtimestamp(result.st_mtime, tz=timezone.utc)
+        )
+    
+    async def delete(self, path: str) -> None:
+        await aiofiles.os.remove(self._resolve(path))
+    
+    async def move(self, source_path: str, dest_path: str) -> None:
+        dest = self._resolve(dest_path)
+        await aiofiles.os.makedirs(dest.parent, exist_ok=True)
+        await aiofiles.os.replace(self._resolve(source_path), dest)
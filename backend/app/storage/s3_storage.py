@@ -0,0 +1,197 @@
+"""S3-compatible object storage (AWS S3, MinIO, etc.)."""
+from contextlib import AsyncExitStack
+from typing import AsyncIterable, AsyncIterator, Optional
+import asyncio
+from aiobotocore.session import get_session
+from botocore.exceptions import ClientError
+from app.storage.base import StorageBackend, StorageStat
+
+# S3 requires every multipart part except the last to be at least 5 MiB
+MIN_PART_SIZE = 5 * 1024 * 1024
+_NOT_FOUND_CODES = {"404", "NoSuchKey", "NotFound"}
+
+
+def _is_not_found(error: ClientError) -> bool:
+    return error.response.get("Error", {}).get("Code") in _NOT_FOUND_CODES
+
+
+class S3Storage(StorageBackend):
+    """
+    Stores objects in an S3 bucket.
+
+    Works against any S3-compatible endpoint (set endpoint_url for MinIO or
+    similar). The client and its connection pool are created on first use and
+    reused until close().
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        endpoint_url: Optional[str] = None,
+        region: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        prefix: str = "",
+        part_size: int = 8 * 1024 * 1024
+    ):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.part_size = max(part_size, MIN_PART_SIZE)
+        self._client_kwargs = {
+            "endpoint_url": endpoint_url or None,
+            "region_name": region or None,
+            "aws_access_key_id": access_key_id or None,
+            "aws_secret_access_key": secret_access_key or None,
+        }
+        self._session = get_session()
+        self._exit_stack: Optional[AsyncExitStack] = None
+        self._client = None
+        self._client_lock = asyncio.Lock()
+
+    def _key(self, path: str) -> str:
+        return f"{self.prefix}/{path}" if self.prefix else path
+
+    async def _get_client(self):
+        if self._client is None:
+            async with self._client_lock:
+                if self._client is None:
+                    self._exit_stack = AsyncExitStack()
+                    self._client = await self._exit_stack.enter_async_context(
+                        self._session.create_client("s3", **self._client_kwargs)
+                    )
+        return self._client
+
+    async def close(self) -> None:
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+            self._exit_stack = None
+            self._client = None
+
+    async def write(self, path: str, data: bytes) -> int:
+        client = await self._get_client()
+        await client.put_object(Bucket=self.bucket, Key=self._key(path), Body=data)
+        return len(data)
+
+    async def write_stream(self, path: str, chunks: AsyncIterable[bytes]) -> int:
+        # Small objects go up in a single PUT; larger ones as a multipart upload,
+        # buffering at most one part in memory at a time
+        client = await self._get_client()
+        key = self._key(path)
+        buffer = bytearray()
+        written = 0
+        upload_id = None
+        parts = []
+
+        try:
+            async for chunk in chunks:
+                buffer.extend(chunk)
+                written += len(chunk)
+                if len(buffer) >= self.part_size:
+                    if upload_id is None:
+                        response = await client.create_multipart_upload(Bucket=self.bucket, Key=key)
+                        upload_id = response["UploadId"]
+                    part_number = len(parts) + 1
+                    response = await client.upload_part(
+                        Bucket=self.bucket, Key=key, UploadId=upload_id,
+                        PartNumber=part_number, Body=bytes(buffer)
+                    )
+                    parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+                    buffer.clear()
+
+            if upload_id is None:
+                await client.put_object(Bucket=self.bucket, Key=key, Body=bytes(buffer))
+                return written
+
+            if buffer:
+                part_number = len(parts) + 1
+                response = await client.upload_part(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id,
+                    PartNumber=part_number, Body=bytes(buffer)
+                )
+                parts.append({"PartNumber": part_number, "ETag": response["ETag"]})
+            await client.complete_multipart_upload(
+                Bucket=self.bucket, Key=key, UploadId=upload_id,
+                MultipartUpload={"Parts": parts}
+            )
+            return written
+        except BaseException:
+            if upload_id is not None:
+                await client.abort_multipart_upload(Bucket=self.bucket, Key=key, UploadId=upload_id)
+            raise
+
+    async def _get_object(self, path: str, start: int, end: Optional[int]):
+        client = await self._get_client()
+        kwargs = {"Bucket": self.bucket, "Key": self._key(path)}
+        if start or end is not None:
+            kwargs["Range"] = f"bytes={start}-{'' if end is None else end - 1}"
+        try:
+            return await client.get_object(**kwargs)
+        except ClientError as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(path) from e
+            raise
+
+    async def read(self, path: str, start: int = 0, end: Optional[int] = None) -> bytes:
+        if end is not None and end <= start:
+            return b""
+        response = await self._get_object(path, start, end)
+        async with response["Body"] as body:
+            return await body.read()
+
+    async def read_stream(
+        self,
+        path: str,
+        chunk_size: int = 1024 * 1024,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        if end is not None and end <= start:
+            return
+        response = await self._get_object(path, start, end)
+        async with response["Body"] as body:
+            while True:
+                chunk = await body.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    async def exists(self, path: str) -> bool:
+        try:
+            await self.stat(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    async def stat(self, path: str) -> StorageStat:
+        client = await self._get_client()
+        try:
+            response = await client.head_object(Bucket=self.bucket, Key=self._key(path))
+        except ClientError as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(path) from e
+            raise
+        return StorageStat(
+            path=path,
+            size_bytes=response["ContentLength"],
+            modified_at=response.get("LastModified")
+        )
+
+    async def delete(self, path: str) -> None:
+        # S3 deletes are idempotent; check first to keep FileNotFoundError semantics
+        await self.stat(path)
+        client = await self._get_client()
+        await client.delete_object(Bucket=self.bucket, Key=self._key(path))
+
+    async def move(self, source_path: str, dest_path: str) -> None:
+        client = await self._get_client()
+        try:
+            await client.copy_object(
+                Bucket=self.bucket,
+                Key=self._key(dest_path),
+                CopySource={"Bucket": self.bucket, "Key": self._key(source_path)}
+            )
+        except ClientError as e:
+            if _is_not_found(e):
+                raise FileNotFoundError(source_path) from e
+            raise
+        await client.delete_object(Bucket=self.bucket, Key=self._key(source_path))
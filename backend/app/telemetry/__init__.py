@@ -0,0 +1,15 @@
+"""Instrumentation: per-request spans, Prometheus metrics and structured JSON logs."""
+from app.telemetry.database import instrument_engine, pool_stats, record_pool_timeout
+from app.telemetry.logging import JSONFormatter, configure_logging
+from app.telemetry.metrics import Counter, Gauge, Histogram, counter, gauge, histogram, registry
+from app.telemetry.middleware import TelemetryMiddleware
+from app.telemetry.spans import (
+    Span, annotate, current_span, record_db_query, record_llm_call, record_pdf_page, record_storage, span
+)
+
+__all__ = [
+    "Counter", "Gauge", "Histogram", "JSONFormatter", "Span", "TelemetryMiddleware",
+    "annotate", "configure_logging", "counter", "current_span", "gauge", "histogram", "instrument_engine",
+    "pool_stats", "record_db_query", "record_llm_call", "record_pdf_page", "record_pool_timeout", "record_storage",
+    "registry", "span",
+]
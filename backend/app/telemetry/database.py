@@ -0,0 +1,89 @@
+"""SQLAlchemy hooks recording every statement, and connection pool usage."""
+import time
+from typing import Dict, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from app.telemetry import metrics
+from app.telemetry.spans import record_db_query
+
+_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+# Instrumented engines by name ("primary", "replica")
+_engines: Dict[str, AsyncEngine] = {}
+
+
+def pool_stats(engine: AsyncEngine) -> dict:
+    """
+    Connection counts of an engine's pool. Only pools that keep connections
+    (QueuePool) report them; others (e.g. NullPool) report just their class.
+    """
+    pool = engine.sync_engine.pool
+    stats: Dict[str, Optional[int]] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        checked_out = pool.checkedout()
+        stats.update(
+            size=pool.size(),
+            checked_out=checked_out,
+            idle=pool.checkedin(),
+            # QueuePool has no public accessor for its overflow limit
+            max_connections=pool.size() + pool._max_overflow if pool._max_overflow >= 0 else None,
+        )
+    return stats
+
+
+def _collect(key: str) -> dict:
+    values = {}
+    for name, engine in _engines.items():
+        value = pool_stats(engine).get(key)
+        if value is not None:
+            values[(name,)] = value
+    return values
+
+
+metrics.gauge(
+    "db_pool_checked_out_connections", "Pooled connections in use by a session.", ["engine"],
+    collect=lambda: _collect("checked_out")
+)
+metrics.gauge("db_pool_idle_connections", "Pooled connections open and idle.", ["engine"], collect=lambda: _collect("idle"))
+metrics.gauge(
+    "db_pool_max_connections", "Pool size plus overflow: the most connections a process opens.", ["engine"],
+    collect=lambda: _collect("max_connections")
+)
+DB_POOL_CHECKOUTS = metrics.counter("db_pool_checkouts_total", "Connections taken from the pool.", ["engine"])
+DB_POOL_CONNECTS = metrics.counter("db_pool_connects_total", "New database connections opened.", ["engine"])
+DB_POOL_TIMEOUTS = metrics.counter(
+    "db_pool_timeouts_total", "Requests that gave up waiting for a pooled connection (DB_POOL_TIMEOUT_SECONDS)."
+)
+
+
+def _operation(statement: str) -> str:
+    word = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return word.lower() if word in _OPERATIONS else "other"
+
+
+def instrument_engine(engine: AsyncEngine, name: str = "primary") -> None:
+    """Record each statement the engine executes in the current span and the db_query metrics, and export its pool usage."""
+    _engines[name] = engine
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._telemetry_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_telemetry_started", None)
+        if started is not None:
+            record_db_query(_operation(statement), time.perf_counter() - started)
+
+    @event.listens_for(engine.sync_engine.pool, "checkout")
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_POOL_CHECKOUTS.inc(engine=name)
+
+    @event.listens_for(engine.sync_engine.pool, "connect")
+    def connect(dbapi_connection, connection_record):
+        DB_POOL_CONNECTS.inc(engine=name)
+
+
+def record_pool_timeout() -> None:
+    DB_POOL_TIMEOUTS.inc()
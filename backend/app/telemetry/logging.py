@@ -0,0 +1,51 @@
+"""Structured logging: one JSON object per line, tagged with the current request or task."""
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from app.telemetry.spans import current_span
+
+# LogRecord attributes that aren't fields passed with extra={...}
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "taskName"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Format records as JSON with a timestamp, level, logger and message.
+
+    Fields passed with `extra` are included as-is, and records logged while
+    handling a request or task carry its request_id / task_id.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        span = current_span()
+        if span is not None:
+            for key in ("request_id", "task_id"):
+                if key in span.attributes:
+                    entry[key] = span.attributes[key]
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = "INFO", fmt: str = "json") -> None:
+    """Send the app's logs to stderr as JSON lines (or plain text with fmt="text")."""
+    handler = logging.StreamHandler(sys.stderr)
+    if fmt == "json":
+        handler.setFormatter(JSONFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    logger = logging.getLogger("app")
+    logger.handlers[:] = [handler]
+    logger.setLevel(level.upper())
+    # Records are written here only, not again by the root logger (e.g. uvicorn's)
+    logger.propagate = False
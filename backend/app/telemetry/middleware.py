@@ -0,0 +1,81 @@
+"""Request telemetry middleware."""
+import logging
+import uuid
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+from app.telemetry import metrics
+from app.telemetry.spans import span
+
+logger = logging.getLogger(__name__)
+
+HTTP_REQUESTS = metrics.counter("http_requests_total", "HTTP requests handled.", ["method", "route", "status"])
+HTTP_SECONDS = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request time, until the response body is sent.", ["method", "route"]
+)
+HTTP_IN_PROGRESS = metrics.gauge("http_requests_in_progress", "HTTP requests being handled.")
+
+# Not worth a log line per call
+_QUIET_PATHS = {"/metrics", "/health"}
+
+
+def _route_template(scope: Scope) -> str:
+    # Label by route template, not raw path, to keep metric cardinality bounded
+    route = scope.get("route")
+    return getattr(route, "path_format", None) or getattr(route, "path", None) or "unmatched"
+
+
+class TelemetryMiddleware:
+    """
+    Open a span per HTTP request, record its count and duration, and log it.
+
+    Pure ASGI rather than BaseHTTPMiddleware, so streamed responses are timed
+    to their last chunk and keep the span current while they stream. The
+    request id (X-Request-ID from the client, or a new one) is echoed in the
+    response and tags every log line written while handling the request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id") or uuid.uuid4().hex
+        status = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        with span("http_request", request_id=request_id) as current:
+            try:
+                await self.app(scope, receive, send_with_request_id)
+            finally:
+                HTTP_IN_PROGRESS.dec()
+                method = scope["method"]
+                route = _route_template(scope)
+                totals = current.to_dict()
+                HTTP_REQUESTS.inc(method=method, route=route, status=str(status))
+                HTTP_SECONDS.observe(totals["duration_seconds"], method=method, route=route)
+                slow = totals["duration_seconds"] >= settings.SLOW_REQUEST_SECONDS
+                if slow or (settings.LOG_REQUESTS and scope["path"] not in _QUIET_PATHS):
+                    logger.log(
+                        logging.WARNING if slow else logging.INFO,
+                        "%s %s %s", method, scope["path"], status,
+                        extra={
+                            "event": "request",
+                            "method": method,
+                            "route": route,
+                            "status": status,
+                            **{key: value for key, value in (scope.get("path_params") or {}).items()},
+                            **{key: value for key, value in current.attributes.items() if key != "request_id"},
+                            **totals,
+                        }
+                    )
@@ -0,0 +1,130 @@
+"""
+Per-request spans: what one request (or background task) spent its time on.
+
+The middleware, and the task worker, open a span for each unit of work.
+Hooks in the database engine, storage backend, PDF extraction and LLM
+client add to the current span (a context variable, so it follows the
+request into awaited calls, worker threads and streamed responses) and to
+the process-wide Prometheus metrics.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, Optional
+from app.telemetry import metrics
+
+DB_QUERIES = metrics.counter("db_queries_total", "SQL statements executed.", ["operation"])
+DB_QUERY_SECONDS = metrics.histogram("db_query_duration_seconds", "SQL statement execution time.", ["operation"])
+STORAGE_OPERATIONS = metrics.counter("storage_operations_total", "Storage backend calls.", ["operation", "outcome"])
+STORAGE_SECONDS = metrics.histogram("storage_operation_duration_seconds", "Storage backend call time.", ["operation"])
+STORAGE_BYTES = metrics.counter("storage_bytes_total", "Bytes read from or written to storage.", ["direction"])
+PDF_PAGE_SECONDS = metrics.histogram("pdf_page_extraction_seconds", "Text extraction time per PDF page.", ["outcome"])
+LLM_REQUESTS = metrics.counter("llm_requests_total", "LLM API attempts, including retries.", ["operation", "outcome"])
+LLM_SECONDS = metrics.histogram("llm_request_duration_seconds", "LLM API call time, from dispatch to full response.", ["operation"])
+LLM_TOKENS = metrics.counter("llm_tokens_total", "Tokens reported by the LLM API.", ["operation", "type"])
+
+
+@dataclass
+class Span:
+    """Totals for one request or task. Times are in seconds."""
+    name: str
+    attributes: Dict[str, object] = field(default_factory=dict)
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    storage_operations: int = 0
+    storage_seconds: float = 0.0
+    storage_bytes_read: int = 0
+    storage_bytes_written: int = 0
+    pdf_pages: int = 0
+    pdf_seconds: float = 0.0
+    llm_calls: int = 0
+    llm_seconds: float = 0.0
+    llm_prompt_tokens: int = 0
+    llm_completion_tokens: int = 0
+    started: float = field(default_factory=time.perf_counter)
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        del data["started"], data["name"], data["attributes"]
+        data["duration_seconds"] = time.perf_counter() - self.started
+        return {key: round(value, 6) if isinstance(value, float) else value for key, value in data.items()}
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("telemetry_span", default=None)
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """Make a new span current for the enclosed work."""
+    current = Span(name, attributes)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+
+
+def current_span() -> Optional[Span]:
+    """The span of the request or task being handled, if any."""
+    return _current.get()
+
+
+def annotate(**attributes) -> None:
+    """Attach attributes (e.g. claim_id) to the current span, for its log line."""
+    current = _current.get()
+    if current is not None:
+        current.attributes.update(attributes)
+
+
+def record_db_query(operation: str, seconds: float) -> None:
+    DB_QUERIES.inc(operation=operation)
+    DB_QUERY_SECONDS.observe(seconds, operation=operation)
+    current = _current.get()
+    if current is not None:
+        current.db_queries += 1
+        current.db_seconds += seconds
+
+
+def record_storage(operation: str, seconds: float, bytes_read: int = 0, bytes_written: int = 0, ok: bool = True) -> None:
+    STORAGE_OPERATIONS.inc(operation=operation, outcome="ok" if ok else "error")
+    STORAGE_SECONDS.observe(seconds, operation=operation)
+    if bytes_read:
+        STORAGE_BYTES.inc(bytes_read, direction="read")
+    if bytes_written:
+        STORAGE_BYTES.inc(bytes_written, direction="write")
+    current = _current.get()
+    if current is not None:
+        current.storage_operations += 1
+        current.storage_seconds += seconds
+        current.storage_bytes_read += bytes_read
+        current.storage_bytes_written += bytes_written
+
+
+def record_pdf_page(seconds: float, ok: bool = True) -> None:
+    PDF_PAGE_SECONDS.observe(seconds, outcome="ok" if ok else "failed")
+    current = _current.get()
+    if current is not None:
+        current.pdf_pages += 1
+        current.pdf_seconds += seconds
+
+
+def record_llm_call(
+    operation: str,
+    seconds: float,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    ok: bool = True
+) -> None:
+    LLM_REQUESTS.inc(operation=operation, outcome="ok" if ok else "error")
+    LLM_SECONDS.observe(seconds, operation=operation)
+    if prompt_tokens:
+        LLM_TOKENS.inc(prompt_tokens, operation=operation, type="prompt")
+    if completion_tokens:
+        LLM_TOKENS.inc(completion_tokens, operation=operation, type="completion")
+    current = _current.get()
+    if current is not None:
+        current.llm_calls += 1
+        current.llm_seconds += seconds
+        current.llm_prompt_tokens += prompt_tokens
+        current.llm_completion_tokens += completion_tokens
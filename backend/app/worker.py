@@ -0,0 +1,294 @@
+"""
+Task worker - runs tasks from the durable task queue.
+
+Every API process runs one worker in the background by default
+(TASK_WORKER_IN_API). For production, run dedicated worker processes
+instead and set TASK_WORKER_IN_API=false on the API (from backend/):
+    python -m app.worker --processes 4
+
+Throughput scales with the number of worker processes: they share nothing
+but the database, and claim tasks with FOR UPDATE SKIP LOCKED so they never
+wait on each other. A worker that dies mid-task leaves it leased; another
+worker retries it once the lease (TASK_VISIBILITY_TIMEOUT_SECONDS) expires.
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, Optional, Set
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, dispose_engines
+from app.models.task import Task, TASK_DEAD
+from app.services import extraction_service, file_service, llm_service, proposal_service, summary_job_service, task_service
+from app.storage import storage
+from app.cache import cache
+from app.telemetry import configure_logging, metrics, registry, span
+
+# Named explicitly: under `python -m app.worker` __name__ is "__main__"
+logger = logging.getLogger("app.worker")
+
+TASKS = metrics.counter("tasks_total", "Task attempts run by this process.", ["kind", "outcome"])
+TASK_SECONDS = metrics.histogram("task_duration_seconds", "Task attempt run time, excluding queue wait.", ["kind"])
+
+Handler = Callable[[Task], Awaitable[Optional[dict]]]
+
+# Task kind -> handler. A handler gets the claimed task (payload, attempts,
+# max_attempts) and returns a JSON-serializable result; raising fails the
+# attempt, which is retried with backoff until max_attempts.
+HANDLERS: Dict[str, Handler] = {
+    file_service.EXTRACT_TEXT_TASK: extraction_service.run_extraction_task,
+    summary_job_service.SUMMARIZE_CLAIM_TASK: summary_job_service.run_item_task,
+}
+
+
+class Worker:
+    """Claims tasks and runs up to `concurrency` of them at once, renewing their leases while they run."""
+
+    def __init__(self, concurrency: Optional[int] = None, handlers: Optional[Dict[str, Handler]] = None):
+        self.id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.concurrency = concurrency or settings.TASK_WORKER_CONCURRENCY
+        self.handlers = handlers or HANDLERS
+        self.completed = 0
+        self.failed = 0
+        self._running: Set[asyncio.Task] = set()
+        self._stopping = False
+        self._last_reaped = 0.0
+        self._last_pruned = 0.0
+
+    def stop(self) -> None:
+        """Stop claiming tasks; run() returns once the running ones finish (or the grace period ends)."""
+        self._stopping = True
+        task_service.notify_workers()
+
+    async def run(self, until_idle: bool = False) -> None:
+        """
+        Process tasks until stop() is called, or with `until_idle` until none
+        is queued or running (used by benchmarks and scripts).
+        """
+        try:
+            while not self._stopping:
+                free = self.concurrency - len(self._running)
+                if free <= 0:
+                    await asyncio.wait(self._running, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+                tasks = await self._claim(free)
+                for task in tasks:
+                    execution = asyncio.create_task(self._execute(task))
+                    self._running.add(execution)
+                    execution.add_done_callback(self._on_done)
+                if tasks:
+                    continue
+                if until_idle and not self._running and not await self._has_queued():
+                    return
+                # Nothing to claim: wait for a poll, new local work or a slot freeing up
+                await task_service.wait_for_work(settings.TASK_POLL_INTERVAL_SECONDS)
+        finally:
+            await self._drain()
+
+    def _on_done(self, execution: asyncio.Task) -> None:
+        self._running.discard(execution)
+        # A freed slot may let the loop claim more
+        task_service.notify_workers()
+
+    async def _claim(self, limit: int) -> list:
+        try:
+            async with AsyncSessionLocal() as db:
+                # Expired leases are only checked now and then; any worker may take them back
+                if time.monotonic() - self._last_reaped >= settings.TASK_POLL_INTERVAL_SECONDS * 10:
+                    self._last_reaped = time.monotonic()
+                    reaped = await task_service.requeue_expired(db)
+                    if reaped:
+                        logger.warning("Took back %d task(s) whose worker stopped renewing the lease", reaped)
+                if time.monotonic() - self._last_pruned >= settings.PROPOSAL_PRUNE_INTERVAL_SECONDS:
+                    self._last_pruned = time.monotonic()
+                    pruned = await proposal_service.prune_proposals(db)
+                    if pruned:
+                        logger.info("Deleted %d pending proposal(s) past retention or superseded", pruned)
+                return await task_service.claim_tasks(db, self.id, limit, kinds=list(self.handlers))
+        except Exception as e:
+            # Database unavailable: back off and keep polling
+            logger.warning("Task worker could not claim tasks: %s: %s", type(e).__name__, e)
+            return []
+
+    async def _has_queued(self) -> bool:
+        async with AsyncSessionLocal() as db:
+            return await task_service.has_queued(db, kinds=list(self.handlers))
+
+    async def _execute(self, task: Task) -> None:
+        done = asyncio.Event()
+        renewal = asyncio.create_task(self._renew_lease(task.id, done))
+        outcome = "failed"
+        with span("task", task_id=task.id, kind=task.kind, attempt=task.attempts) as current:
+            try:
+                handler = self.handlers[task.kind]
+                try:
+                    result = await handler(task)
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                    logger.warning("Task %d (%s) attempt %d failed: %s", task.id, task.kind, task.attempts, error)
+                    async with AsyncSessionLocal() as db:
+                        status = await task_service.fail_task(db, task, self.id, error)
+                    self.failed += 1
+                    if status == TASK_DEAD:
+                        outcome = "dead"
+                        logger.warning("Task %d (%s) dead-lettered after %d attempts", task.id, task.kind, task.attempts)
+                else:
+                    async with AsyncSessionLocal() as db:
+                        await task_service.complete_task(db, task, self.id, result)
+                    self.completed += 1
+                    outcome = "done"
+            except Exception as e:
+                # Recording the outcome failed; the expired lease will retry the task
+                logger.warning("Task %d (%s) outcome not recorded: %s: %s", task.id, task.kind, type(e).__name__, e)
+            finally:
+                # Let the renewal loop finish rather than cancelling it mid-write
+                done.set()
+                await renewal
+                totals = current.to_dict()
+                TASKS.inc(kind=task.kind, outcome=outcome)
+                TASK_SECONDS.observe(totals["duration_seconds"], kind=task.kind)
+                logger.info(
+                    "Task %d (%s) %s", task.id, task.kind, outcome,
+                    extra={"event": "task", "outcome": outcome, **current.attributes, **totals}
+                )
+
+    async def _renew_lease(self, task_id: int, done: asyncio.Event) -> None:
+        interval = settings.TASK_VISIBILITY_TIMEOUT_SECONDS / 3
+        while True:
+            try:
+                await asyncio.wait_for(done.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            try:
+                async with AsyncSessionLocal() as db:
+                    if not await task_service.renew_lease(db, task_id, self.id):
+                        logger.warning("Task %d lease lost; another worker may run it again", task_id)
+                        return
+            except Exception as e:
+                logger.warning("Could not renew the lease of task %d: %s: %s", task_id, type(e).__name__, e)
+
+    async def _drain(self) -> None:
+        """Wait for running tasks, cancelling those still running after the grace period."""
+        if not self._running:
+            return
+        _, pending = await asyncio.wait(set(self._running), timeout=settings.TASK_SHUTDOWN_GRACE_SECONDS)
+        for execution in pending:
+            execution.cancel()
+        # Cancelled tasks keep their lease and are retried once it expires
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+_embedded: Optional[Worker] = None
+_embedded_task: Optional[asyncio.Task] = None
+
+
+def start_in_process() -> None:
+    """Run a worker in the background of this (API) process (called on app startup)."""
+    global _embedded, _embedded_task
+    if _embedded_task is None:
+        _embedded = Worker()
+        _embedded_task = asyncio.create_task(_embedded.run())
+
+
+async def stop_in_process() -> None:
+    """Stop the in-process worker, letting its running tasks finish (called on app shutdown)."""
+    global _embedded, _embedded_task
+    if _embedded_task is not None:
+        _embedded.stop()
+        await asyncio.gather(_embedded_task, return_exceptions=True)
+        _embedded = _embedded_task = None
+
+
+async def _handle_metrics_request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer any HTTP request with the metrics; Prometheus only ever GETs /metrics here."""
+    try:
+        await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=5)
+        body = registry.render().encode()
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+            b"Connection: close\r\n\r\n" + body
+        )
+        await writer.drain()
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _serve(concurrency: Optional[int], metrics_port: int = 0) -> None:
+    configure_logging(settings.LOG_LEVEL, settings.LOG_FORMAT)
+    worker = Worker(concurrency)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    metrics_server = None
+    if metrics_port and settings.METRICS_ENABLED:
+        metrics_server = await asyncio.start_server(_handle_metrics_request, port=metrics_port)
+    logger.info(
+        "Task worker %s started with concurrency %d", worker.id, worker.concurrency,
+        extra={"event": "worker_started", "worker_id": worker.id, "metrics_port": metrics_port or None}
+    )
+    try:
+        await worker.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+        extraction_service.shutdown_executor()
+        await llm_service.close_llm_client()
+        await cache.close()
+        await storage.close()
+        await dispose_engines()
+    logger.info(
+        "Task worker %s stopped: %d completed, %d failed", worker.id, worker.completed, worker.failed,
+        extra={"event": "worker_stopped", "worker_id": worker.id}
+    )
+
+
+def _run_process(concurrency: Optional[int], metrics_port: int = 0) -> None:
+    asyncio.run(_serve(concurrency, metrics_port))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--processes", type=int, default=1, help="Worker processes to run")
+    parser.add_argument("--concurrency", type=int, default=None, help="Tasks per process (default TASK_WORKER_CONCURRENCY)")
+    args = parser.parse_args()
+
+    if args.processes <= 1:
+        _run_process(args.concurrency, settings.WORKER_METRICS_PORT)
+        return
+
+    context = multiprocessing.get_context("spawn")
+    # Each process serves its own metrics, on consecutive ports
+    processes = [
+        context.Process(
+            target=_run_process,
+            args=(args.concurrency, settings.WORKER_METRICS_PORT + index if settings.WORKER_METRICS_PORT else 0),
+            name=f"task-worker-{index}"
+        )
+        for index in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def forward(sig, frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGINT, forward)
+    signal.signal(signal.SIGTERM, forward)
+    for process in processes:
+        process.join()
+
+
+if __name__ == "__main__":
+    main()
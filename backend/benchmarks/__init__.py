@@ -0,0 +1 @@
+"""Performance benchmarks. Run from the backend directory, e.g. `python -m benchmarks.pdf_extraction`."""
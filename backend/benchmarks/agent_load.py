@@ -0,0 +1,87 @@
+"""
+Load test for /agent/generate-summary: finds the concurrency ceiling of one API worker.
+
+Start the mock LLM and a single API worker pointed at it, then run this script:
+    MOCK_LLM_LATENCY_SECONDS=2 uvicorn benchmarks.mock_llm:app --port 9100
+    OPENAI_API_KEY=mock OPENAI_BASE_URL=http://localhost:9100/v1 uvicorn app.main:app --workers 1 --port 8000
+    python -m benchmarks.agent_load --concurrency 10 50 100 200 400
+
+For each level, that many summary requests are fired at once. With a fixed
+LLM latency, throughput grows linearly with concurrency until the server
+saturates; the level where it stops growing is the ceiling. Run against
+different commits to compare them.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+from benchmarks.synthetic import make_text
+
+
+async def _seed_claim(client: httpx.AsyncClient, files: int) -> int:
+    claim = (await client.post("/claims", json={"title": "Load test claim"})).json()
+    for index in range(files):
+        content = "\n".join(make_text(200, seed=index)).encode()
+        response = await client.post(
+            f"/claims/{claim['id']}/files",
+            files={"file": (f"report_{index}.txt", content, "text/plain")}
+        )
+        response.raise_for_status()
+    return claim["id"]
+
+
+async def _run_level(client: httpx.AsyncClient, claim_id: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+
+    async def one_request():
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            response = await client.post(f"/claims/{claim_id}/agent/generate-summary")
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": errors,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_s": statistics.median(latencies) if latencies else 0.0,
+        "p95_s": latencies[int(0.95 * (len(latencies) - 1))] if latencies else 0.0,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100, 200, 400])
+    parser.add_argument("--files", type=int, default=3, help="Text files in the seeded claim")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        claim_id = await _seed_claim(client, args.files)
+        # Give background extraction a moment to finish
+        await asyncio.sleep(1.0)
+
+        print(f"{'conc':>5} {'ok':>5} {'err':>4} {'elapsed s':>10} {'req/s':>8} {'p50 s':>7} {'p95 s':>7}")
+        for level in args.concurrency:
+            result = await _run_level(client, claim_id, level)
+            print(
+                f"{result['concurrency']:>5} {result['ok']:>5} {result['errors']:>4} {result['elapsed_s']:>10.2f} "
+                f"{result['throughput_rps']:>8.1f} {result['p50_s']:>7.2f} {result['p95_s']:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
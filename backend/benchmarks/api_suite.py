@@ -0,0 +1,455 @@
+"""
+Reproducible benchmark of the API hot paths, saved as JSON to compare commits.
+
+Seeds DATABASE_URL (PostgreSQL or SQLite) with synthetic claims, then drives
+the real app in-process over ASGI, phase by phase:
+    upload            POST /claims/{id}/files, --files text files and --pdfs PDFs of --pdf-pages pages per claim
+    extract           the queued extraction tasks, run by an in-process task worker
+    get_claim, list_claims, list_files, list_artifacts
+    generate_summary  POST /claims/{id}/agent/generate-summary, against a stub LLM
+    accept            POST /claims/{id}/agent/accept, adding a version to the summary
+    delete_file       DELETE /claims/{id}/files/{file_id}, every uploaded file
+Each claim starts with a summary artifact of --versions versions. Each phase
+reports p50/p95/p99 latency, throughput at --concurrency, SQL statements per
+request (from the request spans) and the peak RSS of this process.
+
+The LLM is benchmarks.mock_llm, started on a free port with a fixed
+--llm-latency (or pass --llm-base-url), so runs are repeatable and cost
+nothing. Content is derived from --seed. Start each run on an empty
+database: --fresh drops and recreates every table in DATABASE_URL.
+
+Run from backend/, once per commit, then compare the two runs:
+    DATABASE_URL=sqlite:////tmp/api_suite.db python -m benchmarks.api_suite --fresh --output before.json
+    DATABASE_URL=sqlite:////tmp/api_suite.db python -m benchmarks.api_suite --fresh --output after.json
+    python -m benchmarks.api_suite --compare before.json after.json
+With --baseline FILE a run is compared as soon as it finishes. Either way
+the exit status is 1 if a phase got slower (or used more memory) by more
+than --threshold, or ran more queries per request.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import httpx
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.main import app
+from app.models.claim import Claim
+from app.models.user import User
+from app.schemas.artifact import ArtifactCreate
+from app.services import artifact_service, token_service
+from app.telemetry import current_span
+from app.telemetry.spans import PDF_PAGE_SECONDS
+from app.worker import Worker
+from benchmarks.synthetic import make_pdf, make_text
+
+Request = Tuple[str, str, dict]
+
+# Phase result fields compared between runs: (name, path in the result, higher is better)
+COMPARED = [
+    ("p50_s", ("latency_s", "p50"), False),
+    ("p95_s", ("latency_s", "p95"), False),
+    ("p99_s", ("latency_s", "p99"), False),
+    ("throughput_per_s", ("throughput_per_s",), True),
+    ("queries", ("queries", "mean"), False),
+    ("peak_rss_mb", ("peak_rss_mb",), False),
+]
+
+
+class QueryCapture:
+    """Collects each request's SQL statement count from its request log line."""
+
+    def __init__(self):
+        self.queries: Dict[str, int] = {}
+
+    def install(self) -> None:
+        """Route the app's log lines here; warnings still go to stderr."""
+        settings.LOG_REQUESTS = True
+        capture = logging.Handler()
+        capture.emit = self._emit
+        stderr = logging.StreamHandler(sys.stderr)
+        stderr.setLevel(logging.WARNING)
+        logging.getLogger("app").handlers[:] = [capture, stderr]
+
+    def _emit(self, record: logging.LogRecord) -> None:
+        # Written while the request's span is still current
+        span = current_span()
+        if getattr(record, "event", None) == "request" and span is not None:
+            self.queries[span.attributes["request_id"]] = record.db_queries
+
+
+class RssSampler:
+    """Peak resident set size of this process while a phase runs."""
+
+    def __init__(self, interval: float = 0.02):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def current() -> int:
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError):
+            # No /proc (macOS): the peak over the process lifetime is the best available
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+
+def _latency_summary(latencies: List[float]) -> dict:
+    if not latencies:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "mean": 0.0, "max": 0.0}
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    return {
+        "p50": cuts[49],
+        "p95": cuts[94],
+        "p99": cuts[98],
+        "mean": statistics.fmean(latencies),
+        "max": max(latencies),
+    }
+
+
+async def _drive(
+    client: httpx.AsyncClient,
+    requests: List[Request],
+    concurrency: int,
+    capture: QueryCapture
+) -> Tuple[dict, List[httpx.Response]]:
+    """Send (method, path, kwargs) requests, `concurrency` at a time. Returns the phase result and the responses, in order."""
+    responses: List[Optional[httpx.Response]] = [None] * len(requests)
+    latencies: List[float] = []
+    request_ids: List[str] = []
+    pending = iter(range(len(requests)))
+
+    async def send_requests() -> None:
+        # Each sender takes the next request as soon as its last one is answered
+        for index in pending:
+            method, path, kwargs = requests[index]
+            request_id = uuid.uuid4().hex
+            started = time.perf_counter()
+            responses[index] = await client.request(method, path, headers={"X-Request-ID": request_id}, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            request_ids.append(request_id)
+
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        await asyncio.gather(*(send_requests() for _ in range(max(1, min(concurrency, len(requests))))))
+        elapsed = time.perf_counter() - started
+    queries = [capture.queries[request_id] for request_id in request_ids if request_id in capture.queries]
+    return {
+        "requests": len(requests),
+        "errors": sum(1 for response in responses if response.status_code >= 400),
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(requests) / elapsed if elapsed else 0.0,
+        "latency_s": _latency_summary(latencies),
+        "queries": {"mean": statistics.fmean(queries) if queries else 0.0, "max": max(queries, default=0)},
+        "peak_rss_mb": rss.peak / 2**20,
+    }, responses
+
+
+async def _seed(args) -> List[int]:
+    """Create the claims, each with a summary artifact of args.versions versions, directly in the database."""
+    async with engine.begin() as conn:
+        if args.fresh:
+            await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    claim_ids = []
+    async with AsyncSessionLocal() as db:
+        if not await db.get(User, 1):
+            db.add(User(id=1, email="user@example.com"))
+            await db.commit()
+        for index in range(args.claims):
+            claim = Claim(owner_user_id=1, title=f"Benchmark claim {index}", reference_number=f"BENCH-{index}")
+            db.add(claim)
+            await db.commit()
+            claim_ids.append(claim.id)
+            if not args.versions:
+                continue
+            # Each version rewrites one line of the last, like an accepted edit
+            lines = ["# Claim Summary", ""] + make_text(60, seed=args.seed * 7919 + index)
+            artifact = await artifact_service.create_artifact(
+                db, ArtifactCreate(type="summary", title="Summary"), claim.id, "\n".join(lines), created_by_user_id=1
+            )
+            for number in range(2, args.versions + 1):
+                lines[2 + number % 60] = make_text(1, seed=(args.seed * 7919 + index) * 1000 + number)[0]
+                await artifact_service.create_artifact_version(db, artifact, "\n".join(lines), created_by_user_id=1)
+    return claim_ids
+
+
+def _upload_requests(claim_ids: List[int], args) -> List[Request]:
+    requests = []
+    for index, claim_id in enumerate(claim_ids):
+        # Distinct content per file, so blob deduplication never skips an extraction
+        base_seed = (args.seed * 100003 + index) * 1000
+        for number in range(args.files):
+            content = "\n".join(make_text(args.text_lines, seed=base_seed + number)).encode()
+            requests.append(("POST", f"/claims/{claim_id}/files", {
+                "files": {"file": (f"report_{number}.txt", content, "text/plain")}
+            }))
+        for number in range(args.pdfs):
+            content = make_pdf(args.pdf_pages, seed=base_seed + 500 + number)
+            requests.append(("POST", f"/claims/{claim_id}/files", {
+                "files": {"file": (f"scan_{number}.pdf", content, "application/pdf")}
+            }))
+    return requests
+
+
+async def _extract(concurrency: int) -> dict:
+    """Run every queued extraction task with an in-process worker."""
+    def pages_done() -> float:
+        return PDF_PAGE_SECONDS.count(outcome="ok") + PDF_PAGE_SECONDS.count(outcome="failed")
+
+    worker = Worker(concurrency)
+    pages_before = pages_done()
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        await worker.run(until_idle=True)
+        elapsed = time.perf_counter() - started
+    tasks = worker.completed + worker.failed
+    pages = pages_done() - pages_before
+    return {
+        "requests": tasks,
+        "errors": worker.failed,
+        "elapsed_s": elapsed,
+        "throughput_per_s": tasks / elapsed if elapsed else 0.0,
+        "pdf_pages": int(pages),
+        "pdf_pages_per_s": pages / elapsed if elapsed else 0.0,
+        "peak_rss_mb": rss.peak / 2**20,
+    }
+
+
+def _start_stub_llm(latency: float) -> Tuple[subprocess.Popen, str]:
+    """Start benchmarks.mock_llm on a free port and wait until it accepts connections."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.mock_llm:app", "--port", str(port), "--log-level", "warning"],
+        env=dict(os.environ, MOCK_LLM_LATENCY_SECONDS=str(latency)),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("The stub LLM server exited on startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, f"http://127.0.0.1:{port}/v1"
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("The stub LLM server did not start")
+
+
+async def _run_phases(args, claim_ids: List[int], capture: QueryCapture) -> Dict[str, dict]:
+    phases: Dict[str, dict] = {}
+    api = f"http://benchmark{settings.API_V1_PREFIX}"
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url=api, timeout=args.timeout) as client:
+        async def phase(name: str, requests: List[Request]) -> List[httpx.Response]:
+            phases[name], responses = await _drive(client, requests, args.concurrency, capture)
+            print(f"{name}: {json.dumps(phases[name])}", file=sys.stderr)
+            return responses
+
+        responses = await phase("upload", _upload_requests(claim_ids, args))
+        uploaded = [
+            (response.json()["claim_id"], response.json()["id"]) for response in responses if response.status_code == 201
+        ]
+        phases["extract"] = await _extract(args.worker_concurrency)
+        print(f"extract: {json.dumps(phases['extract'])}", file=sys.stderr)
+
+        rounds = range(args.read_rounds)
+        await phase("get_claim", [("GET", f"/claims/{claim_id}", {}) for _ in rounds for claim_id in claim_ids])
+        await phase("list_claims", [("GET", "/claims", {}) for _ in rounds for _ in claim_ids])
+        await phase("list_files", [("GET", f"/claims/{claim_id}/files", {}) for _ in rounds for claim_id in claim_ids])
+        await phase(
+            "list_artifacts", [("GET", f"/claims/{claim_id}/artifacts", {}) for _ in rounds for claim_id in claim_ids]
+        )
+
+        responses = await phase(
+            "generate_summary", [("POST", f"/claims/{claim_id}/agent/generate-summary", {}) for claim_id in claim_ids]
+        )
+        accepts = [
+            ("POST", f"/claims/{claim_id}/agent/accept", {"json": {"proposal_id": proposal["id"]}})
+            for claim_id, response in zip(claim_ids, responses) if response.status_code == 200
+            for proposal in response.json()["proposals"][:1]
+        ]
+        await phase("accept", accepts)
+        await phase("delete_file", [("DELETE", f"/claims/{claim_id}/files/{file_id}", {}) for claim_id, file_id in uploaded])
+    return phases
+
+
+def _git(*command: str) -> Optional[str]:
+    try:
+        return subprocess.run(["git", *command], capture_output=True, text=True, timeout=30, check=True).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def _run(args) -> dict:
+    capture = QueryCapture()
+    capture.install()
+    # Extraction is measured as its own phase, not interleaved with uploads
+    settings.TASK_WORKER_IN_API = False
+    stub = None
+    if args.llm_base_url:
+        settings.OPENAI_BASE_URL = args.llm_base_url
+    else:
+        stub, settings.OPENAI_BASE_URL = _start_stub_llm(args.llm_latency)
+    settings.OPENAI_API_KEY = settings.OPENAI_API_KEY or "mock"
+
+    try:
+        started = time.perf_counter()
+        claim_ids = await _seed(args)
+        seed_seconds = time.perf_counter() - started
+        # Load the tokenizer now; its one-off load (or failed download) would land in the first summary
+        token_service.count_tokens("warm-up")
+        await app.router.startup()
+        try:
+            phases = await _run_phases(args, claim_ids, capture)
+        finally:
+            await app.router.shutdown()
+    finally:
+        if stub is not None:
+            stub.terminate()
+            stub.wait(timeout=30)
+
+    commit = _git("rev-parse", "HEAD")
+    return {
+        "meta": {
+            "commit": commit,
+            "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")) if commit else None,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "baseline", "compare")},
+            "seed_s": seed_seconds,
+            # Largest finished child process: an extraction worker or the stub LLM
+            "children_peak_rss_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        },
+        "phases": phases,
+    }
+
+
+def _field(result: dict, path: Tuple[str, ...]) -> Optional[float]:
+    for key in path:
+        if not isinstance(result, dict) or key not in result:
+            return None
+        result = result[key]
+    return result
+
+
+def compare(baseline: dict, current: dict, threshold: float, min_delta_s: float) -> Tuple[List[str], List[str]]:
+    """
+    Compare two runs phase by phase.
+
+    Returns report lines and the regressions: a timing or memory change
+    worse than `threshold` (relative; timings must also move by at least
+    `min_delta_s`), or any increase in queries per request.
+    """
+    lines = []
+    regressions = []
+    if baseline["meta"].get("config") != current["meta"].get("config"):
+        lines.append("warning: the runs used different settings; differences may not be regressions")
+    lines.append(f"{'phase':<18} {'metric':<17} {'baseline':>12} {'current':>12} {'change':>8}")
+    for phase, result in current["phases"].items():
+        before = baseline["phases"].get(phase)
+        if before is None:
+            continue
+        for name, path, higher_is_better in COMPARED:
+            old, new = _field(before, path), _field(result, path)
+            if old is None or new is None:
+                continue
+            change = (new - old) / old if old else 0.0
+            worse = -change if higher_is_better else change
+            if name == "queries":
+                regressed = new > old
+            elif name.endswith("_s"):
+                regressed = worse > threshold and abs(new - old) >= min_delta_s
+            else:
+                regressed = worse > threshold
+            flag = "  REGRESSION" if regressed else ""
+            lines.append(f"{phase:<18} {name:<17} {old:>12.4f} {new:>12.4f} {change:>+8.1%}{flag}")
+            if regressed:
+                regressions.append(f"{phase} {name}: {old:.4f} -> {new:.4f}")
+    return lines, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=50, help="Claims to seed")
+    parser.add_argument("--files", type=int, default=3, help="Text files uploaded per claim")
+    parser.add_argument("--text-lines", type=int, default=200, help="Lines per text file")
+    parser.add_argument("--pdfs", type=int, default=1, help="PDFs uploaded per claim")
+    parser.add_argument("--pdf-pages", type=int, default=20, help="Pages per PDF")
+    parser.add_argument("--versions", type=int, default=20, help="Versions of each claim's seeded summary (0 = none)")
+    parser.add_argument("--read-rounds", type=int, default=4, help="Requests per claim in each read phase")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight at once")
+    parser.add_argument("--worker-concurrency", type=int, default=4, help="Extraction tasks run at once")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic content")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub LLM response time, seconds")
+    parser.add_argument("--llm-base-url", help="Use this OpenAI-compatible server instead of starting the stub")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout, seconds")
+    parser.add_argument("--fresh", action="store_true", help="Drop and recreate all tables in DATABASE_URL first")
+    parser.add_argument("--output", help="Write the results here (default api_suite-<commit>-<time>.json)")
+    parser.add_argument("--baseline", help="Compare the run with this earlier result file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Only compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative change that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as baseline_file, open(args.compare[1]) as current_file:
+            baseline, current = json.load(baseline_file), json.load(current_file)
+    else:
+        current = asyncio.run(_run(args))
+        output = args.output or "api_suite-{}-{}.json".format(
+            (current["meta"]["commit"] or "unknown")[:10], datetime.now().strftime("%Y%m%d-%H%M%S")
+        )
+        with open(output, "w") as output_file:
+            json.dump(current, output_file, indent=2)
+        print(f"Results written to {output}")
+        if not args.baseline:
+            return
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+
+    lines, regressions = compare(baseline, current, args.threshold, args.min_delta_ms / 1000)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} regression(s)")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Diff engine vs difflib on large documents.
+
+Builds ~1 MB old/new document pairs of a few shapes (prose with scattered
+edits, an OCR'd table full of repeated rows, boilerplate-heavy letters) and
+times difflib.unified_diff against diff_service (unified text only, and with
+JSON hunks and word-level changes). difflib runs in a child process so a
+pathological case can be cut off at --timeout. Run from backend/:
+    python -m benchmarks.diff_engine --size-kb 1024
+"""
+import argparse
+import difflib
+import json
+import multiprocessing
+import random
+import time
+from typing import List, Tuple
+from app.services import diff_service
+from benchmarks.synthetic import make_text
+
+
+def _edit(lines: List[str], edits: int, seed: int) -> List[str]:
+    """Change, insert and delete `edits` lines at random."""
+    rng = random.Random(seed)
+    lines = list(lines)
+    for index in range(edits):
+        position = rng.randrange(len(lines))
+        action = rng.random()
+        if action < 0.5:
+            words = lines[position].split() or [""]
+            words[rng.randrange(len(words))] = f"edited{index}"
+            lines[position] = " ".join(words)
+        elif action < 0.75:
+            lines.insert(position, " ".join(make_text(1, seed=seed + index)))
+        else:
+            del lines[position]
+    return lines
+
+
+def _prose(num_lines: int) -> List[str]:
+    return make_text(num_lines, seed=1)
+
+
+def _table(num_lines: int) -> List[str]:
+    """OCR'd table: border and blank rows repeat thousands of times, cells repeat often."""
+    rng = random.Random(2)
+    lines = []
+    while len(lines) < num_lines:
+        lines.append("+----------+------------+----------+")
+        lines.append(f"| {rng.choice(['roof', 'water', 'storm']):8} | {rng.randrange(100):10} | {rng.choice(['yes', 'no']):8} |")
+        lines.append("")
+    return lines[:num_lines]
+
+
+def _boilerplate(num_lines: int) -> List[str]:
+    """Letters sharing long headers and footers, with a short unique body each."""
+    header = ["ACME Mutual Insurance", "123 Main Street", "Springfield", "", "Re: Claim correspondence", ""]
+    footer = ["", "This letter is confidential.", "ACME Mutual Insurance - Claims Department", "Page 1 of 1", ""]
+    lines = []
+    seed = 0
+    while len(lines) < num_lines:
+        seed += 1
+        lines.extend(header + make_text(4, seed=seed) + footer)
+    return lines[:num_lines]
+
+
+def _difflib_unified(old: str, new: str) -> Tuple[float, int]:
+    start = time.perf_counter()
+    diff = "".join(difflib.unified_diff(old.splitlines(keepends=True), new.splitlines(keepends=True)))
+    return time.perf_counter() - start, len(diff)
+
+
+def _difflib_worker(old: str, new: str, queue) -> None:
+    queue.put(_difflib_unified(old, new))
+
+
+def _time_difflib(old: str, new: str, timeout: float) -> dict:
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_difflib_worker, args=(old, new, queue))
+    process.start()
+    process.join(timeout)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+        return {"ms": None, "timed_out_after_s": timeout}
+    seconds, size = queue.get()
+    return {"ms": seconds * 1000, "diff_kb": size / 1024}
+
+
+def _time(function, repeat: int) -> Tuple[float, object]:
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-kb", type=int, default=1024, help="Approximate size of each document")
+    parser.add_argument("--edits", type=int, default=200, help="Lines changed between old and new")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of diff_service per case (best is reported)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Seconds before difflib is abandoned")
+    args = parser.parse_args()
+
+    # Oversized inputs would otherwise short-circuit to line counts
+    diff_service.settings.DIFF_MAX_INPUT_CHARS = 0
+    for name, build in (("prose", _prose), ("ocr_table", _table), ("boilerplate", _boilerplate)):
+        sample = "\n".join(build(100))
+        old_lines = build(int(args.size_kb * 1024 / (len(sample) / 100)))
+        old = "\n".join(old_lines) + "\n"
+        new = "\n".join(_edit(old_lines, args.edits, seed=3)) + "\n"
+
+        unified_seconds, unified = _time(lambda: diff_service.compute_unified_diff(old, new), args.repeat)
+        full_seconds, full = _time(lambda: diff_service.compute_diff(old, new), args.repeat)
+        print(json.dumps({
+            "case": name,
+            "old_kb": len(old) / 1024,
+            "lines": len(old_lines),
+            "difflib": _time_difflib(old, new, args.timeout),
+            "diff_service_unified": {"ms": unified_seconds * 1000, "diff_kb": len(unified) / 1024},
+            "diff_service_hunks_words": {"ms": full_seconds * 1000, "hunks": full["stats"]["hunks"]},
+            "stats": full["stats"],
+        }))
+
+
+if __name__ == "__main__":
+    main()
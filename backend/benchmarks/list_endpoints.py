@@ -0,0 +1,145 @@
+"""
+List endpoint latency and memory with large claims: deferred text columns vs eager loading.
+
+Seeds one claim with many files carrying large extracted text (and a summary
+artifact with large versions) directly in DATABASE_URL, then times the file
+and artifact list queries (one page of up to MAX_PAGE_SIZE rows) plus response serialization, as the list
+endpoints run them, against the same queries with the text columns
+undeferred (the old behaviour). Run from backend/:
+    DATABASE_URL=sqlite:////tmp/list_bench.db python -m benchmarks.list_endpoints --files 500 --text-kb 200
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import tracemalloc
+from typing import List
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, undefer
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.core.pagination import MAX_PAGE_SIZE
+from app.models.artifact import Artifact
+from app.models.artifact_version import ArtifactVersion
+from app.models.claim import Claim
+from app.models.file import File, EXTRACTION_DONE
+from app.models.user import User
+from app.schemas.artifact import Artifact as ArtifactSchema, ArtifactListItem
+from app.schemas.file import FileListItem
+from app.services import artifact_service, file_service
+from benchmarks.synthetic import make_text
+
+
+async def _seed(files: int, text_kb: int, versions: int) -> int:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    text = "\n".join(make_text(text_kb * 1024 // 80, seed=1))
+    async with AsyncSessionLocal() as db:
+        if not await db.get(User, 1):
+            db.add(User(id=1, email="user@example.com"))
+        claim = Claim(owner_user_id=1, title="List benchmark claim")
+        db.add(claim)
+        await db.flush()
+        for index in range(files):
+            db.add(File(
+                claim_id=claim.id,
+                filename=f"scan_{index}.pdf",
+                storage_path=f"bench/{index}",
+                mime_type="application/pdf",
+                size_bytes=len(text),
+                extracted_text=text,
+                extraction_status=EXTRACTION_DONE
+            ))
+        artifact = Artifact(claim_id=claim.id, type="summary", title="Summary")
+        db.add(artifact)
+        await db.flush()
+        for number in range(1, versions + 1):
+            version = ArtifactVersion(artifact_id=artifact.id, version_number=number, content=text)
+            db.add(version)
+            await db.flush()
+            artifact.current_version_id = version.id
+        await db.commit()
+        return claim.id
+
+
+async def _list_files_eager(db, claim_id: int) -> List[File]:
+    result = await db.execute(
+        select(File)
+        .options(undefer(File.extracted_text))
+        .where(File.claim_id == claim_id)
+        .order_by(File.created_at.desc(), File.id.desc())
+        .limit(MAX_PAGE_SIZE)
+    )
+    return list(result.scalars().all())
+
+
+async def _list_files(db, claim_id: int) -> List[File]:
+    files, _ = await file_service.get_files_by_claim(db, claim_id, limit=MAX_PAGE_SIZE)
+    return files
+
+
+async def _list_artifacts(db, claim_id: int) -> List[Artifact]:
+    artifacts, _ = await artifact_service.get_artifacts_by_claim(db, claim_id, limit=MAX_PAGE_SIZE)
+    return artifacts
+
+
+async def _list_artifacts_eager(db, claim_id: int) -> List[Artifact]:
+    result = await db.execute(
+        select(Artifact)
+        .options(selectinload(Artifact.current_version).undefer(ArtifactVersion.content))
+        .where(Artifact.claim_id == claim_id)
+    )
+    return list(result.scalars().all())
+
+
+async def _measure(name: str, load, schema, claim_id: int, iterations: int) -> dict:
+    adapter = TypeAdapter(List[schema])
+    latencies = []
+    for _ in range(iterations):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            body = adapter.dump_json(adapter.validate_python(await load(db, claim_id), from_attributes=True))
+            latencies.append(time.perf_counter() - start)
+
+    # Peak Python memory of one request, measured separately so tracing doesn't skew timings
+    async with AsyncSessionLocal() as db:
+        tracemalloc.start()
+        adapter.dump_json(adapter.validate_python(await load(db, claim_id), from_attributes=True))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "case": name,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(0.95 * (len(latencies) - 1))] * 1000,
+        "peak_mb": peak / 1024 / 1024,
+        "response_kb": len(body) / 1024,
+    }
+
+
+async def _run(args) -> None:
+    claim_id = await _seed(args.files, args.text_kb, args.versions)
+    cases = [
+        ("files: eager text", _list_files_eager, FileListItem),
+        ("files: deferred", _list_files, FileListItem),
+        ("artifacts: eager content", _list_artifacts_eager, ArtifactSchema),
+        ("artifacts: slim", _list_artifacts, ArtifactListItem),
+    ]
+    for name, load, schema in cases:
+        print(json.dumps(await _measure(name, load, schema, claim_id, args.iterations)))
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=500)
+    parser.add_argument("--text-kb", type=int, default=200, help="Extracted text per file and per version")
+    parser.add_argument("--versions", type=int, default=5, help="Summary artifact versions")
+    parser.add_argument("--iterations", type=int, default=20)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
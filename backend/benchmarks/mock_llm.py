@@ -0,0 +1,135 @@
+"""
+Minimal OpenAI-compatible chat completions server for load tests.
+
+Sleeps for a configurable latency, then returns a canned markdown summary,
+so benchmarks exercise the real client path without paying for tokens.
+Requests with "stream": true get the summary word by word as SSE chunks,
+spread evenly over the same latency, ending with a usage chunk when asked
+for with stream_options.include_usage. MOCK_LLM_ERROR_RATE (0-1) makes that
+fraction of requests fail with a 429 to exercise client retries.
+/v1/embeddings returns the local hashing embedder's vectors, so retrieval
+ranks sensibly against the stub too.
+
+Usage (from backend/):
+    MOCK_LLM_LATENCY_SECONDS=2 uvicorn benchmarks.mock_llm:app --port 9100
+and run the API with OPENAI_API_KEY=mock OPENAI_BASE_URL=http://localhost:9100/v1
+"""
+import asyncio
+import base64
+import os
+import random
+import time
+import uuid
+import json
+from typing import Optional
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.embeddings.hashing_embedder import HashingEmbedder
+
+LATENCY_SECONDS = float(os.environ.get("MOCK_LLM_LATENCY_SECONDS", "1.0"))
+ERROR_RATE = float(os.environ.get("MOCK_LLM_ERROR_RATE", "0"))
+SUMMARY = (
+    "# Claim Summary\n\n"
+    "## Overview\n\nMock summary generated for benchmarking.\n\n"
+    "## Key Facts\n\n- Date of loss: 2024-01-01\n- Amount claimed: $10,000\n"
+)
+
+app = FastAPI(title="Mock LLM")
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    if random.random() < ERROR_RATE:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+        )
+    if body.get("stream"):
+        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+        return StreamingResponse(
+            _stream_chunks(body.get("model", "mock"), _usage(body) if include_usage else None),
+            media_type="text/event-stream"
+        )
+    await asyncio.sleep(LATENCY_SECONDS)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": SUMMARY},
+            "finish_reason": "stop",
+        }],
+        "usage": _usage(body),
+    }
+
+
+def _usage(body: dict) -> dict:
+    prompt_chars = sum(len(m.get("content") or "") for m in body.get("messages", []))
+    return {
+        "prompt_tokens": prompt_chars // 4,
+        "completion_tokens": len(SUMMARY) // 4,
+        "total_tokens": prompt_chars // 4 + len(SUMMARY) // 4,
+    }
+
+
+@app.post("/v1/embeddings")
+async def embeddings(request: Request):
+    body = await request.json()
+    if random.random() < ERROR_RATE:
+        return JSONResponse(
+            status_code=429,
+            content={"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}},
+        )
+    texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+    vectors = await HashingEmbedder(body.get("dimensions") or 1536).embed(texts)
+    # The openai client asks for base64 by default
+    as_base64 = body.get("encoding_format") == "base64"
+    return {
+        "object": "list",
+        "model": body.get("model", "mock"),
+        "data": [
+            {
+                "object": "embedding",
+                "index": i,
+                "embedding": base64.b64encode(vector.tobytes()).decode() if as_base64 else vector.tolist(),
+            }
+            for i, vector in enumerate(vectors)
+        ],
+        "usage": {"prompt_tokens": sum(len(t) for t in texts) // 4, "total_tokens": sum(len(t) for t in texts) // 4},
+    }
+
+
+async def _stream_chunks(model: str, usage: Optional[dict] = None):
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    created = int(time.time())
+    pieces = SUMMARY.split(" ")
+    pieces = [piece + " " for piece in pieces[:-1]] + pieces[-1:]
+    delay = LATENCY_SECONDS / len(pieces)
+
+    def chunk(delta: dict, finish_reason=None) -> str:
+        return "data: " + json.dumps({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }) + "\n\n"
+
+    yield chunk({"role": "assistant", "content": ""})
+    for piece in pieces:
+        await asyncio.sleep(delay)
+        yield chunk({"content": piece})
+    yield chunk({}, "stop")
+    if usage is not None:
+        yield "data: " + json.dumps({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [],
+            "usage": usage,
+        }) + "\n\n"
+    yield "data: [DONE]\n\n"
@@ -0,0 +1,56 @@
+"""
+Benchmark serial vs page-parallel PDF text extraction.
+
+Usage (from backend/):
+    python -m benchmarks.pdf_extraction --pages 200 400 800 --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from benchmarks.synthetic import make_pdf
+from app.services.file_service import extract_pdf_text
+
+
+def _time_extraction(pdf_bytes: bytes, executor=None) -> float:
+    start = time.perf_counter()
+    text = extract_pdf_text(pdf_bytes, executor)
+    elapsed = time.perf_counter() - start
+    if not text:
+        raise RuntimeError("Extraction returned no text")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, nargs="+", default=[200, 400, 800], help="Page counts in the corpus")
+    parser.add_argument("--workers", type=int, default=4, help="Process pool size for the parallel run")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per document (best time is reported)")
+    args = parser.parse_args()
+    
+    corpus = [(pages, make_pdf(pages, seed=pages)) for pages in args.pages]
+    print(f"{'pages':>6} {'size MB':>8} {'serial s':>9} {'parallel s':>11} {'speedup':>8} {'pages/s':>9}")
+    
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        # Warm the pool so process start-up isn't billed to the first document
+        list(executor.map(abs, range(args.workers)))
+        
+        total_serial = total_parallel = 0.0
+        for pages, pdf_bytes in corpus:
+            serial = min(_time_extraction(pdf_bytes) for _ in range(args.repeat))
+            parallel = min(_time_extraction(pdf_bytes, executor) for _ in range(args.repeat))
+            total_serial += serial
+            total_parallel += parallel
+            print(
+                f"{pages:>6} {len(pdf_bytes) / 1e6:>8.2f} {serial:>9.2f} {parallel:>11.2f} "
+                f"{serial / parallel:>7.2f}x {pages / parallel:>9.1f}"
+            )
+    
+    total_pages = sum(args.pages)
+    print(
+        f"corpus: {total_pages} pages, serial {total_pages / total_serial:.1f} pages/s, "
+        f"parallel {total_pages / total_parallel:.1f} pages/s ({args.workers} workers)"
+    )
+
+
+if __name__ == "__main__":
+    main()
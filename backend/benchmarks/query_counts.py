@@ -0,0 +1,152 @@
+"""
+SQL query counts per endpoint, to catch N+1 and duplicate-query regressions.
+
+Runs the API in-process against DATABASE_URL (tables are created if missing)
+and counts the statements each request executes, on the primary and (if
+configured) the read replica. Run from backend/, without an OpenAI key so summaries use the
+offline fallback:
+    DATABASE_URL=sqlite:////tmp/query_counts.db OPENAI_API_KEY= python -m benchmarks.query_counts --files 20
+
+Counts must not grow with the number of files or artifact versions. With
+--check the script exits non-zero if any endpoint exceeds its budget;
+tests/test_query_counts.py runs the same check.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import sys
+from typing import Dict
+from sqlalchemy import event
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.database import Base, engine, read_engine
+from app.main import app
+from app.worker import Worker
+from benchmarks.synthetic import make_text
+
+# Statements allowed per request (the stub user is looked up once per process, not per request)
+BUDGETS = {
+    "GET /claims/{id}": 1,
+    "GET /claims/{id}/files": 2,
+    # Proposals are stored server-side: one INSERT per response with proposals
+    "POST /agent/generate-summary": 4,
+    "POST /agent/chat": 3,  # A question: answered from the loaded claim, nothing stored
+    # Accepting reads the proposal and marks it accepted; a new artifact also
+    # checks that no summary was created in the meantime
+    "POST /agent/accept (new artifact)": 7,
+    "POST /agent/accept (artifact version)": 7,  # Includes re-encoding the previous version as a delta
+    "POST /agent/generate-summary (existing summary)": 4,
+    "GET /artifacts": 3,
+}
+
+
+class QueryCounter:
+    """Counts statements sent to the database by the app's engines."""
+
+    def __init__(self):
+        self.count = 0
+        self.statements = []
+        for counted in {engine, read_engine}:
+            event.listen(counted.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(" ".join(statement.split())[:120])
+
+    def reset(self) -> None:
+        self.count = 0
+        self.statements = []
+
+    def close(self) -> None:
+        for counted in {engine, read_engine}:
+            event.remove(counted.sync_engine, "before_cursor_execute", self._on_execute)
+
+
+async def _create_tables() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def count_queries(files: int, verbose: bool = False) -> Dict[str, int]:
+    """Create a claim with `files` files and count the statements of each endpoint in BUDGETS."""
+    asyncio.run(_create_tables())
+    counter = QueryCounter()
+    results = {}
+    # Run queued extraction explicitly below, so worker polls never land inside a measured request
+    worker_in_api = settings.TASK_WORKER_IN_API
+    settings.TASK_WORKER_IN_API = False
+
+    try:
+        with TestClient(app) as client:
+            _run_requests(client, counter, results, files, verbose)
+    finally:
+        settings.TASK_WORKER_IN_API = worker_in_api
+        counter.close()
+    return results
+
+
+def _run_requests(client: TestClient, counter: QueryCounter, results: Dict[str, int], files: int, verbose: bool) -> None:
+    api = "/api/v1"
+    claim_id = client.post(f"{api}/claims", json={"title": "Query count claim"}).json()["id"]
+    for index in range(files):
+        content = "\n".join(make_text(40, seed=index)).encode()
+        client.post(
+            f"{api}/claims/{claim_id}/files",
+            files={"file": (f"report_{index}.txt", content, "text/plain")}
+        ).raise_for_status()
+    client.portal.call(functools.partial(Worker().run, until_idle=True))
+
+    def measure(name: str, method: str, path: str, **kwargs):
+        counter.reset()
+        response = client.request(method, f"{api}{path}", **kwargs)
+        response.raise_for_status()
+        results[name] = counter.count
+        if verbose:
+            print(f"{name}:\n  " + "\n  ".join(counter.statements))
+        return response.json()
+
+    measure("GET /claims/{id}", "GET", f"/claims/{claim_id}")
+    measure("GET /claims/{id}/files", "GET", f"/claims/{claim_id}/files")
+    proposal = measure("POST /agent/generate-summary", "POST", f"/claims/{claim_id}/agent/generate-summary")["proposals"][0]
+    measure(
+        "POST /agent/accept (new artifact)", "POST", f"/claims/{claim_id}/agent/accept",
+        json={"proposal_id": proposal["id"]}
+    )
+    # A question is answered from retrieved chunks, with no proposal
+    measure("POST /agent/chat", "POST", f"/claims/{claim_id}/agent/chat", json={"message": "what was damaged?"})
+    # A new file makes the next summary an incremental update of the existing one
+    client.post(
+        f"{api}/claims/{claim_id}/files",
+        files={"file": ("report_new.txt", "\n".join(make_text(40, seed=files)).encode(), "text/plain")}
+    ).raise_for_status()
+    client.portal.call(functools.partial(Worker().run, until_idle=True))
+    proposal = measure(
+        "POST /agent/generate-summary (existing summary)", "POST", f"/claims/{claim_id}/agent/generate-summary"
+    )["proposals"][0]
+    measure(
+        "POST /agent/accept (artifact version)", "POST", f"/claims/{claim_id}/agent/accept",
+        json={"proposal_id": proposal["id"]}
+    )
+    measure("GET /artifacts", "GET", f"/claims/{claim_id}/artifacts")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=20, help="Files in the test claim")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any endpoint exceeds its budget")
+    parser.add_argument("--verbose", action="store_true", help="Print the statements of each request")
+    args = parser.parse_args()
+
+    results = count_queries(args.files, args.verbose)
+    report = {
+        name: {"queries": count, "budget": BUDGETS[name], "ok": count <= BUDGETS[name]}
+        for name, count in results.items()
+    }
+    print(json.dumps({"files": args.files, "endpoints": report}, indent=2))
+    if args.check and not all(entry["ok"] for entry in report.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Batch summary job throughput and restart recovery, against the mock LLM server.
+
+Seeds claims with a few text files directly in DATABASE_URL, then runs one
+summary job per --concurrency level on an in-process task worker (fresh
+claims each time, so the summary cache doesn't help) while following it
+with watch_job. With --interrupt-after the worker is stopped as on shutdown
+after that many claims and a new one takes over. The run checks that every
+claim was recorded exactly once, that the stream delivered results in
+completion order, and that each proposed item has its proposal. For worker
+processes and crash recovery, see benchmarks.task_queue. Start the mock
+first (from backend/):
+    MOCK_LLM_LATENCY_SECONDS=0.5 uvicorn benchmarks.mock_llm:app --port 9100
+    DATABASE_URL=sqlite:////tmp/jobs_bench.db OPENAI_API_KEY=mock OPENAI_BASE_URL=http://localhost:9100/v1 \\
+        python -m benchmarks.summary_jobs --claims 200 --concurrency 4 16 --interrupt-after 50
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+from sqlalchemy import func, select
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.models.claim import Claim
+from app.models.file import File, EXTRACTION_DONE
+from app.models.proposal import Proposal
+from app.models.summary_job import SummaryJob, JOB_COMPLETED
+from app.models.summary_job_item import SummaryJobItem, ITEM_PROPOSED
+from app.models.user import User
+from app.schemas.summary_job import SummaryJobCreate
+from app.services import llm_service, summary_job_service
+from app.worker import Worker
+from benchmarks.synthetic import make_text
+
+
+async def _seed(claims: int, files: int, seed: int) -> List[int]:
+    async with AsyncSessionLocal() as db:
+        if not await db.get(User, 1):
+            db.add(User(id=1, email="user@example.com"))
+            await db.flush()
+        claim_ids = []
+        for index in range(claims):
+            claim = Claim(owner_user_id=1, title=f"Job benchmark claim {seed}-{index}")
+            db.add(claim)
+            await db.flush()
+            for file_index in range(files):
+                text = "\n".join(make_text(40, seed=seed * 100000 + index * files + file_index))
+                db.add(File(
+                    claim_id=claim.id,
+                    filename=f"report_{file_index}.txt",
+                    storage_path=f"bench/{claim.id}/{file_index}",
+                    mime_type="text/plain",
+                    size_bytes=len(text),
+                    extracted_text=text,
+                    extraction_status=EXTRACTION_DONE
+                ))
+            claim_ids.append(claim.id)
+        await db.commit()
+        return claim_ids
+
+
+async def _wait_until(job_id: int, condition) -> SummaryJob:
+    while True:
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(select(SummaryJob).where(SummaryJob.id == job_id))).scalar_one()
+        if condition(job):
+            return job
+        await asyncio.sleep(0.05)
+
+
+async def _follow(job_id: int, started: float) -> dict:
+    sequences = []
+    first_item_s = None
+    async for kind, payload in summary_job_service.watch_job(job_id):
+        if kind == "item":
+            if first_item_s is None:
+                first_item_s = time.perf_counter() - started
+            sequences.append(payload.sequence)
+    return {"sequences": sequences, "first_item_s": first_item_s}
+
+
+async def _measure(concurrency: int, level: int, args) -> dict:
+    claim_ids = await _seed(args.claims, args.files, seed=level + 1)
+
+    async with AsyncSessionLocal() as db:
+        job = await summary_job_service.create_job(db, SummaryJobCreate(claim_ids=claim_ids), owner_user_id=1)
+    started = time.perf_counter()
+    follower = asyncio.create_task(_follow(job.id, started))
+    worker = Worker(concurrency)
+    running = asyncio.create_task(worker.run())
+
+    interrupted = False
+    if args.interrupt_after and args.interrupt_after < args.claims:
+        await _wait_until(job.id, lambda j: j.processed >= args.interrupt_after)
+        worker.stop()
+        await running
+        interrupted = True
+        worker = Worker(concurrency)
+        running = asyncio.create_task(worker.run())
+
+    job = await _wait_until(job.id, lambda j: j.status == JOB_COMPLETED)
+    elapsed = time.perf_counter() - started
+    worker.stop()
+    await running
+    followed = await follower
+
+    async with AsyncSessionLocal() as db:
+        items = list((await db.execute(select(SummaryJobItem).where(SummaryJobItem.job_id == job.id))).scalars().all())
+        stored_proposals = (await db.execute(
+            select(func.count(Proposal.id)).where(Proposal.id.in_(
+                select(SummaryJobItem.proposal_id).where(SummaryJobItem.job_id == job.id, SummaryJobItem.status == ITEM_PROPOSED)
+            ))
+        )).scalar_one()
+    sequences = sorted(item.sequence for item in items)
+    checks = {
+        "each_claim_recorded_once": job.processed == job.total == len(items) and sequences == list(range(1, job.total + 1)),
+        "stream_in_completion_order": followed["sequences"] == list(range(1, job.total + 1)),
+        "proposals_stored": stored_proposals == job.proposed,
+    }
+    return {
+        "concurrency": concurrency,
+        "claims": job.total,
+        "interrupted": interrupted,
+        "elapsed_s": elapsed,
+        "claims_per_s": job.total / elapsed if elapsed else 0.0,
+        "first_result_s": followed["first_item_s"],
+        "proposed": job.proposed,
+        "unchanged": job.unchanged,
+        "failed": job.failed,
+        "retried": sum(1 for item in items if item.attempts > 1),
+        "checks": checks,
+    }
+
+
+async def _run(args) -> bool:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    ok = True
+    for level, concurrency in enumerate(args.concurrency):
+        result = await _measure(concurrency, level, args)
+        ok = ok and all(result["checks"].values())
+        print(json.dumps(result))
+    print(json.dumps({"llm": llm_service.get_llm_metrics()}))
+    await llm_service.close_llm_client()
+    await engine.dispose()
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=200, help="Claims per job")
+    parser.add_argument("--files", type=int, default=3, help="Text files per claim")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16], help="Worker concurrency levels")
+    parser.add_argument("--interrupt-after", type=int, default=0, help="Replace the worker after this many claims of each job")
+    if not asyncio.run(_run(parser.parse_args())):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
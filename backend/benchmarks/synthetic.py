@@ -0,0 +1,63 @@
+"""Synthetic claim data for benchmarks."""
+import random
+from io import BytesIO
+from typing import List
+
+WORDS = [
+    "claim", "policy", "insured", "vehicle", "damage", "adjuster", "estimate", "repair",
+    "collision", "liability", "deductible", "coverage", "report", "police", "witness",
+    "injury", "medical", "invoice", "payment", "property", "water", "roof", "storm",
+    "inspection", "photo", "statement", "date", "amount", "total", "approved",
+]
+
+
+def make_text(num_lines: int, seed: int = 0, words_per_line: int = 12) -> List[str]:
+    """Generate deterministic lines of claim-like text."""
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(words_per_line)) for _ in range(num_lines)]
+
+
+def _escape(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(num_pages: int, lines_per_page: int = 40, seed: int = 0) -> bytes:
+    """
+    Build a minimal, valid multi-page PDF with real text content streams.
+    
+    Written by hand so benchmarks don't need a PDF authoring dependency.
+    """
+    out = BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    
+    def add_object(obj_id: int, body: bytes) -> None:
+        offsets[obj_id] = out.tell()
+        out.write(f"{obj_id} 0 obj\n".encode() + body + b"\nendobj\n")
+    
+    # 1: catalog, 2: page tree, 3: font, then a (page, content) pair per page
+    page_ids = [4 + 2 * i for i in range(num_pages)]
+    add_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    add_object(2, f"<< /Type /Pages /Kids [{kids}] /Count {num_pages} >>".encode())
+    add_object(3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    
+    for page_number, page_id in enumerate(page_ids):
+        content_id = page_id + 1
+        lines = make_text(lines_per_page, seed=seed * 100003 + page_number)
+        text_ops = " T* ".join(f"({_escape(line)}) Tj" for line in lines)
+        stream = f"BT /F1 9 Tf 12 TL 40 800 Td {text_ops} ET".encode()
+        add_object(
+            page_id,
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        add_object(content_id, f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+    
+    xref_offset = out.tell()
+    size = max(offsets) + 1
+    out.write(f"xref\n0 {size}\n0000000000 65535 f \n".encode())
+    for obj_id in range(1, size):
+        out.write(f"{offsets[obj_id]:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+    return out.getvalue()
@@ -0,0 +1,150 @@
+"""
+Task queue throughput across worker processes, and recovery from a killed worker.
+
+For each --processes level, seeds fresh claims directly in DATABASE_URL,
+starts that many `python -m app.worker` processes, each running
+--concurrency tasks at once, then queues a summary job over the claims (one
+task per claim) and times it until it completes. Summaries come from the mock LLM server, so
+each task spends its time waiting on I/O, like production work. With
+--kill-after one worker is SIGKILLed after that many claims; its leased
+tasks are retried by the others once their lease (--visibility-timeout)
+expires. The run checks that every claim was recorded exactly once and that
+no task was dead-lettered. Start the mock first (from backend/):
+    MOCK_LLM_LATENCY_SECONDS=0.3 uvicorn benchmarks.mock_llm:app --port 9100
+    DATABASE_URL=sqlite:////tmp/queue_bench.db OPENAI_API_KEY=mock OPENAI_BASE_URL=http://localhost:9100/v1 \\
+        python -m benchmarks.task_queue --claims 200 --processes 1 2 4 8 --kill-after 50
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import List
+from sqlalchemy import func, select
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.models.summary_job import JOB_COMPLETED
+from app.models.summary_job_item import SummaryJobItem
+from app.models.task import Task, TASK_DEAD
+from app.schemas.summary_job import SummaryJobCreate
+from app.services import summary_job_service
+from benchmarks.summary_jobs import _seed, _wait_until
+
+
+def _start_workers(count: int, args) -> List[subprocess.Popen]:
+    """Start worker processes and wait until each has started, so their import time isn't measured."""
+    env = dict(
+        os.environ,
+        PYTHONUNBUFFERED="1",
+        TASK_POLL_INTERVAL_SECONDS=str(args.poll_interval),
+        TASK_VISIBILITY_TIMEOUT_SECONDS=str(args.visibility_timeout),
+    )
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-m", "app.worker", "--concurrency", str(args.concurrency)],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+        for _ in range(count)
+    ]
+    for worker in workers:
+        # Workers log JSON lines to stderr
+        while True:
+            line = worker.stderr.readline()
+            if not line:
+                raise RuntimeError("A worker process exited before starting")
+            if '"worker_started"' in line:
+                break
+        # Keep draining its log so the pipe never fills up
+        threading.Thread(target=worker.stderr.read, daemon=True).start()
+    return workers
+
+
+def _stop_workers(workers: List[subprocess.Popen]) -> None:
+    for worker in workers:
+        if worker.poll() is None:
+            worker.send_signal(signal.SIGTERM)
+    for worker in workers:
+        try:
+            worker.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+
+
+async def _measure(processes: int, level: int, args) -> dict:
+    claim_ids = await _seed(args.claims, args.files, seed=1000 + level)
+    workers = _start_workers(processes, args)
+    async with AsyncSessionLocal() as db:
+        job = await summary_job_service.create_job(db, SummaryJobCreate(claim_ids=claim_ids), owner_user_id=1)
+
+    started = time.perf_counter()
+    killed = False
+    try:
+        if args.kill_after and processes > 1 and args.kill_after < args.claims:
+            await _wait_until(job.id, lambda j: j.processed >= args.kill_after)
+            workers[0].kill()
+            killed = True
+        job = await _wait_until(job.id, lambda j: j.status == JOB_COMPLETED)
+        elapsed = time.perf_counter() - started
+    finally:
+        _stop_workers(workers)
+
+    async with AsyncSessionLocal() as db:
+        sequences = sorted((await db.execute(
+            select(SummaryJobItem.sequence).where(SummaryJobItem.job_id == job.id)
+        )).scalars().all())
+        retried = (await db.execute(
+            select(func.count(SummaryJobItem.id)).where(SummaryJobItem.job_id == job.id, SummaryJobItem.attempts > 1)
+        )).scalar_one()
+        dead = (await db.execute(select(func.count(Task.id)).where(Task.status == TASK_DEAD))).scalar_one()
+    checks = {
+        "each_claim_recorded_once": job.processed == job.total and sequences == list(range(1, job.total + 1)),
+        "none_dead_lettered": dead == 0,
+    }
+    return {
+        "processes": processes,
+        "concurrency": args.concurrency,
+        "claims": job.total,
+        "killed_one": killed,
+        "elapsed_s": elapsed,
+        "claims_per_s": job.total / elapsed if elapsed else 0.0,
+        "retried": retried,
+        "checks": checks,
+    }
+
+
+async def _run(args) -> bool:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    ok = True
+    baseline = None
+    for level, processes in enumerate(args.processes):
+        result = await _measure(processes, level, args)
+        baseline = baseline or result["claims_per_s"] / processes
+        result["scaling_efficiency"] = result["claims_per_s"] / (baseline * processes)
+        ok = ok and all(result["checks"].values())
+        print(json.dumps(result))
+    await engine.dispose()
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--claims", type=int, default=200, help="Claims per job")
+    parser.add_argument("--files", type=int, default=3, help="Text files per claim")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4], help="Worker process counts")
+    parser.add_argument("--concurrency", type=int, default=1, help="Tasks per worker process")
+    parser.add_argument("--kill-after", type=int, default=0, help="SIGKILL one worker after this many claims")
+    parser.add_argument("--visibility-timeout", type=float, default=5.0, help="Workers' TASK_VISIBILITY_TIMEOUT_SECONDS")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="Workers' TASK_POLL_INTERVAL_SECONDS")
+    if not asyncio.run(_run(parser.parse_args())):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
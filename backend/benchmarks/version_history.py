@@ -0,0 +1,124 @@
+"""
+Artifact version storage: bytes stored and reconstruction latency by snapshot interval.
+
+For each snapshot interval, seeds one artifact directly in DATABASE_URL with a
+long history of a large summary (a few lines edited and one appended per
+version, like repeated agent updates), then reports the bytes stored for
+content, deltas and search text against full copies, the time to create a version, and
+the time to reconstruct every historical version. An interval of 1 stores
+every version in full (the old behaviour). Run from backend/:
+    DATABASE_URL=sqlite:////tmp/version_bench.db python -m benchmarks.version_history --versions 200 --text-kb 500
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+from typing import List
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, Base, engine
+from app.models.artifact_version import ArtifactVersion
+from app.models.claim import Claim
+from app.models.user import User
+from app.schemas.artifact import ArtifactCreate
+from app.services import artifact_service
+from benchmarks.synthetic import make_text
+
+
+def _percentiles(samples: List[float]) -> dict:
+    samples = sorted(samples)
+    return {
+        "p50_ms": statistics.median(samples) * 1000,
+        "p95_ms": samples[int(0.95 * (len(samples) - 1))] * 1000,
+        "max_ms": samples[-1] * 1000,
+    }
+
+
+async def _seed(versions: int, text_kb: int, edits: int) -> tuple:
+    """Create an artifact with `versions` versions; return (artifact_id, create latencies)."""
+    rng = random.Random(0)
+    lines = [line + "\n" for line in make_text(text_kb * 1024 // 80, seed=1)]
+    latencies = []
+    async with AsyncSessionLocal() as db:
+        if not await db.get(User, 1):
+            db.add(User(id=1, email="user@example.com"))
+        claim = Claim(owner_user_id=1, title="Version history benchmark claim")
+        db.add(claim)
+        await db.commit()
+        artifact = await artifact_service.create_artifact(
+            db, ArtifactCreate(type="summary", title="Summary"), claim.id, content="".join(lines)
+        )
+        artifact_id = artifact.id
+        for number in range(2, versions + 1):
+            for _ in range(edits):
+                index = rng.randrange(len(lines))
+                lines[index] = " ".join(make_text(1, seed=number * 1000 + index)) + "\n"
+            lines.append(f"Update {number}: " + " ".join(make_text(1, seed=number)) + "\n")
+            start = time.perf_counter()
+            artifact = await artifact_service.get_artifact_with_claim_check(db, artifact_id, claim.id)
+            await artifact_service.create_artifact_version(db, artifact, "".join(lines))
+            latencies.append(time.perf_counter() - start)
+    return artifact_id, latencies
+
+
+async def _measure(interval: int, args) -> dict:
+    settings.ARTIFACT_SNAPSHOT_INTERVAL = interval
+    artifact_id, create_latencies = await _seed(args.versions, args.text_kb, args.edits)
+
+    async with AsyncSessionLocal() as db:
+        full_bytes, content_bytes, delta_bytes, search_bytes, snapshots = (await db.execute(
+            select(
+                func.sum(ArtifactVersion.size_bytes),
+                func.sum(func.length(ArtifactVersion.content)),
+                func.sum(func.length(ArtifactVersion.delta)),
+                func.sum(func.length(ArtifactVersion.search_text)),
+                func.count(ArtifactVersion.content),
+            ).where(ArtifactVersion.artifact_id == artifact_id)
+        )).one()
+        versions = list((await db.execute(
+            select(ArtifactVersion).where(ArtifactVersion.artifact_id == artifact_id)
+        )).scalars().all())
+
+    read_latencies = []
+    for version in versions:
+        # A fresh session per read, as each API request has
+        async with AsyncSessionLocal() as db:
+            version = await db.get(ArtifactVersion, version.id)
+            start = time.perf_counter()
+            await artifact_service.get_version_content(db, version)
+            read_latencies.append(time.perf_counter() - start)
+
+    stored_bytes = (content_bytes or 0) + (delta_bytes or 0) + (search_bytes or 0)
+    return {
+        "snapshot_interval": interval,
+        "versions": len(versions),
+        "full_copies_mb": full_bytes / 1024 / 1024,
+        "stored_mb": stored_bytes / 1024 / 1024,
+        "savings_pct": 100 * (1 - stored_bytes / full_bytes),
+        "stored_in_full": snapshots,
+        "create": _percentiles(create_latencies),
+        "reconstruct": _percentiles(read_latencies),
+    }
+
+
+async def _run(args) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    for interval in args.snapshot_intervals:
+        print(json.dumps(await _measure(interval, args)))
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--versions", type=int, default=200)
+    parser.add_argument("--text-kb", type=int, default=500, help="Size of the first version")
+    parser.add_argument("--edits", type=int, default=5, help="Lines changed per version")
+    parser.add_argument("--snapshot-intervals", type=int, nargs="+", default=[1, 10, 20, 50])
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Test configuration. Run from backend/ with `python -m pytest`.
+
+Tests run against a throwaway SQLite database and storage directory, with
+no OpenAI key (summaries use the offline fallback) and no in-process worker.
+The environment is set before any app module is imported, since settings
+are read at import time.
+"""
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="claim-agent-tests-")
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_tmp}/test.db",
+    DATABASE_REPLICA_URL="",
+    STORAGE_BACKEND="local",
+    STORAGE_PATH=os.path.join(_tmp, "storage"),
+    EMBEDDING_BACKEND="hashing",
+    EMBEDDING_INDEX_PATH=os.path.join(_tmp, "embeddings"),
+    CACHE_BACKEND="memory",
+    OPENAI_API_KEY="",
+    TASK_WORKER_IN_API="false",
+    LOG_REQUESTS="false",
+)
+
+import pytest  # noqa: E402
+from app.core.database import AsyncSessionLocal, Base, engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def db():
+    """A session on empty tables, with the stub user (id 1)."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        # SQLite doesn't enforce foreign keys here, so the order doesn't matter
+        for table in Base.metadata.tables.values():
+            await conn.execute(table.delete())
+    async with AsyncSessionLocal() as session:
+        session.add(User(id=1, email="user@example.com"))
+        await session.commit()
+        yield session
@@ -0,0 +1,52 @@
+"""Tests for delta_service: deltas must rebuild the target exactly."""
+import random
+import pytest
+from app.services.delta_service import apply_delta, encode_delta
+
+LINES = ["alpha\n", "beta\n", "gamma\n", "delta\n", "\n", "a longer line of prose, repeated\n", "x"]
+
+
+def _random_text(rng: random.Random, lines: int) -> str:
+    return "".join(rng.choice(LINES) for _ in range(lines))
+
+
+def _edit(rng: random.Random, text: str) -> str:
+    lines = text.splitlines(keepends=True)
+    for _ in range(rng.randint(0, 6)):
+        position = rng.randint(0, len(lines))
+        action = rng.choice(["insert", "delete", "replace"])
+        if action == "insert" or not lines:
+            lines.insert(position, rng.choice(LINES + ["new text\n", "no newline"]))
+        elif action == "delete":
+            del lines[min(position, len(lines) - 1)]
+        else:
+            lines[min(position, len(lines) - 1)] = rng.choice(LINES) + "edited\n"
+    return "".join(lines)
+
+
+@pytest.mark.parametrize("base, target", [
+    ("", ""),
+    ("", "new\n"),
+    ("old\n", ""),
+    ("same\ntext\n", "same\ntext\n"),
+    ("no trailing newline", "no trailing newline\nnow there is\n"),
+    ("windows\r\nlines\r\n", "windows\r\nchanged\r\n"),
+    ("unicode separator\n", "unicode separated\n"),
+    ("a\nb\nc\n" * 50, "a\nb\nc\n" * 25 + "inserted\n" + "a\nb\nc\n" * 25),
+])
+def test_round_trip(base, target):
+    assert apply_delta(base, encode_delta(base, target)) == target
+
+
+def test_random_edits_round_trip():
+    rng = random.Random(1234)
+    for _ in range(500):
+        base = _random_text(rng, rng.randint(0, 40))
+        target = _edit(rng, base)
+        assert apply_delta(base, encode_delta(base, target)) == target
+
+
+def test_small_edit_makes_small_delta():
+    base = "".join(f"line {number} of a long document\n" for number in range(5000))
+    target = base.replace("line 2500 of", "line 2500 (edited) of")
+    assert len(encode_delta(base, target)) < 200
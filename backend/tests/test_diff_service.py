@@ -0,0 +1,74 @@
+"""Tests for diff_service: opcodes and hunks must describe the change exactly."""
+import random
+from app.core.config import settings
+from app.services.diff_service import compute_diff, compute_unified_diff, diff_sequences
+
+
+def _apply_opcodes(a, b, opcodes):
+    """Rebuild b from a using only the opcodes (and b's inserted items)."""
+    result = []
+    i = j = 0
+    for tag, i1, i2, j1, j2 in opcodes:
+        assert (i1, j1) == (i, j), "opcodes must be contiguous"
+        if tag == "equal":
+            assert list(a[i1:i2]) == list(b[j1:j2])
+            result.extend(a[i1:i2])
+        else:
+            assert tag in ("replace", "delete", "insert")
+            assert (tag == "delete") == (j1 == j2) and (tag == "insert") == (i1 == i2)
+            result.extend(b[j1:j2])
+        i, j = i2, j2
+    assert (i, j) == (len(a), len(b)), "opcodes must cover both sequences"
+    return result
+
+
+def test_random_sequences():
+    rng = random.Random(42)
+    for _ in range(1000):
+        alphabet = "abcde"[:rng.randint(1, 5)]
+        a = [rng.choice(alphabet) for _ in range(rng.randint(0, 30))]
+        b = [rng.choice(alphabet) for _ in range(rng.randint(0, 30))]
+        assert _apply_opcodes(a, b, diff_sequences(a, b)) == b
+
+
+def test_identical_sequences_are_one_equal_block():
+    lines = ["x\n"] * 100
+    assert diff_sequences(lines, lines) == [("equal", 0, 100, 0, 100)]
+
+
+def test_full_context_hunk_rebuilds_both_texts():
+    rng = random.Random(7)
+    words = ["claim\n", "policy\n", "damage\n", "roof\n", "\n"]
+    for _ in range(200):
+        old = "".join(rng.choice(words) for _ in range(rng.randint(1, 30)))
+        new = "".join(rng.choice(words) for _ in range(rng.randint(1, 30)))
+        diff = compute_diff(old, new, context=10 ** 6)
+        if old == new:
+            assert diff["hunks"] == [] and diff["unified"] == ""
+            continue
+        [hunk] = diff["hunks"]
+        assert [line["text"] for line in hunk["lines"] if line["op"] != "insert"] == old.splitlines()
+        assert [line["text"] for line in hunk["lines"] if line["op"] != "delete"] == new.splitlines()
+        assert diff["stats"]["added"] == sum(line["op"] == "insert" for line in hunk["lines"])
+        assert diff["stats"]["removed"] == sum(line["op"] == "delete" for line in hunk["lines"])
+
+
+def test_word_segments_mark_the_changed_word():
+    diff = compute_diff("The roof was damaged.\n", "The fence was damaged.\n")
+    deleted, inserted = diff["hunks"][0]["lines"]
+    assert {"op": "delete", "text": "roof"} in deleted["segments"]
+    assert {"op": "insert", "text": "fence"} in inserted["segments"]
+
+
+def test_unified_diff_format():
+    assert compute_unified_diff("a\nb\n", "a\nc\n", "old", "new") == "--- old\n+++ new\n@@ -1,2 +1,2 @@\n a\n-b\n+c\n"
+    assert compute_unified_diff("a", "b") == "--- old\n+++ new\n@@ -1 +1 @@\n-a\n\\ No newline at end of file\n+b\n\\ No newline at end of file\n"
+    assert compute_unified_diff("same\n", "same\n") == ""
+
+
+def test_too_large_inputs_get_counts_only(monkeypatch):
+    monkeypatch.setattr(settings, "DIFF_MAX_INPUT_CHARS", 10)
+    diff = compute_diff("a\nb\nc\n", "a\nc\nd\ne\n")
+    assert diff["hunks"] == [] and diff["unified"] == ""
+    assert diff["stats"]["too_large"]
+    assert (diff["stats"]["added"], diff["stats"]["removed"]) == (2, 1)
@@ -0,0 +1,43 @@
+"""Tests for the LLM client's limits."""
+import pytest
+from app.core.config import settings
+from app.services.llm_service import LLMClient, TokenBucket
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(settings, "LLM_MAX_CONCURRENCY", 8)
+    monkeypatch.setattr(settings, "LLM_REQUESTS_PER_MINUTE", 600)
+    monkeypatch.setattr(settings, "LLM_TOKENS_PER_MINUTE", 0)
+    return monkeypatch
+
+
+async def test_memory_limiter_splits_the_limits_between_processes(limits):
+    limits.setattr(settings, "LLM_LIMITER_PROCESSES", 4)
+    client = LLMClient()
+    try:
+        assert client.max_concurrency == 2
+        assert isinstance(client._request_bucket, TokenBucket)
+        assert client._request_bucket.rate == pytest.approx(2.5)
+        assert client._token_bucket is None
+        assert client.get_metrics()["limiter"] == "memory"
+    finally:
+        await client.close()
+
+
+async def test_concurrency_never_drops_to_zero(limits):
+    limits.setattr(settings, "LLM_LIMITER_PROCESSES", 20)
+    client = LLMClient()
+    try:
+        assert client.max_concurrency == 1
+    finally:
+        await client.close()
+
+
+async def test_unknown_limiter_backend(limits):
+    limits.setattr(settings, "LLM_LIMITER_BACKEND", "etcd")
+    with pytest.raises(ValueError):
+        LLMClient()
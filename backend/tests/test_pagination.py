@@ -0,0 +1,53 @@
+"""Tests for keyset pagination and its cursors."""
+import base64
+from datetime import datetime, timezone
+import pytest
+from sqlalchemy import select
+from app.core.pagination import InvalidCursorError, decode_cursor, encode_cursor, paginate
+from app.models.claim import Claim
+
+
+def _b64(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 10, 17, 9, 30, 15, 123456, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor!",
+    "é",
+    _b64("not json"),
+    _b64("5"),
+    _b64('"ab"'),
+    _b64("[1, 2, 3]"),
+    _b64('{"a": 1, "b": 2}'),
+    _b64('[null, 1]'),
+    _b64('["yesterday", 1]'),
+    _b64('["2026-10-17T09:30:15", [1]]'),
+    _b64('["2026-10-17T09:30:15", "x"]'),
+    pytest.param(_b64("[" * 100000), id="deeply-nested"),
+])
+def test_invalid_cursors_raise(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("order", ["desc", "asc"])
+async def test_pages_cover_every_row_once(db, order):
+    for number in range(7):
+        db.add(Claim(owner_user_id=1, title=f"Claim {number}"))
+    await db.commit()
+    expected = sorted((await db.execute(select(Claim.id))).scalars().all(), reverse=order == "desc")
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = await paginate(db, select(Claim), Claim, cursor, limit=3, order=order)
+        seen.extend(row.id for row in rows)
+        if cursor is None:
+            break
+    assert seen == expected
@@ -0,0 +1,91 @@
+"""Tests for accepting proposals when two accepts race, and for pruning stale ones."""
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import select, update
+from app.core.database import AsyncSessionLocal
+from app.models.blob import Blob
+from app.models.claim import Claim
+from app.models.file import File
+from app.models.proposal import Proposal, PROPOSAL_ACCEPTED
+from app.schemas.agent import ProposalDraft
+from app.services import file_service, proposal_service
+from app.services.proposal_service import ProposalConflictError
+
+pytestmark = pytest.mark.anyio
+
+OLD_TEXT = "Incident on 3 March.\n"
+NEW_TEXT = "Incident on 4 March.\n"
+
+
+async def _file_proposal(db):
+    claim = Claim(owner_user_id=1, title="Claim")
+    db.add(claim)
+    await db.flush()
+    file = File(claim_id=claim.id, filename="notes.txt", storage_path="", mime_type="text/plain")
+    db.add(file)
+    await db.commit()
+    await file_service.update_file_content(db, file, OLD_TEXT)
+    [proposal] = await proposal_service.create_proposals(db, claim.id, [ProposalDraft(
+        type="file", target_id=file.id, target_name=file.filename, old_content=OLD_TEXT, new_content=NEW_TEXT
+    )])
+    return claim.id, file.id, proposal.id
+
+
+async def _accept(db, claim_id: int, file_id: int, proposal) -> None:
+    file = await file_service.get_file_with_claim_check(db, file_id, claim_id, with_text=True, for_update=True)
+    new_content = proposal_service.apply_proposal(proposal, file.extracted_text)
+    await proposal_service.mark_accepted(db, proposal)
+    await file_service.update_file_content(db, file, new_content)
+
+
+async def test_second_accept_of_a_stale_proposal_writes_nothing(db):
+    claim_id, file_id, proposal_id = await _file_proposal(db)
+    # Both requests loaded the proposal while it was still pending
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        first_view = await proposal_service.get_proposal(first, proposal_id, claim_id, with_delta=True)
+        second_view = await proposal_service.get_proposal(second, proposal_id, claim_id, with_delta=True)
+        await _accept(first, claim_id, file_id, first_view)
+        with pytest.raises(ProposalConflictError):
+            await _accept(second, claim_id, file_id, second_view)
+        await second.rollback()
+
+    blobs = (await db.execute(select(Blob).execution_options(populate_existing=True))).scalars().all()
+    assert sorted(blob.ref_count for blob in blobs) == [1]
+    file = (await db.execute(
+        select(File).where(File.id == file_id).execution_options(populate_existing=True)
+    )).scalar_one()
+    assert file.blob_id == blobs[0].id
+
+
+async def test_status_flips_once(db):
+    claim_id, _, proposal_id = await _file_proposal(db)
+    async with AsyncSessionLocal() as first, AsyncSessionLocal() as second:
+        first_view = await proposal_service.get_proposal(first, proposal_id, claim_id)
+        second_view = await proposal_service.get_proposal(second, proposal_id, claim_id)
+        await proposal_service.mark_accepted(first, first_view)
+        await first.commit()
+        with pytest.raises(ProposalConflictError):
+            await proposal_service.mark_accepted(second, second_view)
+        await second.rollback()
+
+    proposal = await proposal_service.get_proposal(db, proposal_id, claim_id)
+    assert proposal.status == PROPOSAL_ACCEPTED
+
+
+async def test_prune_deletes_expired_and_superseded_pending_proposals(db):
+    claim_id, file_id, superseded_id = await _file_proposal(db)
+    draft = ProposalDraft(type="file", target_id=file_id, target_name="notes.txt", old_content=OLD_TEXT, new_content="x\n")
+    accepted, old, recent = await proposal_service.create_proposals(db, claim_id, [draft, draft, draft])
+    await proposal_service.mark_accepted(db, accepted)
+    await db.execute(
+        update(Proposal).where(Proposal.id == old.id)
+        .values(created_at=datetime.now(timezone.utc) - timedelta(days=400))
+    )
+    await db.commit()
+
+    # `old` is pending and past retention; `superseded` is older than the accepted one for its file
+    assert await proposal_service.prune_proposals(db, batch_size=1) == 2
+    remaining = (await db.execute(select(Proposal.id).order_by(Proposal.id))).scalars().all()
+    assert remaining == [accepted.id, recent.id]
+    assert superseded_id < accepted.id
+    assert await proposal_service.prune_proposals(db) == 0
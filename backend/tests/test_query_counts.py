@@ -0,0 +1,12 @@
+"""Statement budgets per endpoint (see benchmarks.query_counts)."""
+from benchmarks.query_counts import BUDGETS, count_queries
+
+
+def test_endpoints_stay_within_budget_however_many_files():
+    few = count_queries(files=2)
+    many = count_queries(files=12)
+    assert set(many) == set(BUDGETS)
+    over = {name: count for name, count in many.items() if count > BUDGETS[name]}
+    assert not over, f"Over budget: {over} (budgets: {BUDGETS})"
+    # N+1 queries would grow with the number of files
+    assert few == many
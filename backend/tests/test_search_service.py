@@ -0,0 +1,42 @@
+"""Tests for full-text search over artifact version history."""
+import pytest
+from app.core.database import engine
+from app.models.claim import Claim
+from app.schemas.artifact import ArtifactCreate
+from app.services import artifact_service, search_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def _summary_with_history(db, *contents):
+    async with engine.begin() as conn:
+        await conn.run_sync(search_service.create_sqlite_index)
+    claim = Claim(owner_user_id=1, title="Claim")
+    db.add(claim)
+    await db.commit()
+    artifact = await artifact_service.create_artifact(
+        db, ArtifactCreate(type="summary", title="Summary"), claim.id, content=contents[0]
+    )
+    versions = [artifact.current_version]
+    for content in contents[1:]:
+        artifact = await artifact_service.get_artifact_for_update(db, artifact.id, claim.id)
+        versions.append(await artifact_service.create_artifact_version(db, artifact, content))
+    return versions
+
+
+async def test_all_versions_finds_text_only_in_delta_versions(db):
+    shared = "".join(f"Line {n} of the medical history.\n" for n in range(40))
+    v1, v2 = await _summary_with_history(
+        db, shared + "The claimant reported whiplash.\n", shared + "The claimant reported a fracture.\n"
+    )
+    assert v1.base_version_id == v2.id  # v1 is stored as a delta
+
+    current, _ = await search_service.search(db, 1, "whiplash")
+    assert current == []
+    history, _ = await search_service.search(db, 1, "whiplash", all_versions=True)
+    assert [hit["id"] for hit in history] == [v1.id]
+    assert "<mark>whiplash</mark>" in history[0]["snippet"]
+
+    # Text shared with the newer version is found there
+    history, _ = await search_service.search(db, 1, "medical", all_versions=True)
+    assert [hit["id"] for hit in history] == [v2.id]
@@ -0,0 +1,115 @@
+"""Tests for the task queue: claiming, completing, failing and taking back expired leases."""
+from datetime import timedelta
+import pytest
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.models.task import Task, TASK_DEAD, TASK_DONE, TASK_QUEUED, TASK_RUNNING
+from app.services import task_service
+
+pytestmark = pytest.mark.anyio
+
+
+async def _reload(db, task: Task) -> Task:
+    return (await db.execute(
+        select(Task).where(Task.id == task.id).execution_options(populate_existing=True)
+    )).scalar_one()
+
+
+async def test_claims_highest_priority_first(db):
+    low = await task_service.enqueue(db, "job", {"n": 1}, priority=0)
+    high = await task_service.enqueue(db, "job", {"n": 2}, priority=10)
+    other = await task_service.enqueue(db, "other", {"n": 3}, priority=5)
+    await db.commit()
+
+    claimed = await task_service.claim_tasks(db, "worker-a", limit=2)
+    assert [task.id for task in claimed] == [high.id, other.id]
+    assert all(task.status == TASK_RUNNING and task.attempts == 1 and task.locked_by == "worker-a" for task in claimed)
+    assert [task.id for task in await task_service.claim_tasks(db, "worker-b", limit=5)] == [low.id]
+    assert await task_service.claim_tasks(db, "worker-b", limit=5) == []
+
+
+async def test_claims_only_requested_kinds_and_due_tasks(db):
+    wanted = await task_service.enqueue(db, "wanted", {})
+    await task_service.enqueue(db, "unwanted", {})
+    later = await task_service.enqueue(db, "wanted", {})
+    later.run_at = later.run_at + timedelta(hours=1)
+    await db.commit()
+
+    claimed = await task_service.claim_tasks(db, "worker", limit=10, kinds=["wanted"])
+    assert [task.id for task in claimed] == [wanted.id]
+
+
+async def test_complete_requires_the_lease(db):
+    await task_service.enqueue(db, "job", {})
+    await db.commit()
+    [task] = await task_service.claim_tasks(db, "worker-a", limit=1)
+
+    assert not await task_service.complete_task(db, task, "worker-b", {"ok": False})
+    assert await task_service.complete_task(db, task, "worker-a", {"ok": True})
+    task = await _reload(db, task)
+    assert task.status == TASK_DONE and task.result == {"ok": True} and task.locked_by is None
+
+
+async def test_failures_back_off_then_dead_letter(db):
+    await task_service.enqueue(db, "job", {}, max_attempts=2)
+    await db.commit()
+
+    [task] = await task_service.claim_tasks(db, "worker", limit=1)
+    assert await task_service.fail_task(db, task, "worker", "first") == TASK_QUEUED
+    task = await _reload(db, task)
+    assert task.last_error == "first" and task.locked_by is None
+
+    # Make the retry due now rather than after its backoff
+    await db.execute(update(Task).where(Task.id == task.id).values(run_at=task_service._utcnow()))
+    await db.commit()
+    [task] = await task_service.claim_tasks(db, "worker", limit=1)
+    assert task.attempts == 2
+    assert await task_service.fail_task(db, task, "worker", "x" * 10000) == TASK_DEAD
+    task = await _reload(db, task)
+    assert task.status == TASK_DEAD and len(task.last_error) == task_service.MAX_ERROR_LENGTH
+    assert await task_service.claim_tasks(db, "worker", limit=1) == []
+
+    assert await task_service.retry_task(db, task)
+    assert (task.status, task.attempts) == (TASK_QUEUED, 0)
+    assert not await task_service.retry_task(db, task)
+
+
+async def test_retry_delay_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "TASK_RETRY_BASE_DELAY_SECONDS", 1.0)
+    monkeypatch.setattr(settings, "TASK_RETRY_MAX_DELAY_SECONDS", 30.0)
+    assert all(0 <= task_service.retry_delay(1) <= 1.0 for _ in range(100))
+    assert all(0 <= task_service.retry_delay(50) <= 30.0 for _ in range(100))
+
+
+async def test_expired_leases_are_requeued_or_dead_lettered(db):
+    await task_service.enqueue(db, "job", {"n": 1}, max_attempts=3)
+    await task_service.enqueue(db, "job", {"n": 2}, max_attempts=1)
+    await db.commit()
+    retried, exhausted = await task_service.claim_tasks(db, "dead-worker", limit=2)
+
+    assert await task_service.requeue_expired(db) == 0
+    await db.execute(
+        update(Task).values(locked_until=task_service._utcnow() - timedelta(seconds=1))
+    )
+    await db.commit()
+    assert await task_service.requeue_expired(db) == 2
+
+    retried, exhausted = await _reload(db, retried), await _reload(db, exhausted)
+    assert retried.status == TASK_QUEUED and retried.locked_by is None
+    assert exhausted.status == TASK_DEAD and "Lease expired" in exhausted.last_error
+    # The worker that lost its lease can no longer finish the task
+    assert not await task_service.complete_task(db, retried, "dead-worker")
+    assert await task_service.renew_lease(db, retried.id, "dead-worker") is False
+
+
+async def test_queue_stats(db):
+    await task_service.enqueue(db, "a", {})
+    await task_service.enqueue(db, "a", {})
+    await task_service.enqueue(db, "b", {})
+    await db.commit()
+    await task_service.claim_tasks(db, "worker", limit=1, kinds=["b"])
+
+    stats = await task_service.get_queue_stats(db)
+    assert (stats["queued"], stats["running"], stats["dead"]) == (2, 1, 0)
+    assert stats["by_kind"] == {"a": {TASK_QUEUED: 2}, "b": {TASK_RUNNING: 1}}
+    assert stats["oldest_queued_seconds"] >= 0
@@ -0,0 +1,5 @@
+#!/bin/sh
+# Let the postgres-replica service stream WAL from this primary.
+# Runs once, when the primary's data volume is first initialized.
+set -e
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -12,6 +12,7 @@ interface Message {
   role: 'user' | 'agent';
   content: string;
   proposals?: Proposal[];
+  streaming?: boolean;  // Summary text still arriving
 }
 
 export function AgentChat({ claimId, onAccept }: AgentChatProps) {
@@ -34,9 +35,10 @@ export function AgentChat({ claimId, onAccept }: AgentChatProps) {
       const response = await agentApi.chat(claimId, { message: input });
       const agentMessage: Message = {
         role: 'agent',
-        content: response.proposals.length > 0
-          ? `I found ${response.proposals.length} proposal(s) for you to review.`
-          : 'I couldn\'t understand that command. Try "create a summary" or "update file".',
+        content: response.reply
+          ?? (response.proposals.length > 0
+            ? `I found ${response.proposals.length} proposal(s) for you to review.`
+            : 'I couldn\'t find anything to change. Try "create a summary" or "update file".'),
         proposals: response.proposals,
       };
       setMessages((prev) => [...prev, agentMessage]);
@@ -62,23 +64,28 @@ export function AgentChat({ claimId, onAccept }: AgentChatProps) {
     };
     setMessages((prev) => [...prev, userMessage]);
 
+    // Placeholder agent message that fills in as the summary streams
+    // (only one summary streams at a time, guarded by `loading`)
+    setMessages((prev) => [...prev, { role: 'agent', content: '', streaming: true }]);
+    const updateStreamMessage = (update: (msg: Message) => Message) => {
+      setMessages((prev) => prev.map((msg) => (msg.streaming ? update(msg) : msg)));
+    };
+
     try {
-      const response = await agentApi.generateSummary(claimId);
-      const agentMessage: Message = {
+      const proposal = await agentApi.generateSummaryStream(claimId, (text) => {
+        updateStreamMessage((msg) => ({ ...msg, content: msg.content + text }));
+      });
+      updateStreamMessage(() => ({
         role: 'agent',
-        content: response.proposals.length > 0
-          ? `Generated summary proposal. Review the changes below.`
-          : 'No summary could be generated. Make sure you have uploaded files.',
-        proposals: response.proposals,
-      };
-      setMessages((prev) => [...prev, agentMessage]);
+        content: 'Generated summary proposal. Review the changes below.',
+        proposals: [proposal],
+      }));
     } catch (error) {
       console.error('Failed to generate summary:', error);
-      const errorMessage: Message = {
+      updateStreamMessage(() => ({
         role: 'agent',
         content: 'Sorry, I encountered an error generating the summary.',
-      };
-      setMessages((prev) => [...prev, errorMessage]);
+      }));
     } finally {
       setLoading(false);
     }
@@ -86,7 +93,7 @@ export function AgentChat({ claimId, onAccept }: AgentChatProps) {
 
   const handleAccept = async (proposal: Proposal) => {
     try {
-      await agentApi.accept(claimId, { proposal });
+      await agentApi.accept(claimId, { proposal_id: proposal.id });
       const acceptMessage: Message = {
         role: 'agent',
         content: `Accepted changes to ${proposal.target_name}.`,
@@ -158,7 +165,13 @@ export function AgentChat({ claimId, onAccept }: AgentChatProps) {
             <div style={{ fontWeight: '500', color: '#213547', marginBottom: '0.5rem' }}>
               {msg.role === 'user' ? 'You' : 'Agent'}:
             </div>
-            <p style={{ margin: 0, color: '#213547' }}>{msg.content}</p>
+            {msg.streaming ? (
+              <pre style={{ margin: 0, color: '#213547', whiteSpace: 'pre-wrap', fontFamily: 'inherit' }}>
+                {msg.content || '...'}
+              </pre>
+            ) : (
+              <p style={{ margin: 0, color: '#213547' }}>{msg.content}</p>
+            )}
             {msg.proposals && msg.proposals.length > 0 && (
               <div style={{ marginTop: '1rem' }}>
                 {msg.proposals.map((proposal, pIdx) => (
@@ -184,7 +197,7 @@ export function AgentChat({ claimId, onAccept }: AgentChatProps) {
             )}
           </div>
         ))}
-        {loading && (
+        {loading && !messages.some((msg) => msg.streaming) && (
           <div style={{ color: '#666', fontStyle: 'italic', margin: 0 }}>Agent is thinking...</div>
         )}
       </div>
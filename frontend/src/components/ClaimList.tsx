@@ -5,7 +5,9 @@ import type { Claim } from '../types';
 
 export function ClaimList() {
   const [claims, setClaims] = useState<Claim[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [showCreateForm, setShowCreateForm] = useState(false);
   const [title, setTitle] = useState('');
   const [referenceNumber, setReferenceNumber] = useState('');
@@ -18,8 +20,9 @@ export function ClaimList() {
   const loadClaims = async () => {
     try {
       setLoading(true);
-      const data = await claimsApi.list();
-      setClaims(data);
+      const page = await claimsApi.list();
+      setClaims(page.items);
+      setNextCursor(page.next_cursor);
     } catch (error) {
       console.error('Failed to load claims:', error);
       alert('Failed to load claims');
@@ -28,6 +31,21 @@ export function ClaimList() {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await claimsApi.list({ cursor: nextCursor });
+      setClaims(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Failed to load claims:', error);
+      alert('Failed to load claims');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCreate = async (e: React.FormEvent) => {
     e.preventDefault();
     try {
@@ -122,6 +140,13 @@ export function ClaimList() {
           ))}
         </ul>
       )}
+      {nextCursor && (
+        <div style={{ textAlign: 'center', marginTop: '1rem' }}>
+          <button onClick={loadMore} disabled={loadingMore}>
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
     </div>
   );
 }
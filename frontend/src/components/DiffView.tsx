@@ -1,4 +1,4 @@
-import type { Proposal } from '../types';
+import type { ContextReport, DiffHunk, DiffLine, DiffStats, Proposal } from '../types';
 
 interface DiffViewProps {
   proposal: Proposal;
@@ -8,58 +8,110 @@ export function DiffView({ proposal }: DiffViewProps) {
   return (
     <div style={{ marginTop: '20px' }}>
       <h4>Proposed Changes to: {proposal.target_name}</h4>
-      <div style={{ display: 'grid', gridTemplateColumns: '1fr 1fr', gap: '10px', marginBottom: '20px' }}>
-        <div>
-          <h5 style={{ marginBottom: '10px' }}>Current</h5>
-          <pre
-            style={{
-              padding: '10px',
-              backgroundColor: '#f5f5f5',
-              border: '1px solid #ddd',
-              borderRadius: '4px',
-              overflow: 'auto',
-              maxHeight: '400px',
-              fontSize: '0.9em',
-            }}
-          >
-            {proposal.old_content || '(empty)'}
-          </pre>
-        </div>
-        <div>
-          <h5 style={{ marginBottom: '10px' }}>Proposed</h5>
-          <pre
-            style={{
-              padding: '10px',
-              backgroundColor: '#f0f8ff',
-              border: '1px solid #ddd',
-              borderRadius: '4px',
-              overflow: 'auto',
-              maxHeight: '400px',
-              fontSize: '0.9em',
-            }}
-          >
-            {proposal.new_content}
-          </pre>
-        </div>
-      </div>
+      {proposal.context_report && <ContextSummary report={proposal.context_report} />}
       <div>
-        <h5 style={{ marginBottom: '10px' }}>Diff</h5>
-        <pre
-          style={{
-            padding: '10px',
-            backgroundColor: '#f9f9f9',
-            border: '1px solid #ddd',
-            borderRadius: '4px',
-            overflow: 'auto',
-            maxHeight: '300px',
-            fontSize: '0.85em',
-            fontFamily: 'monospace',
-          }}
-        >
-          {proposal.diff || 'No differences'}
-        </pre>
+        <h5 style={{ marginBottom: '10px' }}>
+          Diff
+          <DiffStatsLabel stats={proposal.diff_stats} />
+        </h5>
+        {proposal.diff_stats.too_large ? (
+          <p style={{ color: '#666', fontSize: '0.9em' }}>
+            Too large to show line by line ({proposal.diff_stats.old_lines} lines now,{' '}
+            {proposal.diff_stats.new_lines} proposed).
+          </p>
+        ) : (
+          <HunkList hunks={proposal.hunks} />
+        )}
       </div>
     </div>
   );
 }
 
+const LINE_STYLES: Record<DiffLine['op'], { prefix: string; background: string; highlight: string }> = {
+  context: { prefix: ' ', background: 'transparent', highlight: 'transparent' },
+  delete: { prefix: '-', background: '#ffebe9', highlight: '#ffb3ad' },
+  insert: { prefix: '+', background: '#e6ffec', highlight: '#99e2a8' },
+};
+
+function DiffStatsLabel({ stats }: { stats: DiffStats }) {
+  return (
+    <span style={{ marginLeft: '8px', fontWeight: 'normal', fontSize: '0.85em', color: '#666' }}>
+      <span style={{ color: '#1a7f37' }}>+{stats.added}</span>{' '}
+      <span style={{ color: '#d1242f' }}>-{stats.removed}</span>
+      {stats.too_large ? ' lines (approximate)' : ` lines in ${stats.hunks} hunk(s)`}
+    </span>
+  );
+}
+
+// Hunks with line numbers, and changed words highlighted within paired lines
+export function HunkList({ hunks }: { hunks: DiffHunk[] }) {
+  if (hunks.length === 0) {
+    return <p style={{ color: '#666', fontSize: '0.9em' }}>No differences</p>;
+  }
+  return (
+    <div
+      style={{
+        border: '1px solid #ddd',
+        borderRadius: '4px',
+        overflow: 'auto',
+        maxHeight: '300px',
+        fontSize: '0.85em',
+        fontFamily: 'monospace',
+        backgroundColor: '#f9f9f9',
+      }}
+    >
+      {hunks.map((hunk, index) => (
+        <div key={index}>
+          <div style={{ padding: '2px 10px', backgroundColor: '#ddf4ff', color: '#555' }}>
+            @@ -{hunk.old_start},{hunk.old_lines} +{hunk.new_start},{hunk.new_lines} @@
+          </div>
+          {hunk.lines.map((line, lineIndex) => {
+            const style = LINE_STYLES[line.op];
+            return (
+              <div key={lineIndex} style={{ display: 'flex', backgroundColor: style.background, whiteSpace: 'pre' }}>
+                <span style={{ width: '4em', flexShrink: 0, textAlign: 'right', paddingRight: '4px', color: '#999' }}>
+                  {line.old_number ?? ''}
+                </span>
+                <span style={{ width: '4em', flexShrink: 0, textAlign: 'right', paddingRight: '8px', color: '#999' }}>
+                  {line.new_number ?? ''}
+                </span>
+                <span>
+                  {style.prefix}
+                  {line.segments
+                    ? line.segments.map((segment, segmentIndex) => (
+                        <span
+                          key={segmentIndex}
+                          style={{ backgroundColor: segment.op === 'equal' ? 'transparent' : style.highlight }}
+                        >
+                          {segment.text}
+                        </span>
+                      ))
+                    : line.text}
+                </span>
+              </div>
+            );
+          })}
+        </div>
+      ))}
+    </div>
+  );
+}
+
+
+
+// One-line account of which documents went into the prompt, with per-file detail on hover
+function ContextSummary({ report }: { report: ContextReport }) {
+  const shortened = report.files.filter((f) => f.status === 'truncated' || f.status === 'dropped');
+  const strategy = report.strategy === 'map_reduce' ? 'summarized in parts' : 'sent directly';
+  const detail = report.files
+    .map((f) => `${f.filename}: ${f.status} (${f.included_tokens}/${f.tokens} tokens)`)
+    .join('\n');
+  return (
+    <p style={{ margin: '0 0 10px', fontSize: '0.85em', color: '#666' }} title={detail}>
+      Context: {report.files.length} file(s) {strategy}, {report.used_tokens.toLocaleString()} of{' '}
+      {report.budget_tokens.toLocaleString()} tokens
+      {shortened.length > 0 && ` (truncated or dropped: ${shortened.map((f) => f.filename).join(', ')})`}
+      {report.removed_files.length > 0 && ` (removed since last summary: ${report.removed_files.join(', ')})`}
+    </p>
+  );
+}
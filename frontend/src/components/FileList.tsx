@@ -1,6 +1,6 @@
 import { useState, useEffect } from 'react';
 import { filesApi } from '../services/api';
-import type { File } from '../types';
+import type { FileListItem } from '../types';
 
 interface FileListProps {
   claimId: number;
@@ -8,8 +8,10 @@ interface FileListProps {
 }
 
 export function FileList({ claimId, onDelete }: FileListProps) {
-  const [files, setFiles] = useState<File[]>([]);
+  const [files, setFiles] = useState<FileListItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [deleting, setDeleting] = useState<number | null>(null);
 
   useEffect(() => {
@@ -19,8 +21,9 @@ export function FileList({ claimId, onDelete }: FileListProps) {
   const loadFiles = async () => {
     try {
       setLoading(true);
-      const data = await filesApi.list(claimId);
-      setFiles(data);
+      const page = await filesApi.list(claimId);
+      setFiles(page.items);
+      setNextCursor(page.next_cursor);
     } catch (error) {
       console.error('Failed to load files:', error);
     } finally {
@@ -28,6 +31,20 @@ export function FileList({ claimId, onDelete }: FileListProps) {
     }
   };
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await filesApi.list(claimId, { cursor: nextCursor });
+      setFiles(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (error) {
+      console.error('Failed to load files:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleDelete = async (fileId: number) => {
     if (!confirm('Are you sure you want to delete this file?')) {
       return;
@@ -59,7 +76,7 @@ export function FileList({ claimId, onDelete }: FileListProps) {
 
   return (
     <div>
-      <h3 style={{ marginBottom: '1rem' }}>Files ({files.length})</h3>
+      <h3 style={{ marginBottom: '1rem' }}>Files ({files.length}{nextCursor ? '+' : ''})</h3>
       <ul style={{ listStyle: 'none', padding: 0, margin: 0 }}>
         {files.map((file) => (
           <li
@@ -102,6 +119,8 @@ export function FileList({ claimId, onDelete }: FileListProps) {
                 )}
                 {file.size_bytes && file.mime_type && <span> • </span>}
                 {file.mime_type && <span>{file.mime_type}</span>}
+                {file.extraction_status === 'pending' && <span> • extracting text...</span>}
+                {file.extraction_status === 'failed' && <span style={{ color: '#d32f2f' }}> • text extraction failed</span>}
               </div>
             </div>
             <div style={{ display: 'flex', gap: '0.5rem', alignItems: 'center' }}>
@@ -141,6 +160,11 @@ export function FileList({ claimId, onDelete }: FileListProps) {
           </li>
         ))}
       </ul>
+      {nextCursor && (
+        <button onClick={loadMore} disabled={loadingMore} style={{ marginTop: '0.5rem' }}>
+          {loadingMore ? 'Loading...' : 'Load more'}
+        </button>
+      )}
     </div>
   );
 }
@@ -19,9 +19,10 @@ export function SummaryView({ claimId }: SummaryViewProps) {
     try {
       setLoading(true);
       setError(null);
-      const artifacts = await artifactsApi.list(claimId);
-      const summaryArtifact = artifacts.find(a => a.type === 'summary');
-      setSummary(summaryArtifact || null);
+      // The list omits version content, so fetch the summary itself by id
+      const page = await artifactsApi.list(claimId, { type: 'summary', order: 'asc', limit: 1 });
+      const summaryItem = page.items[0];
+      setSummary(summaryItem ? await artifactsApi.get(claimId, summaryItem.id) : null);
     } catch (err: any) {
       console.error('Failed to load summary:', err);
       setError(err?.response?.data?.detail || 'Failed to load summary');
@@ -3,10 +3,24 @@ import axios from 'axios';
 import type {
   Claim,
   File as FileType,
+  FileListItem,
   Artifact,
+  ArtifactListItem,
+  ArtifactVersion,
+  ArtifactVersionListItem,
+  ArtifactVersionDiff,
+  Page,
+  PageParams,
   AgentChatRequest,
   AgentChatResponse,
   AgentAcceptRequest,
+  Proposal,
+  SummaryJob,
+  SummaryJobCreate,
+  SummaryJobItem,
+  SummaryJobItemStatus,
+  Task,
+  TaskStatus,
 } from '../types';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000/api/v1';
@@ -20,8 +34,8 @@ const api = axios.create({
 
 // Claims API
 export const claimsApi = {
-  list: async (): Promise<Claim[]> => {
-    const response = await api.get<Claim[]>('/claims');
+  list: async (params?: PageParams & { reference_prefix?: string }): Promise<Page<Claim>> => {
+    const response = await api.get<Page<Claim>>('/claims', { params });
     return response.data;
   },
 
@@ -38,8 +52,8 @@ export const claimsApi = {
 
 // Files API
 export const filesApi = {
-  list: async (claimId: number): Promise<FileType[]> => {
-    const response = await api.get<FileType[]>(`/claims/${claimId}/files`);
+  list: async (claimId: number, params?: PageParams & { mime_type?: string }): Promise<Page<FileListItem>> => {
+    const response = await api.get<Page<FileListItem>>(`/claims/${claimId}/files`, { params });
     return response.data;
   },
 
@@ -59,7 +73,7 @@ export const filesApi = {
   },
 
   getDownloadUrl: (claimId: number, fileId: number): string => {
-    return `${API_BASE_URL}/claims/${claimId}/files/${fileId}`;
+    return `${API_BASE_URL}/claims/${claimId}/files/${fileId}/content`;
   },
 };
 
@@ -80,6 +94,78 @@ export const agentApi = {
     return response.data;
   },
 
+  // Streams the summary as Server-Sent Events: onToken is called with each
+  // chunk of text as it arrives, and the promise resolves with the final proposal.
+  generateSummaryStream: async (
+    claimId: number,
+    onToken: (text: string) => void
+  ): Promise<Proposal> => {
+    const response = await fetch(`${API_BASE_URL}/claims/${claimId}/agent/generate-summary/stream`, {
+      method: 'POST',
+      headers: { Accept: 'text/event-stream' },
+    });
+    if (!response.ok || !response.body) {
+      let detail = `Request failed with status ${response.status}`;
+      try {
+        detail = (await response.json()).detail || detail;
+      } catch {
+        // Not a JSON error body
+      }
+      throw new Error(detail);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let proposal: Proposal | null = null;
+
+    const handleEvent = (frame: string) => {
+      let event = 'message';
+      const dataLines: string[] = [];
+      for (const line of frame.split('\n')) {
+        if (line.startsWith('event:')) {
+          event = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+          dataLines.push(line.slice(5).trimStart());
+        }
+      }
+      if (dataLines.length === 0) return;
+      const data = JSON.parse(dataLines.join('\n'));
+      if (event === 'token') {
+        onToken(data.text);
+      } else if (event === 'proposal') {
+        proposal = data as Proposal;
+      } else if (event === 'error') {
+        throw new Error(data.detail);
+      }
+    };
+
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        handleEvent(buffer.slice(0, boundary));
+        buffer = buffer.slice(boundary + 2);
+        boundary = buffer.indexOf('\n\n');
+      }
+    }
+    if (buffer.trim()) {
+      handleEvent(buffer);
+    }
+
+    if (!proposal) {
+      throw new Error('Summary stream ended without a proposal');
+    }
+    return proposal;
+  },
+
+  getProposal: async (claimId: number, proposalId: number): Promise<Proposal> => {
+    const response = await api.get<Proposal>(`/claims/${claimId}/agent/proposals/${proposalId}`);
+    return response.data;
+  },
+
   accept: async (claimId: number, request: AgentAcceptRequest): Promise<any> => {
     const response = await api.post(`/claims/${claimId}/agent/accept`, request);
     return response.data;
@@ -88,8 +174,8 @@ export const agentApi = {
 
 // Artifacts API
 export const artifactsApi = {
-  list: async (claimId: number): Promise<Artifact[]> => {
-    const response = await api.get<Artifact[]>(`/claims/${claimId}/artifacts`);
+  list: async (claimId: number, params?: PageParams & { type?: string }): Promise<Page<ArtifactListItem>> => {
+    const response = await api.get<Page<ArtifactListItem>>(`/claims/${claimId}/artifacts`, { params });
     return response.data;
   },
 
@@ -97,5 +183,77 @@ export const artifactsApi = {
     const response = await api.get<Artifact>(`/claims/${claimId}/artifacts/${artifactId}`);
     return response.data;
   },
+
+  listVersions: async (claimId: number, artifactId: number, params?: PageParams): Promise<Page<ArtifactVersionListItem>> => {
+    const response = await api.get<Page<ArtifactVersionListItem>>(
+      `/claims/${claimId}/artifacts/${artifactId}/versions`,
+      { params }
+    );
+    return response.data;
+  },
+
+  getVersion: async (claimId: number, artifactId: number, versionId: number): Promise<ArtifactVersion> => {
+    const response = await api.get<ArtifactVersion>(`/claims/${claimId}/artifacts/${artifactId}/versions/${versionId}`);
+    return response.data;
+  },
+
+  diffVersions: async (
+    claimId: number,
+    artifactId: number,
+    fromVersionId: number,
+    toVersionId: number
+  ): Promise<ArtifactVersionDiff> => {
+    const response = await api.get<ArtifactVersionDiff>(`/claims/${claimId}/artifacts/${artifactId}/diff`, {
+      params: { from_version: fromVersionId, to_version: toVersionId },
+    });
+    return response.data;
+  },
 };
 
+// Summary jobs API
+export const summaryJobsApi = {
+  create: async (request: SummaryJobCreate): Promise<SummaryJob> => {
+    const response = await api.post<SummaryJob>('/summary-jobs', request);
+    return response.data;
+  },
+
+  list: async (params?: PageParams): Promise<Page<SummaryJob>> => {
+    const response = await api.get<Page<SummaryJob>>('/summary-jobs', { params });
+    return response.data;
+  },
+
+  get: async (jobId: number): Promise<SummaryJob> => {
+    const response = await api.get<SummaryJob>(`/summary-jobs/${jobId}`);
+    return response.data;
+  },
+
+  listItems: async (jobId: number, params?: PageParams & { status?: SummaryJobItemStatus }): Promise<Page<SummaryJobItem>> => {
+    const response = await api.get<Page<SummaryJobItem>>(`/summary-jobs/${jobId}/items`, { params });
+    return response.data;
+  },
+
+  // URL of the job's Server-Sent Events stream (`item` and `job` events), for an EventSource
+  eventsUrl: (jobId: number, after?: number): string =>
+    `${API_BASE_URL}/summary-jobs/${jobId}/events${after ? `?after=${after}` : ''}`,
+};
+
+// Background tasks API
+export const tasksApi = {
+  get: async (taskId: number): Promise<Task> => {
+    const response = await api.get<Task>(`/tasks/${taskId}`);
+    return response.data;
+  },
+
+  list: async (params?: PageParams & { status?: TaskStatus; kind?: string }): Promise<Page<Task>> => {
+    const response = await api.get<Page<Task>>('/tasks', { params });
+    return response.data;
+  },
+
+  retry: async (taskId: number): Promise<Task> => {
+    const response = await api.post<Task>(`/tasks/${taskId}/retry`);
+    return response.data;
+  },
+
+  // URL of the task's Server-Sent Events stream (`task` events), for an EventSource
+  eventsUrl: (taskId: number): string => `${API_BASE_URL}/tasks/${taskId}/events`,
+};
@@ -22,12 +22,32 @@ export interface File {
   storage_path: string;
   mime_type: string | null;
   size_bytes: number | null;
+  extraction_status: "pending" | "done" | "failed";
+  extraction_task_id?: number | null;  // Set on upload when text extraction was queued
   created_at: string;
 }
 
+// One page of a keyset-paginated list; pass next_cursor back to get the next page
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+export interface PageParams {
+  cursor?: string;
+  limit?: number;
+  order?: 'desc' | 'asc';
+  created_after?: string;
+  created_before?: string;
+}
+
+// Slim shape returned by the file list endpoint
+export type FileListItem = Omit<File, 'storage_path'>;
+
 export interface ArtifactVersion {
   id: number;
   artifact_id: number;
+  version_number: number;
   content: string;
   created_at: string;
   created_by_user_id: number | null;
@@ -45,13 +65,97 @@ export interface Artifact {
   current_version: ArtifactVersion | null;
 }
 
+// Version history entry (no content)
+export interface ArtifactVersionListItem {
+  id: number;
+  artifact_id: number;
+  version_number: number;
+  created_at: string;
+  created_by_user_id: number | null;
+  version_metadata: Record<string, any> | null;
+  size_bytes: number | null;
+  is_snapshot: boolean;
+}
+
+export interface ArtifactVersionDiff {
+  artifact_id: number;
+  from_version_id: number;
+  to_version_id: number;
+  diff: string;
+  hunks: DiffHunk[];
+  stats: DiffStats;
+}
+
+// Slim shape returned by the artifact list endpoint (no version content)
+export type ArtifactListItem = Omit<Artifact, 'current_version'>;
+
+export interface SourceFile {
+  file_id: number;
+  filename: string;
+  content_hash: string;
+}
+
+export interface ContextFile {
+  file_id: number;
+  filename: string;
+  tokens: number;
+  included_tokens: number;
+  boilerplate_tokens: number;
+  status: "full" | "truncated" | "dropped" | "summarized";
+  score: number;
+}
+
+export interface ContextReport {
+  strategy: "full" | "packed" | "map_reduce";
+  tokenizer: string;
+  budget_tokens: number;
+  used_tokens: number;
+  files: ContextFile[];
+  removed_files: string[];
+}
+
+export interface DiffSegment {
+  op: "equal" | "delete" | "insert";
+  text: string;
+}
+
+export interface DiffLine {
+  op: "context" | "delete" | "insert";
+  old_number: number | null;
+  new_number: number | null;
+  text: string;
+  segments?: DiffSegment[] | null;
+}
+
+export interface DiffHunk {
+  old_start: number;
+  old_lines: number;
+  new_start: number;
+  new_lines: number;
+  lines: DiffLine[];
+}
+
+export interface DiffStats {
+  old_lines: number;
+  new_lines: number;
+  added: number;
+  removed: number;
+  hunks: number;
+  too_large: boolean;
+}
+
 export interface Proposal {
+  id: number;
   type: "file" | "artifact";
   target_id: number | null;
   target_name: string;
-  old_content: string;
-  new_content: string;
-  diff: string;
+  base_hash: string;
+  status: "pending" | "accepted";
+  hunks: DiffHunk[];
+  diff_stats: DiffStats;
+  source_files?: SourceFile[] | null;
+  context_report?: ContextReport | null;
+  created_at: string;
 }
 
 export interface AgentChatRequest {
@@ -60,9 +164,64 @@ export interface AgentChatRequest {
 
 export interface AgentChatResponse {
   proposals: Proposal[];
+  reply?: string | null;  // Answer to a message that isn't a command
 }
 
 export interface AgentAcceptRequest {
-  proposal: Proposal;
+  proposal_id: number;
+}
+
+export interface SummaryJobCreate {
+  claim_ids?: number[];
+  reference_prefix?: string;
+  created_after?: string;
+  created_before?: string;
+}
+
+export interface SummaryJob {
+  id: number;
+  status: 'pending' | 'running' | 'completed';
+  claim_filter: SummaryJobCreate | null;
+  total: number;
+  processed: number;
+  proposed: number;
+  unchanged: number;
+  failed: number;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
 }
 
+export type SummaryJobItemStatus = 'pending' | 'running' | 'proposed' | 'unchanged' | 'failed';
+
+export interface SummaryJobItem {
+  id: number;
+  claim_id: number;
+  status: SummaryJobItemStatus;
+  attempts: number;
+  proposal_id: number | null;
+  error: string | null;
+  sequence: number | null;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
+
+export type TaskStatus = 'queued' | 'running' | 'done' | 'dead';
+
+// A background task on the durable task queue
+export interface Task {
+  id: number;
+  kind: string;
+  payload: Record<string, unknown>;
+  priority: number;
+  status: TaskStatus;
+  attempts: number;
+  max_attempts: number;
+  run_at: string;
+  last_error: string | null;
+  result: Record<string, unknown> | null;
+  created_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+}